@@ -0,0 +1,125 @@
+"""
+process_resolved_case.py 콜드 스타트 벤치마크
+
+매 측정마다 새 Python 프로세스를 띄워 Lambda 콜드 스타트와 같은 조건에서
+1. 모듈 초기화 시간 (import)
+2. 첫 번째 핸들러 호출 시간 (ResolveCase가 아닌 이벤트 - 바로 스킵되는 경로)
+을 측정합니다. --baseline으로 이전 커밋의 코드와 비교할 수 있습니다.
+
+사용법:
+    python bench_cold_start.py                       # 현재 코드만 측정
+    python bench_cold_start.py --baseline HEAD~1     # 이전 커밋과 비교
+    python bench_cold_start.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULE_NAME = 'process_resolved_case'
+SHARED_MODULES = ['kb_sync']  # MODULE_NAME이 import하는 같은 디렉토리의 공용 모듈
+LAMBDA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 자식 프로세스에서 실행할 측정 코드
+CHILD_CODE = """
+import json, sys, time
+t0 = time.perf_counter()
+import process_resolved_case as module
+t1 = time.perf_counter()
+module.lambda_handler({'detail': {'case-id': 'case-bench', 'display-id': '0', 'event-name': 'AddCommunicationToCase'}}, None)
+t2 = time.perf_counter()
+print(json.dumps({
+    'init_ms': (t1 - t0) * 1000,
+    'handler_ms': (t2 - t1) * 1000,
+    'boto3_loaded': 'boto3' in sys.modules
+}))
+"""
+
+
+def run_once(module_dir: str) -> dict:
+    """새 프로세스에서 한 번 측정"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD_CODE],
+        cwd=module_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    # 핸들러 로그 출력 중 마지막 줄이 측정 결과
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark(module_dir: str, runs: int) -> dict:
+    """runs번 측정 후 통계 계산"""
+    results = [run_once(module_dir) for _ in range(runs)]
+    init_times = [r['init_ms'] for r in results]
+    handler_times = [r['handler_ms'] for r in results]
+    return {
+        'init_median': statistics.median(init_times),
+        'init_min': min(init_times),
+        'handler_median': statistics.median(handler_times),
+        'boto3_loaded': results[0]['boto3_loaded']
+    }
+
+
+def export_revision(revision: str, target_dir: str) -> None:
+    """git 리비전의 process_resolved_case.py (와 그 리비전에 있는 공용 모듈)를 target_dir에 저장"""
+    for name in [MODULE_NAME] + SHARED_MODULES:
+        result = subprocess.run(
+            ['git', 'show', f'{revision}:lambda/{name}.py'],
+            cwd=LAMBDA_DIR,
+            capture_output=True,
+            text=True,
+            check=(name == MODULE_NAME)
+        )
+        if result.returncode != 0:
+            continue  # 공용 모듈로 분리되기 전 리비전
+        with open(os.path.join(target_dir, f'{name}.py'), 'w', encoding='utf-8') as f:
+            f.write(result.stdout)
+
+
+def print_report(label: str, stats: dict) -> None:
+    print(f"📊 {label}")
+    print(f"   초기화(import): 중앙값 {stats['init_median']:.1f}ms, 최소 {stats['init_min']:.1f}ms")
+    print(f"   첫 핸들러 호출: 중앙값 {stats['handler_median']:.1f}ms")
+    print(f"   boto3 로드 여부: {'예' if stats['boto3_loaded'] else '아니오'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lambda 콜드 스타트 벤치마크')
+    parser.add_argument('--runs', type=int, default=10, help='측정 횟수 (기본값: 10)')
+    parser.add_argument('--baseline', help='비교할 git 리비전 (예: HEAD~1)')
+    args = parser.parse_args()
+    
+    print(f"🚀 콜드 스타트 측정 ({args.runs}회)\n")
+    
+    current = benchmark(LAMBDA_DIR, args.runs)
+    
+    if args.baseline:
+        baseline_dir = tempfile.mkdtemp()
+        try:
+            export_revision(args.baseline, baseline_dir)
+            baseline = benchmark(baseline_dir, args.runs)
+        finally:
+            shutil.rmtree(baseline_dir, ignore_errors=True)
+        
+        print_report(f"변경 전 ({args.baseline})", baseline)
+        print()
+        print_report("변경 후 (현재 코드)", current)
+        print()
+        saved = baseline['init_median'] - current['init_median']
+        print(f"✅ 초기화 시간 {saved:.1f}ms 단축 ({baseline['init_median']:.1f}ms → {current['init_median']:.1f}ms)")
+    else:
+        print_report("현재 코드", current)
+
+
+if __name__ == '__main__':
+    main()
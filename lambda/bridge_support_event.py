@@ -3,18 +3,160 @@
 """
 Support Event Bridge Lambda (us-east-1)
 AWS Support 이벤트를 ap-northeast-2의 Lambda로 전달
+
+- FORWARD_EVENT_NAMES에 있는 이벤트(기본: ResolveCase)만 전달하고, 처리에 필요한 필드만 남겨 보냅니다.
+- BRIDGE_MODE=batch: EventBridge → SQS 버퍼 큐 → 이 Lambda로 모아서 받은 이벤트를
+  FORWARD_BATCH_SIZE개씩 묶어 한 번의 호출로 전달합니다 (크로스 리전 호출 수 감소).
+- BRIDGE_MODE=queue: 이벤트를 ap-northeast-2의 SQS 큐(TARGET_QUEUE_URL)로 보내고,
+  처리 Lambda가 큐에서 배치로 가져가 처리합니다.
+
+전달에 실패하면 예외를 발생시켜 Lambda 비동기 호출 재시도(또는 SQS 재전달)로 다시 전달되게 합니다.
 """
 
 import boto3
 import json
 import os
 
-# ap-northeast-2 리전의 Lambda 클라이언트
-lambda_client = boto3.client('lambda', region_name='ap-northeast-2')
+# 처리 Lambda/큐가 있는 리전
+TARGET_REGION = os.environ.get('TARGET_REGION', 'ap-northeast-2')
+
+# ap-northeast-2 리전의 Lambda/SQS 클라이언트
+lambda_client = boto3.client('lambda', region_name=TARGET_REGION)
+sqs_client = boto3.client('sqs', region_name=TARGET_REGION)
 
 # 타겟 Lambda 함수 이름
 TARGET_LAMBDA = os.environ.get('TARGET_LAMBDA_ARN', 'process-resolved-case')
 
+# 타겟 SQS 큐 (BRIDGE_MODE=queue)
+TARGET_QUEUE_URL = os.environ.get('TARGET_QUEUE_URL', '')
+SQS_BATCH_SIZE = 10  # SendMessageBatch 최대 메시지 수
+
+# 전달할 이벤트 이름 (쉼표 구분, 나머지는 타겟 호출 없이 스킵)
+FORWARD_EVENT_NAMES = {
+    name.strip() for name in os.environ.get('FORWARD_EVENT_NAMES', 'ResolveCase').split(',') if name.strip()
+}
+
+# 전달 방식: invoke (이벤트마다 비동기 호출), batch (SQS 버퍼 큐에서 받은 이벤트를 묶어서 호출),
+#           queue (타겟 리전 SQS 큐로 전송)
+BRIDGE_MODE = os.environ.get('BRIDGE_MODE', 'invoke')
+# 대상 Lambda가 한 번의 호출(제한 시간 안)에서 QUEUE_CONCURRENCY개씩 처리하므로 처리 시간 기준으로 정함
+# (비동기 호출 페이로드 256KB 이내)
+FORWARD_BATCH_SIZE = int(os.environ.get('FORWARD_BATCH_SIZE', '20'))
+
+
+def slim_event(event):
+    """
+    타겟 Lambda 처리에 필요한 필드만 남긴 이벤트
+    
+    process_resolved_case는 detail의 case-id/display-id/event-name과
+    중복 확인용 time만 사용합니다.
+    """
+    detail = event.get('detail', {})
+    return {
+        'id': event.get('id'),
+        'time': event.get('time'),
+        'source': event.get('source'),
+        'detail-type': event.get('detail-type'),
+        'detail': {
+            'case-id': detail.get('case-id'),
+            'display-id': detail.get('display-id'),
+            'event-name': detail.get('event-name')
+        }
+    }
+
+
+def should_forward(event):
+    """전달 대상 이벤트인지 (event-name 기준)"""
+    return event.get('detail', {}).get('event-name') in FORWARD_EVENT_NAMES
+
+
+def forward_batch(events):
+    """
+    이벤트 여러 개를 한 번의 비동기 호출로 전달 (타겟은 {'events': [...]} 형식 처리)
+    
+    Returns:
+        Lambda 호출 응답 상태 코드
+    """
+    response = lambda_client.invoke(
+        FunctionName=TARGET_LAMBDA,
+        InvocationType='Event',
+        Payload=json.dumps({'events': events}, ensure_ascii=False).encode('utf-8')
+    )
+    return response['StatusCode']
+
+
+def send_to_queue(events):
+    """
+    이벤트를 SQS_BATCH_SIZE개씩 SendMessageBatch로 타겟 큐에 전송
+    
+    Args:
+        events: (메시지 ID, 줄인 이벤트) 목록 - 메시지 ID는 배치 엔트리 ID로 사용
+    
+    Returns:
+        전송에 실패한 메시지 ID 목록
+    """
+    failed = []
+    for start in range(0, len(events), SQS_BATCH_SIZE):
+        batch = events[start:start + SQS_BATCH_SIZE]
+        entries = [
+            {'Id': str(index), 'MessageBody': json.dumps(event, ensure_ascii=False)}
+            for index, (_, event) in enumerate(batch)
+        ]
+        try:
+            response = sqs_client.send_message_batch(QueueUrl=TARGET_QUEUE_URL, Entries=entries)
+        except Exception as e:
+            print(f"[에러] 큐 전송 실패 ({len(batch)}개): {str(e)}")
+            failed.extend(message_id for message_id, _ in batch)
+            continue
+        
+        for failure in response.get('Failed', []):
+            message_id = batch[int(failure['Id'])][0]
+            print(f"[에러] 큐 전송 실패 ({message_id}): {failure.get('Code')} {failure.get('Message', '')}")
+            failed.append(message_id)
+        print(f"[성공] 이벤트 {len(batch) - len(response.get('Failed', []))}개 큐 전송")
+    
+    return failed
+
+
+def handle_buffered_records(records):
+    """
+    BRIDGE_MODE=batch: SQS 버퍼 큐 메시지(본문은 EventBridge 이벤트)를 걸러서 묶음으로 전달
+    
+    전달에 실패한 묶음의 메시지만 batchItemFailures로 보고해 SQS가 다시 전달하게 합니다
+    (이벤트 소스 매핑에 ReportBatchItemFailures 설정 필요).
+    
+    Args:
+        records: SQS 이벤트의 Records
+    
+    Returns:
+        {'batchItemFailures': [{'itemIdentifier': 메시지 ID}, ...]}
+    """
+    pending = []  # (메시지 ID, 줄인 이벤트)
+    skipped = 0
+    for record in records:
+        event = json.loads(record['body'])
+        if should_forward(event):
+            pending.append((record['messageId'], slim_event(event)))
+        else:
+            skipped += 1
+    
+    print(f"[처리] 버퍼 메시지 {len(records)}개 중 전달 {len(pending)}개, 스킵 {skipped}개")
+    
+    if BRIDGE_MODE == 'queue':
+        return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in send_to_queue(pending)]}
+    
+    failures = []
+    for start in range(0, len(pending), FORWARD_BATCH_SIZE):
+        batch = pending[start:start + FORWARD_BATCH_SIZE]
+        try:
+            status_code = forward_batch([event for _, event in batch])
+            print(f"[성공] 이벤트 {len(batch)}개 묶음 전달: {status_code}")
+        except Exception as e:
+            print(f"[에러] 묶음 전달 실패 ({len(batch)}개): {str(e)}")
+            failures.extend({'itemIdentifier': message_id} for message_id, _ in batch)
+    
+    return {'batchItemFailures': failures}
+
 
 def lambda_handler(event, context):
     """
@@ -28,20 +170,48 @@ def lambda_handler(event, context):
         dict: 응답 상태
     """
     
-    print(f"[수신] Support 이벤트: {json.dumps(event, ensure_ascii=False)}")
+    # 버퍼 큐에서 묶음으로 받은 경우
+    if BRIDGE_MODE in ('batch', 'queue') and 'Records' in event:
+        return handle_buffered_records(event['Records'])
     
     # 이벤트 정보 추출
     case_id = event.get('detail', {}).get('case-id', 'Unknown')
     event_name = event.get('detail', {}).get('event-name', 'Unknown')
     
-    print(f"[처리] Case ID: {case_id}, Event: {event_name}")
+    print(f"[수신] Case ID: {case_id}, Event: {event_name}")
+    
+    # 처리 대상이 아닌 이벤트는 크로스 리전 호출 없이 스킵
+    if not should_forward(event):
+        print(f"[스킵] 전달 대상 이벤트 아님: {event_name}")
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'message': 'Event skipped',
+                'case_id': case_id,
+                'event_name': event_name
+            })
+        }
+    
+    if BRIDGE_MODE == 'queue':
+        if send_to_queue([(event.get('id', case_id), slim_event(event))]):
+            # 예외로 끝내야 비동기 호출 재시도로 다시 전달됨
+            raise RuntimeError(f"큐 전송 실패: {case_id}")
+        
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'message': 'Event queued successfully',
+                'case_id': case_id,
+                'target_region': TARGET_REGION
+            })
+        }
     
     try:
-        # ap-northeast-2의 Lambda 비동기 호출
+        # ap-northeast-2의 Lambda 비동기 호출 (필요한 필드만 전달)
         response = lambda_client.invoke(
             FunctionName=TARGET_LAMBDA,
             InvocationType='Event',  # 비동기 호출
-            Payload=json.dumps(event, ensure_ascii=False).encode('utf-8')
+            Payload=json.dumps(slim_event(event), ensure_ascii=False).encode('utf-8')
         )
         
         status_code = response['StatusCode']
@@ -52,7 +222,7 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'message': 'Event forwarded successfully',
                 'case_id': case_id,
-                'target_region': 'ap-northeast-2',
+                'target_region': TARGET_REGION,
                 'lambda_status': status_code
             })
         }
@@ -60,12 +230,5 @@ def lambda_handler(event, context):
     except Exception as e:
         print(f"[에러] Lambda 호출 실패: {str(e)}")
         
-        # 에러 발생 시에도 200 반환 (EventBridge 재시도 방지)
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Error forwarding event',
-                'error': str(e),
-                'case_id': case_id
-            })
-        }
+        # 예외로 끝내 비동기 호출 재시도로 다시 전달 (중복 전달은 처리 Lambda가 걸러냄)
+        raise
@@ -0,0 +1,193 @@
+"""
+Bedrock Knowledge Base 동기화 요청 병합 (process_resolved_case.py, sync_kb_on_s3_upload.py 공용)
+
+두 Lambda가 같은 상태 객체(`s3://{META_BUCKET}/{META_PREFIX}kb-sync/{KB_ID}-{DS_ID}`)로
+인덱싱 요청을 병합하므로, 케이스 해결과 S3 업로드가 몰려도 윈도우당 인덱싱 작업은 최대 한 번만 시작됩니다.
+두 함수의 배포 패키지에 이 파일을 함께 포함해야 합니다.
+META_BUCKET이 없으면 병합 없이 요청마다 바로 인덱싱 작업을 시작합니다.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+# KB 동기화 병합 (업로드가 몰려도 인덱싱 작업은 윈도우당 최대 1회)
+KB_SYNC_WINDOW_SECONDS = int(os.environ.get('KB_SYNC_WINDOW_SECONDS', '300'))
+KB_SYNC_STATE_RETRIES = 5  # 상태 객체 조건부 저장 경합 시 재시도 횟수
+ACTIVE_INGESTION_STATUSES = {'STARTING', 'IN_PROGRESS', 'STOPPING'}
+
+
+def get_error_code(error: Exception) -> str:
+    """botocore ClientError의 에러 코드 (ClientError가 아니면 빈 문자열)"""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return ''
+    return response.get('Error', {}).get('Code', '')
+
+
+class KBSyncCoalescer:
+    """
+    S3 조건부 쓰기 기반 KB 동기화 병합기
+    
+    "동기화 필요"를 상태 객체에 기록하고, KB_SYNC_WINDOW_SECONDS 동안 최대 한 번만
+    인덱싱 작업을 시작합니다. 상태 객체는 IfMatch/IfNoneMatch로 저장하므로
+    동시에 들어온 호출 중 하나만 작업을 시작합니다.
+    """
+    
+    def __init__(self, kb_id: str, ds_id: str, bucket: str, prefix: str,
+                 get_client: Callable[[str], Any], window_seconds: int = KB_SYNC_WINDOW_SECONDS):
+        """
+        Args:
+            kb_id, ds_id: 동기화할 Knowledge Base / 데이터 소스 ID
+            bucket, prefix: 상태 객체 저장 위치 (META_BUCKET, META_PREFIX - bucket이 비어 있으면 병합하지 않음)
+            get_client: 서비스 이름('s3', 'bedrock-agent')을 받아 boto3 클라이언트를 돌려주는 함수
+            window_seconds: 인덱싱 작업을 최대 한 번만 시작하는 윈도우 (초)
+        """
+        self.kb_id = kb_id
+        self.ds_id = ds_id
+        self.bucket = bucket
+        self.prefix = prefix
+        self.get_client = get_client
+        self.window_seconds = window_seconds
+    
+    def state_key(self) -> str:
+        """KB 동기화 상태 객체 키 (.json 확장자가 없어 S3 업로드 트리거 대상이 아님)"""
+        return f"{self.prefix}kb-sync/{self.kb_id}-{self.ds_id}"
+    
+    def load_state(self) -> tuple:
+        """
+        KB 동기화 상태 조회
+        
+        Returns:
+            (상태 딕셔너리, ETag) - 상태 객체가 없거나 버킷이 없으면 ({}, None)
+        """
+        if not self.bucket:
+            return {}, None
+        
+        s3 = self.get_client('s3')
+        try:
+            response = s3.get_object(Bucket=self.bucket, Key=self.state_key())
+        except s3.exceptions.NoSuchKey:
+            return {}, None
+        return json.loads(response['Body'].read()), response['ETag']
+    
+    def save_state(self, state: Dict[str, Any], etag: str) -> bool:
+        """
+        KB 동기화 상태 조건부 저장 (읽은 뒤 다른 호출이 바꿨으면 실패)
+        
+        Returns:
+            저장 성공 여부
+        """
+        conditions = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+        try:
+            self.get_client('s3').put_object(
+                Bucket=self.bucket,
+                Key=self.state_key(),
+                Body=json.dumps(state),
+                ContentType='application/json',
+                **conditions
+            )
+            return True
+        except Exception as e:
+            if get_error_code(e) in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                return False
+            raise
+    
+    def is_job_running(self, job_id: str) -> bool:
+        """인덱싱 작업이 아직 진행 중인지"""
+        if not job_id:
+            return False
+        response = self.get_client('bedrock-agent').get_ingestion_job(
+            knowledgeBaseId=self.kb_id,
+            dataSourceId=self.ds_id,
+            ingestionJobId=job_id
+        )
+        return response['ingestionJob']['status'] in ACTIVE_INGESTION_STATUSES
+    
+    def request(self, flush: bool = False) -> str:
+        """
+        KB 동기화 요청 (디바운스 + 병합)
+        
+        작업이 진행 중이거나 윈도우 안이면 후속 작업 1회만 예약하고, 예약된 작업은
+        주기적인 flush 호출(또는 윈도우 이후의 다음 요청)이 시작합니다.
+        상태 객체 경합과 ConflictException 모두 KB_SYNC_STATE_RETRIES번 안에서 다시 판단합니다.
+        
+        Args:
+            flush: True면 새 요청 없이 예약된 후속 작업만 처리 (스케줄 호출용)
+        
+        Returns:
+            'started' (작업 시작), 'queued' (후속 작업 예약), 'idle' (예약된 작업 없음)
+        """
+        if not self.bucket:
+            return 'idle' if flush else self.start_direct()
+        
+        for _ in range(KB_SYNC_STATE_RETRIES):
+            state, etag = self.load_state()
+            if flush and not state.get('pending'):
+                return 'idle'
+            
+            now = datetime.now(timezone.utc).timestamp()
+            in_window = now - state.get('last_started_at', 0) < self.window_seconds
+            if in_window or self.is_job_running(state.get('job_id')):
+                if state.get('pending'):
+                    return 'queued'
+                state['pending'] = True
+                if self.save_state(state, etag):
+                    print(f"   ⏳ KB 동기화 후속 작업 예약")
+                    return 'queued'
+                continue
+            
+            # 작업 시작 권한을 먼저 기록 (동시에 들어온 다른 호출은 조건부 저장에 실패하고 다시 판단)
+            state.update(pending=False, last_started_at=now, job_id=None)
+            if not self.save_state(state, etag):
+                continue
+            
+            try:
+                response = self.get_client('bedrock-agent').start_ingestion_job(
+                    knowledgeBaseId=self.kb_id,
+                    dataSourceId=self.ds_id
+                )
+            except Exception as e:
+                if get_error_code(e) != 'ConflictException':
+                    raise
+                # 상태 객체 밖에서 시작된 작업이 진행 중 - 방금 기록한 시작 시각 때문에
+                # 다음 반복은 윈도우 안으로 판단해 후속 작업으로 예약
+                continue
+            
+            ingestion_job_id = response['ingestionJob']['ingestionJobId']
+            self.record_job(ingestion_job_id)
+            print(f"   ✅ KB 동기화 시작: {ingestion_job_id}")
+            return 'started'
+        
+        # 다른 호출과 계속 경합 - 그쪽에서 동기화를 처리하거나 예약함
+        return 'queued'
+    
+    def start_direct(self) -> str:
+        """
+        상태 객체 없이 바로 인덱싱 작업 시작 (META_BUCKET이 없을 때)
+        
+        Returns:
+            'started' (작업 시작), 'busy' (이미 진행 중인 작업이 있어 이번 요청은 건너뜀)
+        """
+        try:
+            response = self.get_client('bedrock-agent').start_ingestion_job(
+                knowledgeBaseId=self.kb_id,
+                dataSourceId=self.ds_id
+            )
+        except Exception as e:
+            if get_error_code(e) != 'ConflictException':
+                raise
+            print(f"   ⚠️  KB 동기화 작업이 이미 진행 중 - 병합 상태가 없어 후속 작업을 예약하지 않습니다")
+            return 'busy'
+        
+        print(f"   ✅ KB 동기화 시작: {response['ingestionJob']['ingestionJobId']}")
+        return 'started'
+    
+    def record_job(self, job_id: str) -> None:
+        """시작한 인덱싱 작업 ID를 상태에 기록 (그 사이 예약된 후속 작업은 유지)"""
+        for _ in range(KB_SYNC_STATE_RETRIES):
+            state, etag = self.load_state()
+            state['job_id'] = job_id
+            if self.save_state(state, etag):
+                return
@@ -8,11 +8,18 @@ EventBridge에서 ResolveCase 이벤트를 수신하여:
 4. Bedrock Knowledge Base 인덱싱 트리거
 """
 
-import boto3
+import gzip
+import hashlib
 import json
 import os
-from datetime import datetime
-from typing import Dict, Any, List
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from kb_sync import KBSyncCoalescer
 
 # 환경 변수
 KB_ID = os.environ.get('KB_ID', '')
@@ -20,11 +27,547 @@ DS_ID = os.environ.get('DS_ID', '')
 BUCKET_NAME = os.environ.get('BUCKET_NAME', 'support-knowledge-base')
 MOCK_MODE = os.environ.get('MOCK_MODE', 'false').lower() == 'true'
 
-# AWS 클라이언트 초기화
-s3_client = boto3.client('s3', region_name='ap-northeast-2')
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')  # Bedrock은 us-east-1 사용
-bedrock_agent = boto3.client('bedrock-agent', region_name='ap-northeast-2')
-support_client = boto3.client('support', region_name='us-east-1')  # Support API는 us-east-1
+# 내부 관리용 객체(요약 캐시, 매니페스트 등) 저장 위치
+# KB 데이터 소스가 크롤링하지 않도록 BUCKET_NAME과 다른 버킷이어야 하며,
+# 지정하지 않거나 BUCKET_NAME과 같으면 관련 기능을 끄고 경고만 출력 (meta_bucket_enabled 참고)
+META_BUCKET = os.environ.get('META_BUCKET', '')
+META_PREFIX = os.environ.get('META_PREFIX', '_meta/')
+META_ENABLED = bool(META_BUCKET) and META_BUCKET != BUCKET_NAME
+
+# S3 저장 형식
+STORAGE_FORMAT = os.environ.get('STORAGE_FORMAT', 'pretty')  # pretty: indent=2 JSON, compact: 공백 없는 JSON
+STORAGE_GZIP = os.environ.get('STORAGE_GZIP', 'false').lower() == 'true'  # gzip 압축 (Content-Encoding: gzip)
+SHARD_MAX_BYTES = int(os.environ.get('SHARD_MAX_BYTES', str(4 * 1024 * 1024)))  # 묶음 저장 시 NDJSON 샤드 최대 크기
+SHARD_REWRITE_RETRIES = 3  # 이전 샤드에서 레코드를 뺄 때 조건부 저장 경합 시 재시도 횟수
+
+# 요약 캐시 (웜 컨테이너 메모리에 최근 요약 최대 이 개수만 유지, 나머지는 S3 사이드카에서 조회)
+SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get('SUMMARY_CACHE_MAX_ENTRIES', '256'))
+
+# 중복 이벤트 처리 (케이스 ID + 이벤트 시각 기준 멱등성)
+IDEMPOTENCY_STORE = os.environ.get('IDEMPOTENCY_STORE', 'local' if MOCK_MODE else 's3')  # s3: 조건부 쓰기, local: 프로세스 메모리
+IDEMPOTENCY_LOCK_TTL = int(os.environ.get('IDEMPOTENCY_LOCK_TTL', '900'))  # 처리 중 표시가 이보다 오래되면 중단된 것으로 보고 인계 (초)
+
+# 요약 프롬프트/스키마 버전 (build_summary_prompt를 바꾸면 올려서 요약 캐시 무효화)
+PROMPT_VERSION = '1'
+
+# 긴 케이스 분할 요약(map-reduce) 설정
+SUMMARY_TOKEN_BUDGET = int(os.environ.get('SUMMARY_TOKEN_BUDGET', '30000'))  # 이 토큰 수를 넘는 프롬프트는 분할 요약
+CHUNK_TOKEN_BUDGET = int(os.environ.get('CHUNK_TOKEN_BUDGET', '12000'))      # 분할 요약 시 구간당 대화 내역 토큰 수
+CHUNK_MAX_TOKENS = 800     # 구간 요약 응답 최대 토큰 수
+MAP_CONCURRENCY = 4        # 구간 요약 동시 호출 수 (실제 동시 호출은 bedrock_concurrency가 제한)
+
+# Bedrock 응답 스트리밍 (JSON이 될 수 없는 응답은 생성 도중 중단하고 재시도)
+# IAM 역할에 bedrock:InvokeModelWithResponseStream 권한을 추가한 뒤 켜야 함
+BEDROCK_STREAMING = os.environ.get('BEDROCK_STREAMING', 'false').lower() == 'true'
+
+# Lambda 남은 시간 기반 재시도 (context가 없는 마이그레이션 등에서는 시간 제한 없음)
+DEADLINE_SAFETY_MS = int(os.environ.get('DEADLINE_SAFETY_MS', '10000'))    # 재시도 큐 전달/정리용으로 남겨둘 시간
+MIN_CALL_BUDGET_MS = int(os.environ.get('MIN_CALL_BUDGET_MS', '20000'))    # 이보다 적게 남으면 새 Bedrock 호출을 시작하지 않음
+BEDROCK_CALL_TIMEOUT = int(os.environ.get('BEDROCK_CALL_TIMEOUT', '120'))  # Bedrock 호출 1회 최대 시간 (초)
+# 남은 시간에 맞춘 Bedrock read_timeout 단계 (초, BEDROCK_CALL_TIMEOUT 포함 - 단계마다 클라이언트 1개)
+READ_TIMEOUT_BUCKETS = sorted({5, 15, 30, 60, BEDROCK_CALL_TIMEOUT})
+RETRY_BASE_DELAY = 1.0   # 백오프 기본 대기 시간 (초)
+RETRY_MAX_DELAY = 20.0   # 백오프 최대 대기 시간 (초)
+RETRY_QUEUE_URL = os.environ.get('RETRY_QUEUE_URL', '')  # 시간이 부족한 케이스를 넘길 SQS 큐
+
+# SQS 큐 소비 설정
+QUEUE_CONCURRENCY = int(os.environ.get('QUEUE_CONCURRENCY', '4'))  # 한 배치 안에서 동시에 처리할 메시지 수
+LOCAL_QUEUE_MAX_RECEIVES = 3  # 로컬 큐에서 이 횟수만큼 실패하면 dead letter로 이동
+
+# Claude Sonnet 4.5 글로벌 inference profile
+MODEL_ID = 'arn:aws:bedrock:us-east-1:370662402529:inference-profile/global.anthropic.claude-sonnet-4-5-20250929-v1:0'
+
+# serviceCode로 분류가 확정된 케이스는 분류 없이 요약만 하므로 작고 빠른 모델 사용
+SUMMARY_FAST_MODEL_ID = os.environ.get(
+    'SUMMARY_FAST_MODEL_ID',
+    'arn:aws:bedrock:us-east-1:370662402529:inference-profile/global.anthropic.claude-haiku-4-5-20251001-v1:0'
+)
+
+# 분류가 확정되면 요약 전에 임시 문서(제목/첫 질문)를 최종 경로에 먼저 저장 (요약 완료 시 덮어씀)
+PROVISIONAL_WRITE = os.environ.get('PROVISIONAL_WRITE', 'false').lower() == 'true'
+
+# Support serviceCode → service 매핑 (serviceCode가 이 접두사로 시작하면 해당 서비스, 가장 긴 접두사 우선)
+# 새 serviceCode가 'model'로 분류되는 로그가 보이면 여기에 추가
+SERVICE_CODE_PREFIXES = {
+    'amazon-elastic-compute-cloud': 'ec2',
+    'amazon-ec2': 'ec2',
+    'amazon-elastic-block-store': 'ebs',
+    'elastic-load-balancing': 'elb',
+    'amazon-elastic-load-balancing': 'elb',
+    'amazon-ec2-auto-scaling': 'autoscaling',
+    'auto-scaling': 'autoscaling',
+    'amazon-relational-database-service': 'rds',
+    'amazon-aurora': 'rds',
+    'amazon-dynamodb': 'dynamodb',
+    'amazon-elasticache': 'elasticache',
+    'amazon-redshift': 'redshift',
+    'amazon-opensearch-service': 'opensearch',
+    'amazon-elasticsearch-service': 'opensearch',
+    'aws-lambda': 'lambda',
+    'amazon-simple-storage-service': 's3',
+    'amazon-s3': 's3',
+    'amazon-elastic-file-system': 'efs',
+    'aws-backup': 'backup',
+    'amazon-virtual-private-cloud': 'vpc',
+    'amazon-vpc': 'vpc',
+    'aws-direct-connect': 'directconnect',
+    'aws-vpn': 'vpn',
+    'amazon-route-53': 'route53',
+    'amazon-route53': 'route53',
+    'amazon-cloudfront': 'cloudfront',
+    'amazon-api-gateway': 'apigateway',
+    'amazon-elastic-kubernetes-service': 'eks',
+    'amazon-elastic-container-service': 'ecs',
+    'amazon-elastic-container-registry': 'ecr',
+    'aws-fargate': 'ecs',
+    'aws-elastic-beanstalk': 'elasticbeanstalk',
+    'amazon-cloudwatch': 'cloudwatch',
+    'aws-cloudtrail': 'cloudtrail',
+    'aws-cloudformation': 'cloudformation',
+    'aws-systems-manager': 'ssm',
+    'aws-identity-and-access-management': 'iam',
+    'aws-key-management-service': 'kms',
+    'aws-certificate-manager': 'acm',
+    'aws-waf': 'waf',
+    'amazon-cognito': 'cognito',
+    'aws-organizations': 'organizations',
+    'amazon-simple-queue-service': 'sqs',
+    'amazon-simple-notification-service': 'sns',
+    'amazon-eventbridge': 'eventbridge',
+    'aws-step-functions': 'stepfunctions',
+    'amazon-kinesis': 'kinesis',
+    'aws-glue': 'glue',
+    'amazon-athena': 'athena',
+    'amazon-emr': 'emr',
+    'amazon-sagemaker': 'sagemaker',
+    'amazon-bedrock': 'bedrock',
+    'amazon-workspaces': 'workspaces',
+    'amazon-lightsail': 'lightsail'
+}
+
+# 결제/계정 문의 판별용 serviceCode, categoryCode
+BILLING_SERVICE_CODES = {'billing', 'aws-billing', 'billing-and-cost-management'}
+BILLING_CATEGORY_CODES = {'billing', 'invoices', 'payment', 'charges', 'refund', 'reserved-instances', 'savings-plans'}
+ACCOUNT_SERVICE_CODES = {'customer-account', 'account-management', 'aws-account'}
+ACCOUNT_CATEGORY_CODES = {'account-closure', 'account-access', 'account-structure', 'security'}
+
+# AWS 클라이언트 리전
+CLIENT_REGIONS = {
+    's3': 'ap-northeast-2',
+    'bedrock-runtime': 'us-east-1',  # Bedrock은 us-east-1 사용
+    'bedrock-agent': 'ap-northeast-2',
+    'support': 'us-east-1',  # Support API는 us-east-1
+    'sqs': os.environ.get('AWS_REGION', 'ap-northeast-2')
+}
+
+# 서비스별 botocore 설정 (Bedrock 응답 대기 시간이 Lambda 제한 시간을 넘지 않도록)
+CLIENT_CONFIGS = {
+    'bedrock-runtime': {'connect_timeout': 5, 'read_timeout': BEDROCK_CALL_TIMEOUT}
+}
+
+# AWS 클라이언트는 처음 사용할 때 생성 (콜드 스타트 시 boto3 import/클라이언트 생성 비용을 미룸)
+_boto_session = None
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service_name: str, read_timeout: int = None) -> Any:
+    """
+    서비스별 boto3 클라이언트 (처음 호출 시 생성 후 재사용)
+    
+    모든 클라이언트가 하나의 세션을 공유하므로 자격 증명 조회와 서비스 모델 로딩을 한 번만 합니다.
+    ResolveCase가 아닌 이벤트처럼 AWS 호출이 없는 경로는 boto3를 import하지 않습니다.
+    
+    Args:
+        service_name: 서비스 이름 (CLIENT_REGIONS의 키)
+        read_timeout: CLIENT_CONFIGS 대신 쓸 응답 대기 시간 (초, 값마다 클라이언트를 따로 생성하므로
+            READ_TIMEOUT_BUCKETS처럼 정해진 몇 개 값만 사용)
+            지정하면 botocore 자체 재시도를 끔 (재시도가 대기 시간을 늘리지 않도록)
+    
+    Returns:
+        boto3 클라이언트
+    """
+    global _boto_session
+    
+    key = (service_name, read_timeout)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    
+    with _clients_lock:
+        if key not in _clients:
+            if _boto_session is None:
+                import boto3
+                _boto_session = boto3.session.Session()
+            options = {}
+            config = dict(CLIENT_CONFIGS.get(service_name, {}))
+            if read_timeout is not None:
+                config['read_timeout'] = read_timeout
+                config['retries'] = {'total_max_attempts': 1}
+            if config:
+                from botocore.config import Config
+                options['config'] = Config(**config)
+            _clients[key] = _boto_session.client(
+                service_name, region_name=CLIENT_REGIONS[service_name], **options
+            )
+        return _clients[key]
+
+
+_meta_warning_printed = False
+
+
+def meta_bucket_enabled() -> bool:
+    """
+    내부 관리용 버킷(META_BUCKET) 사용 가능 여부
+    
+    META_BUCKET이 없거나 BUCKET_NAME과 같으면 요약 캐시의 S3 사이드카, 매니페스트,
+    S3 멱등성 저장소, KB 동기화 병합을 끄고 처음 한 번만 경고합니다 (케이스 처리는 계속).
+    """
+    global _meta_warning_printed
+    
+    if META_ENABLED:
+        return True
+    if not _meta_warning_printed:
+        _meta_warning_printed = True
+        reason = 'BUCKET_NAME과 같음' if META_BUCKET else '지정되지 않음'
+        print(f"⚠️  META_BUCKET {reason} - 요약 캐시(S3), 매니페스트, S3 멱등성 저장소, KB 동기화 병합을 사용하지 않습니다")
+    return False
+
+
+# 스로틀링으로 판단하는 에러 코드 (동시 호출 수를 줄이고 백오프 후 재시도)
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException',
+    'Throttling',
+    'TooManyRequestsException',
+    'ServiceQuotaExceededException',
+    'ServiceUnavailableException',
+    'ModelNotReadyException',
+    'throttlingException',          # 스트리밍 응답 도중 에러 이벤트
+    'serviceUnavailableException'
+}
+
+# 재시도해도 결과가 같은 에러 코드 (즉시 실패)
+NON_RETRYABLE_ERROR_CODES = {
+    'ValidationException',
+    'AccessDeniedException',
+    'ResourceNotFoundException',
+    'UnrecognizedClientException',
+    'CaseIdNotFound',
+    'validationException'           # 스트리밍 응답 도중 에러 이벤트
+}
+
+
+def get_error_code(error: Exception) -> str:
+    """botocore ClientError의 에러 코드 (ClientError가 아니면 빈 문자열)"""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return ''
+    return response.get('Error', {}).get('Code', '')
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """스로틀링 에러 여부"""
+    return get_error_code(error) in THROTTLING_ERROR_CODES
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD(Additive Increase / Multiplicative Decrease) 방식의 동시 호출 수 제어
+    
+    호출이 성공하면 허용 동시 호출 수를 조금씩(한 번에 1/limit) 늘리고,
+    스로틀링 에러가 나면 곱셈으로 줄입니다. 같은 프로세스의 모든 호출자
+    (Lambda 핸들러, 마이그레이션 워커 스레드 등)가 하나의 인스턴스를 공유하므로
+    한 곳에서 스로틀링이 발생하면 나머지 호출도 함께 속도를 줄입니다.
+    
+    rate_limiter(acquire()가 있는 객체)를 지정하면 실제 API 호출(재시도, 페이지 조회 포함)마다
+    토큰을 하나씩 확보한 뒤 호출합니다 (마이그레이션의 초당 요청 수 제한).
+    """
+    
+    def __init__(self, name: str, initial: float = 2, minimum: float = 1, maximum: float = 16,
+                 decrease_factor: float = 0.5):
+        self.name = name
+        self.rate_limiter = None
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.condition = threading.Condition()
+    
+    def acquire(self) -> None:
+        """허용 동시 호출 수 안에 들 때까지 대기"""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+    
+    def release(self, throttled: bool = False) -> None:
+        """
+        호출 종료 및 허용 동시 호출 수 조정
+        
+        Args:
+            throttled: 스로틀링 에러로 끝났는지 여부
+        """
+        with self.condition:
+            self.in_flight -= 1
+            
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                print(f"   🐢 {self.name} 스로틀링 감지, 동시 호출 수 {self.limit:.1f}로 감소")
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            
+            self.condition.notify_all()
+    
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        동시 호출 수 제어 하에 func 호출 (스로틀링 여부를 결과에 반영)
+        
+        Returns:
+            func의 반환값
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.acquire()
+        throttled = False
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            self.release(throttled)
+
+
+bedrock_concurrency = AdaptiveConcurrencyLimiter(
+    'Bedrock',
+    initial=int(os.environ.get('BEDROCK_CONCURRENCY_INITIAL', '2')),
+    maximum=int(os.environ.get('BEDROCK_CONCURRENCY_MAX', '8'))
+)
+support_concurrency = AdaptiveConcurrencyLimiter(
+    'Support API',
+    initial=int(os.environ.get('SUPPORT_CONCURRENCY_INITIAL', '2')),
+    maximum=int(os.environ.get('SUPPORT_CONCURRENCY_MAX', '4'))
+)
+
+
+class S3IdempotencyStore:
+    """
+    S3 조건부 쓰기 기반 멱등성 저장소
+    
+    `{META_PREFIX}idempotency/{case_id}/{event_time}` 객체를 IfNoneMatch='*'로 생성해
+    같은 이벤트를 처음 받은 호출만 처리를 맡습니다. 처리 중에 Lambda가 중단되어
+    표시가 IDEMPOTENCY_LOCK_TTL보다 오래되면 IfMatch(ETag)로 한 호출만 인계받습니다.
+    """
+    
+    def marker_key(self, key: str) -> str:
+        return f"{META_PREFIX}idempotency/{key}"
+    
+    def _put(self, key: str, record: Dict[str, Any], **conditions) -> None:
+        get_client('s3').put_object(
+            Bucket=META_BUCKET,
+            Key=self.marker_key(key),
+            Body=json.dumps(record, ensure_ascii=False),
+            ContentType='application/json',
+            **conditions
+        )
+    
+    def claim(self, key: str) -> Dict[str, Any]:
+        """
+        처리 권한 획득 시도
+        
+        Returns:
+            권한을 얻으면 None, 이미 처리됐거나 처리 중이면 기존 기록
+        """
+        record = {'status': 'in_progress', 'started_at': datetime.now(timezone.utc).isoformat()}
+        try:
+            self._put(key, record, IfNoneMatch='*')
+            return None
+        except Exception as e:
+            if get_error_code(e) not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+        
+        response = get_client('s3').get_object(Bucket=META_BUCKET, Key=self.marker_key(key))
+        existing = json.loads(response['Body'].read())
+        if existing.get('status') == 'completed' or not is_stale_claim(existing):
+            return existing
+        
+        # 중단된 처리 인계 (다른 호출이 먼저 인계했으면 IfMatch 실패)
+        try:
+            self._put(key, record, IfMatch=response['ETag'])
+            print(f"   ♻️  중단된 처리 인계: {key}")
+            return None
+        except Exception as e:
+            if get_error_code(e) not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise
+            return existing
+    
+    def complete(self, key: str, result: Dict[str, Any]) -> None:
+        """처리 완료 기록 (이후 중복 이벤트는 이 결과를 그대로 반환)"""
+        self._put(key, {
+            'status': 'completed',
+            'completed_at': datetime.now(timezone.utc).isoformat(),
+            'result': result
+        })
+    
+    def release(self, key: str) -> None:
+        """처리 실패 시 표시 삭제 (재시도 이벤트가 다시 처리할 수 있도록)"""
+        get_client('s3').delete_object(Bucket=META_BUCKET, Key=self.marker_key(key))
+
+
+class LocalIdempotencyStore:
+    """
+    프로세스 메모리 기반 멱등성 저장소 (MOCK 모드/로컬 테스트용)
+    
+    S3IdempotencyStore와 같은 인터페이스이며, 같은 컨테이너로 들어온 중복 이벤트만 걸러냅니다.
+    """
+    
+    def __init__(self):
+        self.records = {}
+        self.lock = threading.Lock()
+    
+    def claim(self, key: str) -> Dict[str, Any]:
+        with self.lock:
+            existing = self.records.get(key)
+            if existing and (existing['status'] == 'completed' or not is_stale_claim(existing)):
+                return existing
+            self.records[key] = {'status': 'in_progress', 'started_at': datetime.now(timezone.utc).isoformat()}
+            return None
+    
+    def complete(self, key: str, result: Dict[str, Any]) -> None:
+        with self.lock:
+            self.records[key] = {
+                'status': 'completed',
+                'completed_at': datetime.now(timezone.utc).isoformat(),
+                'result': result
+            }
+    
+    def release(self, key: str) -> None:
+        with self.lock:
+            self.records.pop(key, None)
+
+
+def is_stale_claim(record: Dict[str, Any]) -> bool:
+    """처리 중 표시가 IDEMPOTENCY_LOCK_TTL보다 오래됐는지 (처리하던 호출이 중단됨)"""
+    if record.get('status') != 'in_progress':
+        return False
+    started_at = datetime.fromisoformat(record['started_at'])
+    return (datetime.now(timezone.utc) - started_at).total_seconds() > IDEMPOTENCY_LOCK_TTL
+
+
+def build_idempotency_key(event: Dict[str, Any]) -> str:
+    """
+    이벤트의 멱등성 키 (케이스 ID + 이벤트 시각)
+    
+    EventBridge 재전송이나 비동기 호출 재시도는 같은 시각을 그대로 가지므로 중복으로 걸러지고,
+    재오픈 후 다시 해결된 케이스는 시각이 달라 새로 처리됩니다.
+    
+    Returns:
+        멱등성 키 (이벤트 시각이 없으면 빈 문자열)
+    """
+    event_time = event.get('time', '')
+    if not event_time:
+        return ''
+    return f"{event['detail']['case-id']}/{event_time}"
+
+
+# META_BUCKET이 없으면 S3 저장소 대신 프로세스 메모리 저장소 사용 (meta_bucket_enabled 경고에 포함)
+idempotency_store = S3IdempotencyStore() if IDEMPOTENCY_STORE == 's3' and META_ENABLED else LocalIdempotencyStore()
+
+
+class DeadlineExceeded(Exception):
+    """Lambda 남은 시간이 부족해 처리를 이어갈 수 없음 (재시도 큐로 넘김)"""
+
+
+# 현재 호출의 Lambda context (핸들러가 설정, 모든 처리 스레드가 공유)
+invocation_context = None
+
+
+def set_invocation_context(context: Any) -> None:
+    """핸들러 시작 시 호출 - 이후 재시도/대기 시간을 context의 남은 시간 안으로 제한"""
+    global invocation_context
+    invocation_context = context if hasattr(context, 'get_remaining_time_in_millis') else None
+
+
+def remaining_seconds() -> float:
+    """
+    정리 시간(DEADLINE_SAFETY_MS)을 뺀 남은 처리 시간
+    
+    Returns:
+        남은 시간 (초), context가 없으면 None (제한 없음)
+    """
+    if invocation_context is None:
+        return None
+    return (invocation_context.get_remaining_time_in_millis() - DEADLINE_SAFETY_MS) / 1000
+
+
+def ensure_time_for(seconds: float, action: str) -> None:
+    """남은 시간이 seconds보다 적으면 DeadlineExceeded"""
+    remaining = remaining_seconds()
+    if remaining is not None and remaining < seconds:
+        raise DeadlineExceeded(f"{action}에 필요한 시간 부족 (남은 시간 {max(remaining, 0):.1f}초)")
+
+
+def call_timeout_seconds() -> float:
+    """Bedrock 호출 1회에 쓸 수 있는 시간 (BEDROCK_CALL_TIMEOUT과 남은 시간 중 작은 값)"""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return BEDROCK_CALL_TIMEOUT
+    return min(BEDROCK_CALL_TIMEOUT, remaining)
+
+
+def bedrock_runtime_for_call() -> Any:
+    """
+    Bedrock 호출 1회용 클라이언트 (read_timeout을 call_timeout_seconds() 안으로 제한)
+    
+    invoke_model은 응답 전체, 스트리밍은 첫 청크와 청크 사이 대기가 read_timeout에 걸리므로
+    호출 도중 Lambda 제한 시간을 넘기지 않습니다. 재시도는 invoke_bedrock_with_retry가 남은 시간 안에서 합니다.
+    Lambda context가 없으면(마이그레이션 등) 기본 클라이언트를 그대로 사용합니다.
+    """
+    if invocation_context is None:
+        return get_client('bedrock-runtime')
+    return get_client('bedrock-runtime', read_timeout=read_timeout_bucket(call_timeout_seconds()))
+
+
+def read_timeout_bucket(timeout: float) -> int:
+    """
+    timeout 이하인 가장 큰 READ_TIMEOUT_BUCKETS 단계 (남은 시간이 줄어도 클라이언트가 단계 수 이상 늘지 않음)
+    
+    가장 작은 단계보다 짧으면 가장 작은 단계를 사용합니다 (그 전에 ensure_time_for가 새 호출을 막음).
+    """
+    fitting = [bucket for bucket in READ_TIMEOUT_BUCKETS if bucket <= timeout]
+    return fitting[-1] if fitting else READ_TIMEOUT_BUCKETS[0]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter 지수 백오프: 0 ~ min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2^attempt) 중 임의 값"""
+    import random
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def send_to_retry_queue(event: Dict[str, Any], reason: str) -> str:
+    """
+    시간이 부족해 처리하지 못한 이벤트를 재시도 큐로 전달
+    
+    메시지 본문은 원본 이벤트 그대로이므로 큐를 이 Lambda의 트리거로 연결하면
+    handle_queue_batch가 다시 처리합니다.
+    
+    Args:
+        event: 원본 EventBridge 이벤트
+        reason: 전달 사유 (메시지 속성으로 기록)
+    
+    Returns:
+        SQS 메시지 ID
+    """
+    if not RETRY_QUEUE_URL:
+        raise RuntimeError(f"RETRY_QUEUE_URL 미설정 - 재시도 큐로 넘기지 못함 ({reason})")
+    
+    response = get_client('sqs').send_message(
+        QueueUrl=RETRY_QUEUE_URL,
+        MessageBody=json.dumps(event, ensure_ascii=False),
+        MessageAttributes={'reason': {'DataType': 'String', 'StringValue': reason[:256]}}
+    )
+    return response['MessageId']
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -35,6 +578,33 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         event: EventBridge에서 전달된 Support Case Update 이벤트
         context: Lambda 실행 컨텍스트
     
+    Returns:
+        처리 결과 딕셔너리
+    """
+    set_invocation_context(context)
+    
+    # SQS 큐 트리거 (브릿지 BRIDGE_MODE=queue, 재시도 큐)
+    if is_queue_event(event):
+        return handle_queue_batch(event['Records'])
+    
+    # 브릿지 Lambda가 묶어서 전달한 이벤트 (BRIDGE_MODE=batch)
+    if 'events' in event:
+        return handle_event_batch(event['events'])
+    
+    return handle_event(event)
+
+
+def handle_event(event: Dict[str, Any], handoff_on_deadline: bool = True) -> Dict[str, Any]:
+    """
+    EventBridge 이벤트 하나 처리
+    
+    Args:
+        event: Support Case Update 이벤트
+        handoff_on_deadline: 시간 부족 시 재시도 큐로 넘길지 여부
+            (False면 DeadlineExceeded를 그대로 발생 - 큐에서 받은 메시지는 큐가 다시 전달)
+    
+    처리에 실패하면 예외를 그대로 발생시킵니다 (처리 중 표시는 해제되므로 재시도 시 다시 처리).
+    
     Returns:
         처리 결과 딕셔너리
     """
@@ -58,8 +628,35 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if MOCK_MODE:
             print("⚠️  MOCK_MODE 활성화 - 테스트 모드로 실행")
         
+        # 중복 이벤트 확인 (같은 이벤트가 이미 처리됐거나 처리 중이면 스킵)
+        idempotency_key = build_idempotency_key(event)
+        if idempotency_key:
+            existing = idempotency_store.claim(idempotency_key)
+            if existing:
+                print(f"⏭️  중복 이벤트 ({existing['status']}), 스킵: {idempotency_key}")
+                return {
+                    'statusCode': 200,
+                    'body': json.dumps({
+                        'message': 'Duplicate event',
+                        'case_id': case_id,
+                        'display_id': display_id,
+                        'status': existing['status'],
+                        'result': existing.get('result')
+                    }, ensure_ascii=False)
+                }
+        else:
+            print("⚠️  이벤트 시각 없음 - 중복 확인 생략")
+        
         # 케이스 처리
-        result = process_resolved_case(case_id, display_id)
+        try:
+            result = process_resolved_case(case_id, display_id)
+        except Exception:
+            if idempotency_key:
+                idempotency_store.release(idempotency_key)
+            raise
+        
+        if idempotency_key:
+            idempotency_store.complete(idempotency_key, result)
         
         print(f"✅ 케이스 처리 완료: {display_id}")
         
@@ -73,18 +670,182 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }, ensure_ascii=False)
         }
         
+    except DeadlineExceeded as e:
+        if not handoff_on_deadline:
+            raise
+        
+        # Lambda 제한 시간 안에 끝낼 수 없음 - 호출 도중 종료되지 않도록 재시도 큐로 넘김
+        print(f"⏳ {str(e)}, 재시도 큐로 전달")
+        message_id = send_to_retry_queue(event, str(e))
+        print(f"   ✅ 재시도 큐 전달 완료: {message_id}")
+        
+        return {
+            'statusCode': 202,
+            'body': json.dumps({
+                'message': 'Handed off to retry queue',
+                'case_id': event['detail']['case-id'],
+                'reason': str(e),
+                'message_id': message_id
+            }, ensure_ascii=False)
+        }
+        
     except Exception as e:
         print(f"❌ 에러 발생: {str(e)}")
         import traceback
         traceback.print_exc()
         
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'case_id': event.get('detail', {}).get('case-id', 'unknown')
-            })
-        }
+        # 비동기 호출은 반환값을 아무도 읽지 않으므로 예외로 끝내야 Lambda 재시도/DLQ로 이어짐
+        raise
+
+
+def handle_event_batch(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    브릿지 Lambda가 묶어서 전달한 이벤트를 QUEUE_CONCURRENCY개씩 동시에 처리 (handle_queue_batch와 같은 방식)
+    
+    이벤트별 처리 결과는 단건 이벤트와 같으며(중복 확인, 재시도 큐 전달 포함),
+    한 이벤트가 실패해도 나머지는 계속 처리합니다. 실패한 이벤트가 있으면 마지막에 예외를 발생시켜
+    Lambda 비동기 호출 재시도로 묶음 전체를 다시 받고, 이미 처리된 이벤트는 중복 확인으로 건너뜁니다.
+    
+    Args:
+        events: EventBridge 이벤트 목록
+    
+    Returns:
+        이벤트별 처리 결과를 담은 딕셔너리
+    """
+    print(f"📦 이벤트 {len(events)}개 묶음 수신 (동시 처리 {QUEUE_CONCURRENCY}개)")
+    results = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=QUEUE_CONCURRENCY) as executor:
+        futures = [(event, executor.submit(handle_event, event)) for event in events]
+        for event, future in futures:
+            try:
+                results.append(json.loads(future.result()['body']))
+            except Exception:
+                failed.append(event.get('detail', {}).get('case-id', 'unknown'))
+    
+    if failed:
+        raise RuntimeError(f"묶음 이벤트 {len(events)}개 중 {len(failed)}개 처리 실패: {', '.join(failed)}")
+    
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'message': f'Processed {len(events)} events',
+            'results': results
+        }, ensure_ascii=False)
+    }
+
+
+def is_queue_event(event: Dict[str, Any]) -> bool:
+    """SQS 트리거 이벤트인지 (로컬 큐도 같은 형식)"""
+    records = event.get('Records')
+    return bool(records) and records[0].get('eventSource') == 'aws:sqs'
+
+
+def process_queue_record(record: Dict[str, Any]) -> None:
+    """
+    큐 메시지 하나 처리 (본문은 EventBridge 이벤트)
+    
+    처리에 실패하면 예외를 발생시켜 배치 응답에서 실패로 보고되게 합니다.
+    """
+    # 남은 시간이 부족하면 시작하지 않음 - 가시성 타임아웃 후 다시 전달됨
+    ensure_time_for(MIN_CALL_BUDGET_MS / 1000, '큐 메시지 처리 시작')
+    
+    event = json.loads(record['body'])
+    handle_event(event, handoff_on_deadline=False)
+
+
+def handle_queue_batch(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    SQS 배치의 메시지를 QUEUE_CONCURRENCY개씩 동시에 처리하고 실패한 메시지만 보고
+    
+    Bedrock 스로틀링 등으로 실패한 메시지는 batchItemFailures로 돌려줘 그 메시지만 다시 전달되고,
+    성공한 메시지는 큐에서 삭제됩니다 (이벤트 소스 매핑에 ReportBatchItemFailures 설정 필요).
+    
+    Args:
+        records: SQS 이벤트의 Records
+    
+    Returns:
+        {'batchItemFailures': [{'itemIdentifier': 메시지 ID}, ...]}
+    """
+    print(f"📥 큐 메시지 {len(records)}개 수신 (동시 처리 {QUEUE_CONCURRENCY}개)")
+    
+    failures = []
+    with ThreadPoolExecutor(max_workers=QUEUE_CONCURRENCY) as executor:
+        futures = [(record['messageId'], executor.submit(process_queue_record, record)) for record in records]
+        for message_id, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"   ❌ 메시지 처리 실패 ({message_id}): {str(e)}")
+                failures.append({'itemIdentifier': message_id})
+    
+    print(f"📥 큐 배치 처리 완료: 성공 {len(records) - len(failures)}개, 실패 {len(failures)}개")
+    return {'batchItemFailures': failures}
+
+
+class LocalEventQueue:
+    """
+    SQS 표준 큐 대용 (로컬 테스트용)
+    
+    receive()는 SQS 트리거와 같은 형식의 Records를 돌려주고, 실패로 보고된 메시지는 다시 큐에 넣으며
+    LOCAL_QUEUE_MAX_RECEIVES번 실패한 메시지는 dead_letters로 옮깁니다.
+    """
+    
+    def __init__(self):
+        self.messages = []
+        self.dead_letters = []
+        self.lock = threading.Lock()
+    
+    def send(self, event: Dict[str, Any]) -> str:
+        message = {'messageId': str(uuid.uuid4()), 'body': json.dumps(event, ensure_ascii=False), 'receive_count': 0}
+        with self.lock:
+            self.messages.append(message)
+        return message['messageId']
+    
+    def receive(self, max_messages: int = 10) -> List[Dict[str, Any]]:
+        with self.lock:
+            batch, self.messages = self.messages[:max_messages], self.messages[max_messages:]
+        for message in batch:
+            message['receive_count'] += 1
+        return [{
+            'messageId': message['messageId'],
+            'body': message['body'],
+            'eventSource': 'aws:sqs',
+            'attributes': {'ApproximateReceiveCount': str(message['receive_count'])},
+            '_message': message
+        } for message in batch]
+    
+    def acknowledge(self, records: List[Dict[str, Any]], failures: List[Dict[str, str]]) -> None:
+        """처리 결과 반영 - 성공한 메시지는 삭제, 실패한 메시지는 다시 넣거나 dead letter로"""
+        failed_ids = {failure['itemIdentifier'] for failure in failures}
+        with self.lock:
+            for record in records:
+                if record['messageId'] not in failed_ids:
+                    continue
+                message = record['_message']
+                if message['receive_count'] >= LOCAL_QUEUE_MAX_RECEIVES:
+                    self.dead_letters.append(message)
+                else:
+                    self.messages.append(message)
+
+
+def drain_local_queue(queue: LocalEventQueue, batch_size: int = 10, context: Any = None) -> Dict[str, int]:
+    """
+    로컬 큐가 빌 때까지 SQS 트리거처럼 배치 단위로 핸들러 호출
+    
+    Returns:
+        {'batches': 호출 수, 'processed': 성공 메시지 수, 'dead_letters': dead letter 메시지 수}
+    """
+    batches = 0
+    processed = 0
+    while queue.messages:
+        records = queue.receive(batch_size)
+        response = lambda_handler({'Records': records}, context)
+        queue.acknowledge(records, response['batchItemFailures'])
+        batches += 1
+        processed += len(records) - len(response['batchItemFailures'])
+    
+    return {'batches': batches, 'processed': processed, 'dead_letters': len(queue.dead_letters)}
 
 
 def process_resolved_case(case_id: str, display_id: str) -> Dict[str, Any]:
@@ -102,9 +863,14 @@ def process_resolved_case(case_id: str, display_id: str) -> Dict[str, Any]:
     print(f"1️⃣ 케이스 정보 수집 중...")
     case_data = get_case_details(case_id)
     
-    # 2. Bedrock으로 요약 및 분류
+    # serviceCode로 분류가 확정되면 요약 전에 임시 문서를 최종 경로에 먼저 저장
+    if PROVISIONAL_WRITE and classify_case(case_data['case']):
+        print(f"   임시 문서 저장 (요약 완료 시 덮어씀)")
+        save_to_s3(build_provisional_summary(case_data), display_id)
+    
+    # 2. Bedrock으로 요약 및 분류 (내용이 같으면 캐시된 요약 재사용)
     print(f"2️⃣ Bedrock Claude로 요약 생성 중...")
-    summary = summarize_with_bedrock(case_data)
+    summary, cache_hit = summarize_with_cache(case_data)
     
     # 3. S3에 저장
     print(f"3️⃣ S3에 저장 중...")
@@ -120,7 +886,8 @@ def process_resolved_case(case_id: str, display_id: str) -> Dict[str, Any]:
     return {
         's3_key': s3_key,
         'category': summary['category'],
-        'service': summary['service']
+        'service': summary['service'],
+        'cache_hit': cache_hit
     }
 
 
@@ -171,25 +938,13 @@ def get_case_details(case_id: str) -> Dict[str, Any]:
         }
     
     # 실제 Support API 호출
-    # 케이스 기본 정보 조회
-    case_response = support_client.describe_cases(
-        caseIdList=[case_id],
-        includeResolvedCases=True,
-        language='ko'  # 한국어 응답
-    )
-    
-    if not case_response['cases']:
-        raise ValueError(f"케이스를 찾을 수 없습니다: {case_id}")
-    
-    case = case_response['cases'][0]
-    
-    # 대화 내역 조회
-    comms_response = support_client.describe_communications(
-        caseId=case_id,
-        maxResults=100  # 최대 100개 대화
-    )
-    
-    communications = comms_response.get('communications', [])
+    # 케이스 기본 정보와 대화 내역(전체 페이지)을 동시에 조회
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        case_future = executor.submit(describe_case, case_id)
+        comms_future = executor.submit(describe_all_communications, case_id)
+        
+        case = case_future.result()
+        communications = comms_future.result()
     
     print(f"   케이스 제목: {case.get('subject', 'N/A')}")
     print(f"   대화 수: {len(communications)}개")
@@ -200,41 +955,272 @@ def get_case_details(case_id: str) -> Dict[str, Any]:
     }
 
 
-def summarize_with_bedrock(case_data: Dict[str, Any]) -> Dict[str, Any]:
+def describe_case(case_id: str) -> Dict[str, Any]:
     """
-    Bedrock Claude를 사용하여 케이스 요약 및 분류
+    Support API로 케이스 기본 정보 조회
     
     Args:
-        case_data: 케이스 정보 및 대화 내역
+        case_id: AWS Support 케이스 ID
     
     Returns:
-        요약된 케이스 정보 (category, service, question, solution, steps, tags 포함)
+        케이스 정보
     """
-    case = case_data['case']
-    communications = case_data['communications']
+    case_response = support_concurrency.call(
+        get_client('support').describe_cases,
+        caseIdList=[case_id],
+        includeResolvedCases=True,
+        language='ko'  # 한국어 응답
+    )
     
-    # 케이스 내용 조합
-    full_text = f"""
-제목: {case.get('subject', 'N/A')}
-심각도: {case.get('severityCode', 'normal')}
-서비스 코드: {case.get('serviceCode', 'general')}
-생성일: {case.get('timeCreated', 'N/A')}
-
-대화 내역:
-"""
+    if not case_response['cases']:
+        raise ValueError(f"케이스를 찾을 수 없습니다: {case_id}")
     
-    for comm in communications:
-        submitted_by = comm.get('submittedBy', 'Unknown')
-        body = comm.get('body', '')
-        full_text += f"\n[{submitted_by}]\n{body}\n"
+    return case_response['cases'][0]
+
+
+def describe_all_communications(case_id: str) -> List[Dict[str, Any]]:
+    """
+    Support API로 케이스의 대화 내역을 nextToken이 없을 때까지 모두 조회
     
-    # Bedrock Claude 프롬프트
-    prompt = f"""다음 AWS Support 케이스를 분석하여 요약해주세요:
+    Args:
+        case_id: AWS Support 케이스 ID
+    
+    Returns:
+        대화 내역 목록
+    """
+    communications = []
+    next_token = None
+    
+    while True:
+        params = {
+            'caseId': case_id,
+            'maxResults': 100  # 페이지당 최대 100개
+        }
+        if next_token:
+            params['nextToken'] = next_token
+        
+        comms_response = support_concurrency.call(get_client('support').describe_communications, **params)
+        communications.extend(comms_response.get('communications', []))
+        
+        next_token = comms_response.get('nextToken')
+        if not next_token:
+            return communications
+
+
+# 요약 캐시 (웜 컨테이너 내 LRU 메모리 캐시 + S3 사이드카)
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def remember_summary(content_hash: str, summary: Dict[str, Any]) -> None:
+    """메모리 캐시에 요약 저장 (SUMMARY_CACHE_MAX_ENTRIES를 넘으면 가장 오래 안 쓴 항목부터 제거)"""
+    with _summary_cache_lock:
+        _summary_cache[content_hash] = dict(summary)
+        _summary_cache.move_to_end(content_hash)
+        while len(_summary_cache) > SUMMARY_CACHE_MAX_ENTRIES:
+            _summary_cache.popitem(last=False)
+
+
+def compute_content_hash(case_data: Dict[str, Any]) -> str:
+    """
+    요약 결과를 결정하는 입력(케이스 내용 + 대화 내역 + 프롬프트 버전 + 모델)의 해시
+    
+    timeResolved처럼 요약 내용에 영향을 주지 않는 필드는 제외하므로,
+    재오픈 후 다시 해결된 케이스도 대화가 같으면 같은 해시가 됩니다.
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+    
+    Returns:
+        SHA-256 hex 문자열
+    """
+    case = case_data['case']
+    content = {
+        'prompt_version': PROMPT_VERSION,
+        'model_id': SUMMARY_FAST_MODEL_ID if classify_case(case) else MODEL_ID,
+        'case': {
+            key: case.get(key)
+            for key in ('caseId', 'subject', 'severityCode', 'serviceCode', 'categoryCode', 'timeCreated')
+        },
+        'communications': [
+            [comm.get('submittedBy'), comm.get('timeCreated'), comm.get('body')]
+            for comm in case_data['communications']
+        ]
+    }
+    
+    encoded = json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_cached_summary(content_hash: str) -> Dict[str, Any]:
+    """
+    캐시된 요약 조회
+    
+    Args:
+        content_hash: compute_content_hash 결과
+    
+    Returns:
+        캐시된 요약 (없으면 None)
+    """
+    with _summary_cache_lock:
+        if content_hash in _summary_cache:
+            _summary_cache.move_to_end(content_hash)
+            return dict(_summary_cache[content_hash])
+    
+    if MOCK_MODE or not meta_bucket_enabled():
+        return None
+    
+    try:
+        response = get_client('s3').get_object(
+            Bucket=META_BUCKET,
+            Key=f"{META_PREFIX}summary-cache/{content_hash}"
+        )
+    except get_client('s3').exceptions.NoSuchKey:
+        return None
+    except Exception as e:
+        print(f"   ⚠️  요약 캐시 조회 실패: {str(e)}")
+        return None
+    
+    summary = json.loads(response['Body'].read())
+    remember_summary(content_hash, summary)
+    return dict(summary)
+
+
+def put_cached_summary(content_hash: str, summary: Dict[str, Any]) -> None:
+    """
+    요약을 캐시에 저장 (실패해도 처리는 계속)
+    
+    Args:
+        content_hash: compute_content_hash 결과
+        summary: 저장할 요약
+    """
+    remember_summary(content_hash, summary)
+    
+    if MOCK_MODE or not meta_bucket_enabled():
+        return
+    
+    try:
+        get_client('s3').put_object(
+            Bucket=META_BUCKET,
+            Key=f"{META_PREFIX}summary-cache/{content_hash}",
+            Body=json.dumps(summary, ensure_ascii=False),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        print(f"   ⚠️  요약 캐시 저장 실패: {str(e)}")
+
+
+def classify_case(case: Dict[str, Any]) -> Dict[str, str]:
+    """
+    케이스의 serviceCode/categoryCode로 category, service를 결정 (LLM 호출 없음)
+    
+    결제/계정 코드는 billing/account로, SERVICE_CODE_PREFIXES에 있는 서비스는 technical로 분류합니다.
+    general-info처럼 판단할 수 없는 코드는 None을 반환하고 Bedrock 분류 결과를 사용합니다.
+    
+    Args:
+        case: Support API 케이스 정보
+    
+    Returns:
+        {'category': ..., 'service': ...} (확신할 수 없으면 None)
+    """
+    service_code = (case.get('serviceCode') or '').lower()
+    category_code = (case.get('categoryCode') or '').lower()
+    
+    if service_code in BILLING_SERVICE_CODES or (service_code in ('', 'general-info') and category_code in BILLING_CATEGORY_CODES):
+        return {'category': 'billing', 'service': 'billing'}
+    if service_code in ACCOUNT_SERVICE_CODES or (service_code in ('', 'general-info') and category_code in ACCOUNT_CATEGORY_CODES):
+        return {'category': 'account', 'service': 'account'}
+    
+    matches = [prefix for prefix in SERVICE_CODE_PREFIXES if service_code.startswith(prefix)]
+    if not matches:
+        return None
+    return {'category': 'technical', 'service': SERVICE_CODE_PREFIXES[max(matches, key=len)]}
+
+
+def build_provisional_summary(case_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    요약 전 임시 문서 (제목과 첫 질문만, 분류가 확정된 케이스용)
+    
+    최종 요약과 같은 category/service이므로 같은 S3 경로에 저장되고, 요약이 끝나면 덮어써집니다.
+    """
+    communications = case_data['communications']
+    first_message = communications[0].get('body', '') if communications else ''
+    summary = {
+        'question': case_data['case'].get('subject', ''),
+        'answer': '',
+        'solution': '',
+        'steps': [],
+        'tags': [],
+        'user_messages': [first_message] if first_message else [],
+        'support_messages': [],
+        'provisional': True
+    }
+    return attach_case_metadata(summary, case_data['case'])
+
+
+def summarize_with_cache(case_data: Dict[str, Any], before_invoke: Callable[[], None] = None) -> tuple:
+    """
+    요약 캐시를 먼저 확인하고, 없을 때만 Bedrock으로 요약
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+        before_invoke: 캐시 미스로 Bedrock을 호출하기 직전에 실행할 함수 (예: Rate Limiter)
+    
+    Returns:
+        (요약, 캐시 적중 여부)
+    """
+    content_hash = compute_content_hash(case_data)
+    
+    cached = get_cached_summary(content_hash)
+    if cached is not None:
+        print(f"   ♻️  내용이 같은 요약 재사용 (hash {content_hash[:12]}), Bedrock 호출 생략")
+        # 해결 시각 등 원본 정보는 이번 케이스 기준으로 갱신
+        return attach_case_metadata(cached, case_data['case']), True
+    
+    if before_invoke:
+        before_invoke()
+    
+    summary = summarize_with_bedrock(case_data)
+    put_cached_summary(content_hash, summary)
+    return summary, False
+
+
+def summarize_with_bedrock(case_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bedrock Claude를 사용하여 케이스 요약 및 분류
+    
+    serviceCode로 분류가 확정된 케이스(classify_case)는 분류 없이 요약만 요청하고
+    SUMMARY_FAST_MODEL_ID를 사용합니다. 프롬프트가 SUMMARY_TOKEN_BUDGET을 넘는 긴 케이스는
+    summarize_long_case로 대화 내역을 나누어 요약한 뒤 합칩니다.
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+    
+    Returns:
+        요약된 케이스 정보 (category, service, question, solution, steps, tags 포함)
+    """
+    classification = classify_case(case_data['case'])
+    if classification:
+        print(f"   분류 확정 (serviceCode): {classification['category']}/{classification['service']}, 요약 전용 모델 사용")
+        json_format, model_id = SUMMARY_ONLY_JSON_FORMAT, SUMMARY_FAST_MODEL_ID
+    else:
+        json_format, model_id = SUMMARY_JSON_FORMAT, MODEL_ID
+    
+    prompt = build_summary_prompt(case_data, json_format)
+    prompt_tokens = estimate_tokens(prompt)
+    
+    # Bedrock API 호출 (재시도 로직 포함)
+    if prompt_tokens > SUMMARY_TOKEN_BUDGET:
+        print(f"   긴 케이스 (약 {prompt_tokens} 토큰 > {SUMMARY_TOKEN_BUDGET}), 분할 요약 진행")
+        summary_json = summarize_long_case(case_data, json_format, model_id)
+    else:
+        summary_json = invoke_bedrock_with_retry(prompt, max_retries=3, model_id=model_id)
+    
+    return attach_case_metadata(summary_json, case_data['case'])
 
-{full_text}
 
-다음 JSON 형식으로만 응답하세요 (다른 텍스트 없이 JSON만):
-{{
+SUMMARY_JSON_FORMAT = """다음 JSON 형식으로만 응답하세요 (다른 텍스트 없이 JSON만):
+{
   "category": "technical, billing, account 중 하나",
   "service": "ec2, rds, lambda, s3, vpc 등 AWS 서비스명 (소문자)",
   "question": "사용자의 핵심 질문을 1-2문장으로 요약 (사용자가 처음 제기한 문제)",
@@ -244,78 +1230,743 @@ def summarize_with_bedrock(case_data: Dict[str, Any]) -> Dict[str, Any]:
   "tags": ["관련", "키워드", "태그"],
   "user_messages": ["사용자가 보낸 주요 메시지들"],
   "support_messages": ["AWS Support가 보낸 주요 답변들"]
-}}
+}
 
 중요: question은 사용자의 질문, answer는 AWS Support의 답변, solution은 해결 방법으로 명확히 구분해주세요.
 """
+
+# 분류(category/service)가 이미 확정된 케이스용 - 요약 항목만 요청
+SUMMARY_ONLY_JSON_FORMAT = """다음 JSON 형식으로만 응답하세요 (다른 텍스트 없이 JSON만):
+{
+  "question": "사용자의 핵심 질문을 1-2문장으로 요약 (사용자가 처음 제기한 문제)",
+  "answer": "AWS Support 엔지니어의 최종 답변을 1-2문장으로 요약",
+  "solution": "문제 해결 방법을 3-5줄로 요약",
+  "steps": ["구체적인 해결 단계1", "구체적인 해결 단계2", "구체적인 해결 단계3"],
+  "tags": ["관련", "키워드", "태그"],
+  "user_messages": ["사용자가 보낸 주요 메시지들"],
+  "support_messages": ["AWS Support가 보낸 주요 답변들"]
+}
+
+중요: question은 사용자의 질문, answer는 AWS Support의 답변, solution은 해결 방법으로 명확히 구분해주세요.
+"""
+
+# 응답 JSON에 항목이 없을 때 채울 기본값 (parse_model_output의 스키마 검증용)
+SUMMARY_DEFAULTS = {
+    'category': 'general',
+    'service': 'general',
+    'question': '',
+    'answer': '',
+    'solution': '',
+    'steps': [],
+    'tags': [],
+    'user_messages': [],
+    'support_messages': []
+}
+
+CHUNK_DEFAULTS = {
+    'user_points': [],
+    'support_points': [],
+    'actions': [],
+    'services': []
+}
+
+CHUNK_JSON_FORMAT = """이 구간의 핵심 내용을 다음 JSON 형식으로만 응답하세요 (다른 텍스트 없이 JSON만):
+{
+  "user_points": ["사용자가 제기한 문제, 질문, 추가로 제공한 정보"],
+  "support_points": ["AWS Support 엔지니어의 답변과 안내"],
+  "actions": ["시도했거나 권장된 조치와 그 결과"],
+  "services": ["언급된 AWS 서비스명 (소문자)"]
+}
+"""
+
+
+def build_case_header(case: Dict[str, Any]) -> str:
+    """프롬프트에 들어가는 케이스 기본 정보 부분"""
+    return f"""
+제목: {case.get('subject', 'N/A')}
+심각도: {case.get('severityCode', 'normal')}
+서비스 코드: {case.get('serviceCode', 'general')}
+생성일: {case.get('timeCreated', 'N/A')}
+
+대화 내역:
+"""
+
+
+def format_communication(comm: Dict[str, Any]) -> str:
+    """프롬프트에 들어가는 대화 한 건"""
+    submitted_by = comm.get('submittedBy', 'Unknown')
+    body = comm.get('body', '')
+    return f"\n[{submitted_by}]\n{body}\n"
+
+
+def build_summary_prompt(case_data: Dict[str, Any], json_format: str = SUMMARY_JSON_FORMAT) -> str:
+    """
+    케이스 요약용 Bedrock 프롬프트 생성
     
-    # Bedrock API 호출 (재시도 로직 포함)
-    summary_json = invoke_bedrock_with_retry(prompt, max_retries=3)
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+        json_format: 응답 형식 안내 (분류가 확정된 케이스는 SUMMARY_ONLY_JSON_FORMAT)
+    
+    Returns:
+        프롬프트 문자열
+    """
+    # 케이스 내용 조합
+    full_text = build_case_header(case_data['case'])
+    for comm in case_data['communications']:
+        full_text += format_communication(comm)
+    
+    # Bedrock Claude 프롬프트
+    return f"""다음 AWS Support 케이스를 분석하여 요약해주세요:
+
+{full_text}
+
+{json_format}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Claude 입력 토큰 수 추정 (API 호출 없이)
+    
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 약 1토큰으로 계산합니다.
+    분할 여부 판단용이므로 보수적으로(많게) 추정합니다.
+    
+    Args:
+        text: 프롬프트 문자열
+    
+    Returns:
+        추정 토큰 수
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def chunk_communications(communications: List[Dict[str, Any]], token_budget: int) -> List[str]:
+    """
+    대화 내역을 구간당 token_budget 토큰 이하의 텍스트 구간으로 분할
+    
+    대화 한 건이 구간 한도보다 크면 그 대화 본문을 여러 구간으로 자릅니다.
+    
+    Args:
+        communications: 대화 내역 목록
+        token_budget: 구간당 최대 토큰 수
+    
+    Returns:
+        구간 텍스트 목록 (대화 순서 유지)
+    """
+    chunks = []
+    current = ''
+    current_tokens = 0
+    
+    for comm in communications:
+        text = format_communication(comm)
+        tokens = estimate_tokens(text)
+        
+        if current and current_tokens + tokens > token_budget:
+            chunks.append(current)
+            current, current_tokens = '', 0
+        
+        if tokens <= token_budget:
+            current += text
+            current_tokens += tokens
+            continue
+        
+        # 한 건이 구간 한도보다 큰 경우 글자 수 비율로 잘라서 별도 구간으로
+        chars_per_chunk = max(1, len(text) * token_budget // tokens)
+        for start in range(0, len(text), chars_per_chunk):
+            chunks.append(text[start:start + chars_per_chunk])
     
-    # 원본 정보 추가
-    summary_json['case_id'] = case['caseId']
-    summary_json['display_id'] = case.get('displayId', case['caseId'])
-    summary_json['severity'] = case.get('severityCode', 'normal')
-    summary_json['created_at'] = case.get('timeCreated', '')
-    summary_json['resolved_at'] = case.get('timeResolved', datetime.now().isoformat())
+    if current:
+        chunks.append(current)
     
-    return summary_json
+    return chunks
 
 
-def invoke_bedrock_with_retry(prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+def build_chunk_prompts(case_data: Dict[str, Any]) -> List[str]:
+    """
+    긴 케이스 분할 요약의 map 단계 프롬프트 (CHUNK_TOKEN_BUDGET 단위 구간마다 하나)
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+    
+    Returns:
+        구간 요약 프롬프트 목록 (대화 순서 유지, 응답 형식은 CHUNK_JSON_FORMAT)
+    """
+    header = build_case_header(case_data['case'])
+    chunks = chunk_communications(case_data['communications'], CHUNK_TOKEN_BUDGET)
+    total = len(chunks)
+    
+    return [
+        f"""다음은 AWS Support 케이스 대화 내역 중 일부입니다 (구간 {index + 1}/{total}):
+
+{header}{chunk}
+
+{CHUNK_JSON_FORMAT}"""
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+def build_reduce_prompt(case_data: Dict[str, Any], notes: List[Dict[str, Any]],
+                        json_format: str = SUMMARY_JSON_FORMAT) -> str:
+    """
+    긴 케이스 분할 요약의 reduce 단계 프롬프트 (구간 요약을 모아 최종 요약 요청)
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+        notes: 구간 순서대로의 구간 요약 JSON
+        json_format: 최종 요약 응답 형식 안내
+    
+    Returns:
+        프롬프트 문자열
+    """
+    header = build_case_header(case_data['case'])
+    total = len(notes)
+    
+    chunk_text = ''
+    for index, note in enumerate(notes):
+        chunk_text += f"\n[구간 {index + 1}/{total}]\n{json.dumps(note, ensure_ascii=False)}\n"
+    
+    return f"""다음 AWS Support 케이스를 분석하여 요약해주세요.
+대화 내역이 길어 시간 순서대로 구간별 요약으로 제공합니다:
+{header}{chunk_text}
+
+{json_format}"""
+
+
+def summarize_long_case(case_data: Dict[str, Any], json_format: str = SUMMARY_JSON_FORMAT,
+                        model_id: str = MODEL_ID) -> Dict[str, Any]:
+    """
+    긴 케이스 분할 요약 (map-reduce)
+    
+    1. map: 대화 내역을 CHUNK_TOKEN_BUDGET 단위 구간으로 나누어 구간별 핵심 내용을 병렬로 요약
+    2. reduce: 구간 요약을 모아 한 번의 짧은 호출로 최종 요약 JSON 생성 (일반 요약과 같은 스키마)
+    
+    Args:
+        case_data: 케이스 정보 및 대화 내역
+        json_format: 최종 요약 응답 형식 안내
+        model_id: 사용할 모델
+    
+    Returns:
+        Bedrock 요약 JSON (원본 정보 추가 전)
+    """
+    prompts = build_chunk_prompts(case_data)
+    
+    def summarize_chunk(prompt: str) -> Dict[str, Any]:
+        return invoke_bedrock_with_retry(prompt, max_retries=3, max_tokens=CHUNK_MAX_TOKENS,
+                                         model_id=model_id, defaults=CHUNK_DEFAULTS)
+    
+    print(f"   대화 내역 {len(prompts)}개 구간 요약 중...")
+    with ThreadPoolExecutor(max_workers=MAP_CONCURRENCY) as executor:
+        notes = list(executor.map(summarize_chunk, prompts))
+    
+    print(f"   구간 요약 {len(notes)}개 통합 중...")
+    return invoke_bedrock_with_retry(build_reduce_prompt(case_data, notes, json_format),
+                                     max_retries=3, model_id=model_id)
+
+
+def attach_case_metadata(summary: Dict[str, Any], case: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bedrock 요약 결과에 원본 케이스 정보 추가
+    
+    serviceCode로 분류가 확정되면(classify_case) category/service는 모델 출력 대신 그 값을 사용합니다.
+    
+    Args:
+        summary: Bedrock이 반환한 요약 JSON
+        case: Support API 케이스 정보
+    
+    Returns:
+        원본 정보가 추가된 요약
+    """
+    summary['case_id'] = case['caseId']
+    summary['display_id'] = case.get('displayId', case['caseId'])
+    summary['severity'] = case.get('severityCode', 'normal')
+    summary['created_at'] = case.get('timeCreated', '')
+    summary['resolved_at'] = case.get('timeResolved', datetime.now().isoformat())
+    
+    classification = classify_case(case)
+    if classification:
+        summary.update(classification)
+        summary['classified_by'] = 'serviceCode'
+    else:
+        summary['classified_by'] = 'model'
+    
+    return summary
+
+
+def build_model_body(prompt: str, max_tokens: int = 2000) -> Dict[str, Any]:
+    """
+    Claude Messages API 요청 본문 생성 (invoke_model 및 배치 추론 입력에 공통 사용)
+    
+    Args:
+        prompt: Bedrock에 전달할 프롬프트
+        max_tokens: 응답 최대 토큰 수
+    
+    Returns:
+        요청 본문 딕셔너리
+    """
+    return {
+        'anthropic_version': 'bedrock-2023-05-31',
+        'max_tokens': max_tokens,
+        'messages': [
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+    }
+
+
+def parse_model_output(result: Dict[str, Any], defaults: Dict[str, Any] = SUMMARY_DEFAULTS) -> Dict[str, Any]:
+    """
+    Claude 응답 본문에서 요약 JSON 추출
+    
+    코드 블록을 벗겨낸 텍스트가 바로 파싱되지 않으면(앞뒤 설명 문장, 끝의 쉼표, 스마트 따옴표,
+    이스케이프되지 않은 따옴표, 잘린 응답 등) repair_json_text로 고쳐서 다시 파싱합니다.
+    복구에 성공하면 Bedrock을 다시 호출하지 않으므로 재시도 한 번을 아낀 것으로 기록합니다.
+    
+    Args:
+        result: Claude Messages API 응답 본문
+        defaults: 항목별 기본값 (없는 항목은 채우고 형식이 다르면 맞춤, None이면 검증 생략)
+    
+    Returns:
+        요약 JSON
+    """
+    content_text = result['content'][0]['text']
+    
+    # JSON 추출 (```json ``` 제거)
+    json_text = content_text
+    if '```json' in json_text:
+        json_text = json_text.split('```json')[1].split('```')[0].strip()
+    elif '```' in json_text:
+        json_text = json_text.split('```')[1].split('```')[0].strip()
+    
+    try:
+        parsed = json.loads(json_text)
+    except ValueError:
+        # 복구해도 파싱되지 않으면 ValueError로 재시도
+        parsed = json.loads(repair_json_text(content_text))
+        record_json_repair()
+        print(f"   🩹 응답 JSON 형식 복구 (재시도 생략)")
+    
+    return apply_schema_defaults(parsed, defaults)
+
+
+SMART_QUOTES = '\u201c\u201d\u201e\u201f'
+
+
+def next_significant_char(text: str, index: int) -> str:
+    """index부터 공백이 아닌 첫 문자 (없으면 빈 문자열)"""
+    for ch in text[index:]:
+        if not ch.isspace():
+            return ch
+    return ''
+
+
+def repair_json_text(text: str) -> str:
+    """
+    모델 응답에서 첫 번째 JSON 객체를 괄호 균형으로 잘라내며 흔한 형식 오류를 고침
+    
+    - 앞뒤 설명 문장/코드 블록: 첫 '{'부터 짝이 맞는 '}'까지만 사용
+    - 문자열 구분자로 쓰인 스마트 따옴표(“ ”): 일반 따옴표로 변경 (문자열 안의 스마트 따옴표는 유지)
+    - 이스케이프되지 않은 따옴표: 뒤에 , : } ] 가 오지 않으면 문자열 내용으로 보고 이스케이프
+    - 문자열 안의 줄바꿈/탭: 이스케이프
+    - 닫는 괄호 앞의 쉼표: 제거
+    - 잘린 응답: 열린 문자열과 괄호를 닫음
+    
+    Args:
+        text: 모델 응답 텍스트
+    
+    Returns:
+        복구된 JSON 텍스트 (json.loads 성공은 보장하지 않음)
+    """
+    start = text.find('{')
+    if start < 0:
+        raise ValueError("응답에 JSON 객체가 없음")
+    
+    out = []
+    stack = []
+    in_string = False
+    smart_string = False
+    escape = False
+    
+    def drop_trailing_comma():
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ',':
+            out.pop()
+    
+    for index in range(start, len(text)):
+        ch = text[index]
+        
+        if in_string:
+            if escape:
+                out.append(ch)
+                escape = False
+            elif ch == '\\':
+                out.append(ch)
+                escape = True
+            elif ch == '"' or (smart_string and ch in SMART_QUOTES):
+                if next_significant_char(text, index + 1) in (',', ':', '}', ']', ''):
+                    out.append('"')
+                    in_string = False
+                else:
+                    out.append('\\"')
+            elif ch == '\n':
+                out.append('\\n')
+            elif ch == '\t':
+                out.append('\\t')
+            elif ord(ch) >= 0x20:
+                out.append(ch)
+            continue
+        
+        if ch == '"' or ch in SMART_QUOTES:
+            out.append('"')
+            in_string = True
+            smart_string = ch != '"'
+        elif ch in '{[':
+            stack.append(ch)
+            out.append(ch)
+        elif ch in '}]':
+            drop_trailing_comma()
+            out.append(ch)
+            if stack:
+                stack.pop()
+            if not stack:
+                break
+        else:
+            out.append(ch)
+    
+    # 잘린 응답 (max_tokens 도달 등)
+    if in_string:
+        out.append('"')
+    for opener in reversed(stack):
+        drop_trailing_comma()
+        out.append('}' if opener == '{' else ']')
+    
+    return ''.join(out)
+
+
+def apply_schema_defaults(parsed: Any, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    응답 JSON 스키마 검증 및 기본값 채우기
+    
+    목록 항목에 문자열 하나가 오면 목록으로 감싸고, 문자열 항목에 다른 타입이 오면 문자열로 바꿉니다.
+    객체가 아니거나 스키마 항목이 하나도 없으면 ValueError (재시도 대상)입니다.
+    """
+    if not isinstance(parsed, dict):
+        raise ValueError("응답 JSON이 객체가 아님")
+    if defaults is None:
+        return parsed
+    if not any(key in parsed for key in defaults):
+        raise ValueError(f"응답 JSON에 필요한 항목이 없음: {list(parsed)[:5]}")
+    
+    for key, default in defaults.items():
+        value = parsed.get(key)
+        if isinstance(default, list):
+            if value is None:
+                parsed[key] = []
+            elif not isinstance(value, list):
+                parsed[key] = [value]
+        elif value is None:
+            parsed[key] = default
+        elif not isinstance(value, str):
+            parsed[key] = str(value)
+    
+    return parsed
+
+
+# 응답 JSON 복구로 Bedrock 재호출을 생략한 횟수
+json_repair_stats = {'repaired': 0}
+json_repair_stats_lock = threading.Lock()
+
+
+def record_json_repair() -> None:
+    with json_repair_stats_lock:
+        json_repair_stats['repaired'] += 1
+
+
+def get_json_repair_count() -> int:
+    """응답 JSON 복구로 재시도를 생략한 횟수"""
+    with json_repair_stats_lock:
+        return json_repair_stats['repaired']
+
+
+class StreamingJSONValidator:
+    """
+    스트리밍 응답을 한 글자씩 받으며 JSON 객체가 될 수 있는지 검사
+    
+    parse_model_output이 복구할 수 있는 응답은 중단하지 않습니다. JSON 앞의 짧은 설명 문장은
+    PREFIX_LIMIT자까지 허용하고, 문자열 밖의 JSON에 올 수 없는 문자(스마트 따옴표,
+    이스케이프되지 않은 따옴표 등)가 나오면 이후 구조 검사를 멈추고 끝까지 받습니다.
+    PREFIX_LIMIT 안에 JSON이 시작되지 않거나(설명문만 생성) 괄호 짝이 맞지 않으면 바로 실패로 판단합니다.
+    최상위 객체가 닫히면 complete가 되고 이후 텍스트는 받지 않습니다.
+    """
+    
+    PREFIX_LIMIT = 200
+    VALUE_CHARS = set(' \t\r\n,:0123456789+-.eEtrufalsn')
+    CLOSERS = {'}': '{', ']': '['}
+    
+    def __init__(self):
+        self.consumed = []  # 검사를 통과한 텍스트 (최상위 객체가 닫힌 곳까지)
+        self.stack = []
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escape = False
+        self.lenient = False  # 복구 대상 형식 오류 이후 구조 검사 중단
+        self.error = None
+    
+    def feed(self, text: str) -> bool:
+        """
+        텍스트 조각 검사
+        
+        Returns:
+            아직 유효한 JSON이 될 수 있으면 True
+        """
+        for ch in text:
+            if self.complete:
+                break
+            if not self._consume(ch):
+                return False
+            self.consumed.append(ch)
+        return True
+    
+    @property
+    def text(self) -> str:
+        return ''.join(self.consumed)
+    
+    def _fail(self, message: str) -> bool:
+        self.error = message
+        return False
+    
+    def _consume(self, ch: str) -> bool:
+        if not self.started:
+            if ch == '{':
+                self.started = True
+                self.stack.append(ch)
+                return True
+            if len(self.consumed) < self.PREFIX_LIMIT:
+                return True
+            return self._fail(f"JSON 없이 텍스트만 생성됨: {self.text.strip()[:30]!r}")
+        
+        if self.lenient:
+            return True
+        
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == '\\':
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+            elif ord(ch) < 0x20:
+                self.lenient = True  # 문자열 안의 줄바꿈 등
+            return True
+        
+        if ch == '"':
+            self.in_string = True
+        elif ch in '{[':
+            self.stack.append(ch)
+        elif ch in self.CLOSERS:
+            if self.stack.pop() != self.CLOSERS[ch]:
+                return self._fail(f"괄호 짝이 맞지 않음: {ch!r}")
+            self.complete = not self.stack
+        elif ch not in self.VALUE_CHARS:
+            self.lenient = True  # 스마트 따옴표, 이스케이프되지 않은 따옴표 등
+        return True
+
+
+# 스트리밍 호출 지표 (첫 토큰까지 걸린 시간, 조기 중단 횟수)
+bedrock_stream_stats = {'streams': 0, 'aborted': 0, 'first_token_ms_total': 0.0, 'first_token_count': 0}
+bedrock_stream_stats_lock = threading.Lock()
+
+
+def record_stream_metrics(first_token_ms: float, aborted: bool) -> None:
+    """스트리밍 호출 한 번의 지표 기록"""
+    with bedrock_stream_stats_lock:
+        bedrock_stream_stats['streams'] += 1
+        if aborted:
+            bedrock_stream_stats['aborted'] += 1
+        if first_token_ms is not None:
+            bedrock_stream_stats['first_token_ms_total'] += first_token_ms
+            bedrock_stream_stats['first_token_count'] += 1
+
+
+def get_bedrock_stream_metrics() -> Dict[str, Any]:
+    """
+    스트리밍 호출 지표 요약
+    
+    Returns:
+        {'streams': 호출 수, 'aborted': 조기 중단 수, 'avg_first_token_ms': 평균 첫 토큰 시간}
+    """
+    with bedrock_stream_stats_lock:
+        count = bedrock_stream_stats['first_token_count']
+        return {
+            'streams': bedrock_stream_stats['streams'],
+            'aborted': bedrock_stream_stats['aborted'],
+            'avg_first_token_ms': bedrock_stream_stats['first_token_ms_total'] / count if count else None
+        }
+
+
+def stream_model_output(prompt: str, max_tokens: int = 2000, model_id: str = MODEL_ID) -> Dict[str, Any]:
+    """
+    invoke_model_with_response_stream으로 응답을 받으며 JSON 형식을 검사
+    
+    응답이 JSON이 될 수 없는 시점(설명 문장으로 시작, 괄호 불일치 등)에 스트림을 닫고
+    ValueError를 발생시키므로, 전체 생성을 기다리지 않고 바로 재시도할 수 있습니다.
+    최상위 JSON 객체가 닫히면 나머지 응답은 기다리지 않습니다.
+    호출 1회는 call_timeout_seconds() 안에 끝나야 하며, 넘으면 DeadlineExceeded로 중단합니다
+    (첫 청크와 청크 사이 대기는 bedrock_runtime_for_call()의 read_timeout이 제한).
+    
+    Args:
+        prompt: Bedrock에 전달할 프롬프트
+        max_tokens: 응답 최대 토큰 수
+        model_id: 사용할 모델
+    
+    Returns:
+        invoke_model 응답과 같은 형식의 본문 ({'content': [{'type': 'text', 'text': ...}]})
+    """
+    import time
+    
+    timeout = call_timeout_seconds()
+    started_at = time.perf_counter()
+    response = bedrock_runtime_for_call().invoke_model_with_response_stream(
+        modelId=model_id,
+        body=json.dumps(build_model_body(prompt, max_tokens))
+    )
+    stream = response['body']
+    validator = StreamingJSONValidator()
+    first_token_ms = None
+    
+    try:
+        for event in stream:
+            chunk = json.loads(event['chunk']['bytes'])
+            if chunk.get('type') != 'content_block_delta':
+                continue
+            
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started_at) * 1000
+                print(f"   ⏱️  첫 토큰까지 {first_token_ms:.0f}ms")
+            
+            if not validator.feed(chunk['delta'].get('text', '')):
+                record_stream_metrics(first_token_ms, aborted=True)
+                raise ValueError(f"응답이 JSON 형식이 아님, 생성 중단 ({validator.error})")
+            if validator.complete:
+                break
+            
+            if time.perf_counter() - started_at > timeout:
+                record_stream_metrics(first_token_ms, aborted=True)
+                raise DeadlineExceeded(f"Bedrock 응답이 {timeout:.0f}초 안에 끝나지 않음")
+    finally:
+        stream.close()
+    
+    record_stream_metrics(first_token_ms, aborted=False)
+    return {'content': [{'type': 'text', 'text': validator.text}]}
+
+
+def invoke_bedrock_with_retry(prompt: str, max_retries: int = 3, max_tokens: int = 2000,
+                              model_id: str = MODEL_ID, defaults: Dict[str, Any] = SUMMARY_DEFAULTS) -> Dict[str, Any]:
     """
     Bedrock API 호출 (재시도 로직 포함)
     
+    에러 종류에 따라 재시도 방식이 다릅니다:
+    - 스로틀링: 동시 호출 수를 줄이고 full jitter 지수 백오프 후 재시도
+    - 응답 JSON 파싱 실패: 형식 복구(parse_model_output)로도 안 될 때만 대기 없이 재시도
+      (BEDROCK_STREAMING이면 JSON이 될 수 없는 시점에 생성을 중단하고 바로 재시도)
+    - ValidationException 등 재시도해도 같은 결과인 에러: 즉시 실패
+    - 그 외 에러: full jitter 지수 백오프 후 재시도
+    
+    Lambda에서 호출되면(set_invocation_context) 매 시도와 백오프 대기 전에 남은 시간을 확인하고,
+    MIN_CALL_BUDGET_MS보다 적게 남으면 DeadlineExceeded를 발생시켜 핸들러가 재시도 큐로 넘기게 합니다.
+    
     Args:
         prompt: Bedrock에 전달할 프롬프트
         max_retries: 최대 재시도 횟수
+        max_tokens: 응답 최대 토큰 수
+        model_id: 사용할 모델
+        defaults: 응답 JSON 항목별 기본값 (parse_model_output 참고)
     
     Returns:
         Bedrock 응답 JSON
     """
     import time
     
+    min_call_budget = MIN_CALL_BUDGET_MS / 1000
+    
     for attempt in range(max_retries):
+        ensure_time_for(min_call_budget, "Bedrock 호출")
+        
         try:
-            # Claude Sonnet 4.5 글로벌 inference profile 사용
-            response = bedrock_runtime.invoke_model(
-                modelId='arn:aws:bedrock:us-east-1:370662402529:inference-profile/global.anthropic.claude-sonnet-4-5-20250929-v1:0',
-                body=json.dumps({
-                    'anthropic_version': 'bedrock-2023-05-31',
-                    'max_tokens': 2000,
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ]
-                })
-            )
+            if BEDROCK_STREAMING:
+                # 스트리밍: JSON이 될 수 없는 응답은 생성 도중 ValueError로 중단
+                result = bedrock_concurrency.call(stream_model_output, prompt, max_tokens, model_id)
+            else:
+                response = bedrock_concurrency.call(
+                    bedrock_runtime_for_call().invoke_model,
+                    modelId=model_id,
+                    body=json.dumps(build_model_body(prompt, max_tokens))
+                )
+                result = json.loads(response['body'].read())
             
             # 응답 파싱
-            result = json.loads(response['body'].read())
-            content_text = result['content'][0]['text']
-            
-            # JSON 추출 (```json ``` 제거)
-            if '```json' in content_text:
-                content_text = content_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in content_text:
-                content_text = content_text.split('```')[1].split('```')[0].strip()
-            
-            summary = json.loads(content_text)
+            summary = parse_model_output(result, defaults)
             
             print(f"   Bedrock 요약 완료 (시도 {attempt + 1}/{max_retries})")
             return summary
             
+        except DeadlineExceeded:
+            raise
+            
         except Exception as e:
             print(f"   ⚠️  Bedrock API 호출 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}")
             
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2  # 2초, 4초, 6초
-                print(f"   {wait_time}초 후 재시도...")
-                time.sleep(wait_time)
-            else:
+            if attempt >= max_retries - 1 or get_error_code(e) in NON_RETRYABLE_ERROR_CODES:
                 raise
+            
+            if isinstance(e, (ValueError, KeyError, IndexError)):
+                # 모델 출력이 JSON 형식이 아님 (json.JSONDecodeError는 ValueError)
+                print(f"   응답 파싱 실패, 바로 재시도...")
+                continue
+            
+            wait_time = backoff_delay(attempt + 1)  # 0~2초, 0~4초, 0~8초 ...
+            ensure_time_for(wait_time + min_call_budget, "백오프 후 재시도")
+            print(f"   {wait_time:.1f}초 후 재시도...")
+            time.sleep(wait_time)
+
+
+def serialize_summary(summary: Dict[str, Any]) -> bytes:
+    """
+    STORAGE_FORMAT / STORAGE_GZIP 설정에 따라 요약을 직렬화
+    
+    Args:
+        summary: 요약된 케이스 정보
+    
+    Returns:
+        S3에 저장할 바이트열
+    """
+    if STORAGE_FORMAT == 'compact':
+        body = json.dumps(summary, ensure_ascii=False, separators=(',', ':'))
+    else:
+        body = json.dumps(summary, ensure_ascii=False, indent=2)
+    
+    body = body.encode('utf-8')
+    return gzip.compress(body) if STORAGE_GZIP else body
+
+
+def build_case_prefix(summary: Dict[str, Any], date: str = None) -> str:
+    """
+    케이스 저장 prefix: {category}/{service}/{YYYY-MM}
+    
+    Args:
+        summary: 요약된 케이스 정보
+        date: YYYY-MM (기본값: 현재 월)
+    
+    Returns:
+        prefix 문자열 (끝에 / 없음)
+    """
+    category = summary.get('category', 'general')
+    service = summary.get('service', 'general')
+    date = date or datetime.now().strftime('%Y-%m')
+    return f"{category}/{service}/{date}"
 
 
 def save_to_s3(summary: Dict[str, Any], display_id: str) -> str:
@@ -331,48 +1982,443 @@ def save_to_s3(summary: Dict[str, Any], display_id: str) -> str:
     """
     category = summary.get('category', 'general')
     service = summary.get('service', 'general')
-    date = datetime.now().strftime('%Y-%m')
     
     # S3 키 생성: {category}/{service}/{YYYY-MM}/{display-id}.json
-    s3_key = f"{category}/{service}/{date}/{display_id}.json"
+    s3_key = f"{build_case_prefix(summary)}/{display_id}.json"
     
     # JSON 직렬화
-    json_body = json.dumps(summary, ensure_ascii=False, indent=2)
+    body = serialize_summary(summary)
     
     if MOCK_MODE:
         print(f"   [MOCK] S3 저장 시뮬레이션: s3://{BUCKET_NAME}/{s3_key}")
-        print(f"   [MOCK] 데이터 크기: {len(json_body)} bytes")
+        print(f"   [MOCK] 데이터 크기: {len(body)} bytes")
     else:
+        params = {}
+        if STORAGE_GZIP:
+            params['ContentEncoding'] = 'gzip'
+        
         # S3에 저장
-        s3_client.put_object(
+        response = get_client('s3').put_object(
             Bucket=BUCKET_NAME,
             Key=s3_key,
-            Body=json_body,
+            Body=body,
             ContentType='application/json',
             Metadata={
                 'case-id': summary['case_id'],
                 'display-id': display_id,
                 'category': category,
                 'service': service
-            }
+            },
+            **params
         )
         print(f"   ✅ S3 저장 완료: s3://{BUCKET_NAME}/{s3_key}")
+        
+        # display_id로 바로 찾을 수 있도록 매니페스트 갱신
+        write_manifest_entry(display_id, {
+            'case_id': summary['case_id'],
+            'key': s3_key,
+            'etag': response.get('ETag', '').strip('"'),
+            'resolved_at': summary.get('resolved_at', ''),
+            'category': category,
+            'service': service
+        })
     
     return s3_key
 
 
-def trigger_kb_sync() -> None:
+def read_case_object(s3_key: str) -> Dict[str, Any]:
     """
-    Bedrock Knowledge Base 인덱싱 작업 트리거
+    save_to_s3로 저장한 케이스 객체 읽기 (gzip 여부 자동 처리)
+    
+    Args:
+        s3_key: 케이스 객체 키
+    
+    Returns:
+        요약된 케이스 정보
     """
-    try:
-        response = bedrock_agent.start_ingestion_job(
-            knowledgeBaseId=KB_ID,
-            dataSourceId=DS_ID
+    response = get_client('s3').get_object(Bucket=BUCKET_NAME, Key=s3_key)
+    body = response['Body'].read()
+    
+    if response.get('ContentEncoding') == 'gzip' or body[:2] == b'\x1f\x8b':
+        body = gzip.decompress(body)
+    
+    return json.loads(body)
+
+
+class PackedShardWriter:
+    """
+    마이그레이션용 묶음 저장: 요약을 {category}/{service}/{YYYY-MM} prefix별 NDJSON 샤드로 모아 저장
+    
+    케이스마다 작은 PUT을 하는 대신 샤드가 SHARD_MAX_BYTES에 도달하거나 close()할 때
+    한 번에 저장합니다. 샤드마다 display_id → (byte offset, length) 인덱스를
+    META_BUCKET의 {META_PREFIX}shard-index/ 아래에 함께 저장하므로 read_packed_case로
+    케이스 하나를 Range GET으로 읽을 수 있습니다. gzip 샤드는 레코드마다 독립된 gzip
+    멤버로 압축하므로(연결된 멤버도 유효한 gzip 파일) Range로 읽은 부분도 바로 풀 수 있습니다.
+    샤드는 KB 데이터 소스 버킷(BUCKET_NAME)에 저장되고 KB는 gzip 샤드를 읽지 못하므로,
+    compress=True(STORAGE_GZIP)로는 만들 수 없습니다 (읽기는 계속 지원).
+    """
+    
+    def __init__(self, max_bytes: int = SHARD_MAX_BYTES, compress: bool = STORAGE_GZIP, run_id: str = None):
+        if not MOCK_MODE and not meta_bucket_enabled():
+            raise ValueError("묶음 저장에는 샤드 인덱스를 저장할 META_BUCKET(BUCKET_NAME과 다른 버킷)이 필요합니다")
+        if compress:
+            raise ValueError(f"gzip 샤드는 KB 데이터 소스 버킷({BUCKET_NAME})에서 인덱싱되지 않으므로 "
+                             f"STORAGE_GZIP=true로는 묶음 저장할 수 없습니다")
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d%H%M%S')
+        self.buffers = {}
+        self.sequence = {}
+        self.lock = threading.Lock()
+    
+    def add(self, summary: Dict[str, Any], display_id: str) -> str:
+        """
+        샤드 버퍼에 요약 추가 (가득 차면 저장)
+        
+        Args:
+            summary: 요약된 케이스 정보
+            display_id: 케이스 표시 번호
+        
+        Returns:
+            케이스가 들어갈 샤드 prefix
+        """
+        resolved_month = str(summary.get('resolved_at', ''))[:7] or None
+        prefix = build_case_prefix(summary, resolved_month)
+        
+        record = json.dumps(summary, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        if self.compress:
+            record = gzip.compress(record)
+        
+        with self.lock:
+            buffer = self.buffers.setdefault(prefix, {'records': [], 'index': {}, 'meta': {}, 'size': 0})
+            buffer['index'][display_id] = [buffer['size'], len(record)]
+            buffer['meta'][display_id] = {
+                'case_id': summary.get('case_id', ''),
+                'resolved_at': summary.get('resolved_at', '')
+            }
+            buffer['records'].append(record)
+            buffer['size'] += len(record)
+            
+            full = buffer['size'] >= self.max_bytes
+            if full:
+                del self.buffers[prefix]
+        
+        if full:
+            self._write_shard(prefix, buffer)
+        
+        return prefix
+    
+    def close(self) -> List[str]:
+        """
+        남은 버퍼를 모두 저장
+        
+        Returns:
+            저장한 샤드 키 목록
+        """
+        with self.lock:
+            buffers, self.buffers = self.buffers, {}
+        
+        return [self._write_shard(prefix, buffer) for prefix, buffer in buffers.items()]
+    
+    def _write_shard(self, prefix: str, buffer: Dict[str, Any]) -> str:
+        with self.lock:
+            seq = self.sequence.get(prefix, 0) + 1
+            self.sequence[prefix] = seq
+        
+        extension = 'ndjson.gz' if self.compress else 'ndjson'
+        shard_key = f"{prefix}/part-{self.run_id}-{seq:04d}.{extension}"
+        body = b''.join(buffer['records'])
+        index = {
+            'shard_key': shard_key,
+            'compression': 'gzip' if self.compress else None,
+            'records': buffer['index']
+        }
+        
+        if MOCK_MODE:
+            print(f"   [MOCK] 샤드 저장 시뮬레이션: s3://{BUCKET_NAME}/{shard_key} "
+                  f"({len(buffer['index'])}개, {len(body)} bytes)")
+            return shard_key
+        
+        response = get_client('s3').put_object(
+            Bucket=BUCKET_NAME,
+            Key=shard_key,
+            Body=body,
+            ContentType='application/x-ndjson',
+            Metadata={'record-count': str(len(buffer['index']))}
+        )
+        get_client('s3').put_object(
+            Bucket=META_BUCKET,
+            Key=f"{META_PREFIX}shard-index/{shard_key}",
+            Body=json.dumps(index, ensure_ascii=False),
+            ContentType='application/json'
+        )
+        
+        etag = response.get('ETag', '').strip('"')
+        superseded = {}
+        for display_id, byte_range in buffer['index'].items():
+            previous = lookup_case(display_id)
+            write_manifest_entry(display_id, {
+                'case_id': buffer['meta'][display_id]['case_id'],
+                'key': shard_key,
+                'etag': etag,
+                'range': byte_range,
+                'compression': index['compression'],
+                'resolved_at': buffer['meta'][display_id]['resolved_at']
+            })
+            if previous and previous['key'] != shard_key:
+                superseded.setdefault(previous['key'], []).append((display_id, previous))
+        
+        print(f"   ✅ 샤드 저장 완료: s3://{BUCKET_NAME}/{shard_key} ({len(buffer['index'])}개)")
+        
+        # 다시 저장된 케이스의 이전 사본 제거 (KB에 같은 케이스가 두 번 인덱싱되지 않도록)
+        for old_key, entries in superseded.items():
+            if entries[0][1].get('range'):
+                remove_shard_records(old_key, [display_id for display_id, _ in entries])
+            else:
+                get_client('s3').delete_object(Bucket=BUCKET_NAME, Key=old_key)
+                print(f"   🧹 이전 케이스 객체 삭제: s3://{BUCKET_NAME}/{old_key}")
+        
+        return shard_key
+
+
+def remove_shard_records(shard_key: str, display_ids: List[str]) -> None:
+    """
+    샤드에서 레코드 제거 (다른 샤드로 다시 저장된 케이스)
+    
+    남은 레코드로 샤드를 다시 써서 인덱스와 매니페스트의 byte range를 갱신하고,
+    남은 레코드가 없으면 샤드와 인덱스를 삭제합니다. 샤드는 IfMatch(ETag)로 다시 써서
+    다른 프로세스가 같은 샤드를 동시에 고치면 다시 읽은 뒤 재시도합니다.
+    
+    Args:
+        shard_key: 이전 샤드 키
+        display_ids: 제거할 케이스 표시 번호 목록
+    """
+    s3 = get_client('s3')
+    index_key = f"{META_PREFIX}shard-index/{shard_key}"
+    
+    for _ in range(SHARD_REWRITE_RETRIES):
+        try:
+            index = json.loads(s3.get_object(Bucket=META_BUCKET, Key=index_key)['Body'].read())
+            response = s3.get_object(Bucket=BUCKET_NAME, Key=shard_key)
+        except s3.exceptions.NoSuchKey:
+            return  # 이미 삭제된 샤드
+        body = response['Body'].read()
+        
+        kept = sorted(
+            ((display_id, byte_range) for display_id, byte_range in index['records'].items()
+             if display_id not in display_ids),
+            key=lambda item: item[1][0]
         )
+        removed = len(index['records']) - len(kept)
+        if not removed:
+            return
         
-        ingestion_job_id = response['ingestionJob']['ingestionJobId']
-        print(f"   ✅ KB 동기화 시작: {ingestion_job_id}")
+        if not kept:
+            s3.delete_object(Bucket=BUCKET_NAME, Key=shard_key)
+            s3.delete_object(Bucket=META_BUCKET, Key=index_key)
+            print(f"   🧹 빈 샤드 삭제: s3://{BUCKET_NAME}/{shard_key}")
+            return
+        
+        records = []
+        ranges = {}
+        offset = 0
+        for display_id, (start, length) in kept:
+            records.append(body[start:start + length])
+            ranges[display_id] = [offset, length]
+            offset += length
+        
+        try:
+            put = s3.put_object(
+                Bucket=BUCKET_NAME,
+                Key=shard_key,
+                Body=b''.join(records),
+                ContentType='application/x-ndjson',
+                Metadata={'record-count': str(len(ranges))},
+                IfMatch=response['ETag']
+            )
+        except Exception as e:
+            if get_error_code(e) in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                continue
+            raise
+        
+        index['records'] = ranges
+        s3.put_object(
+            Bucket=META_BUCKET,
+            Key=index_key,
+            Body=json.dumps(index, ensure_ascii=False),
+            ContentType='application/json'
+        )
+        
+        # 이 샤드를 가리키는 매니페스트 항목만 새 위치로 갱신
+        etag = put.get('ETag', '').strip('"')
+        for display_id, byte_range in ranges.items():
+            entry = lookup_case(display_id)
+            if entry and entry['key'] == shard_key:
+                write_manifest_entry(display_id, dict(entry, etag=etag, range=byte_range))
+        
+        print(f"   🧹 이전 샤드에서 {removed}개 레코드 제거: s3://{BUCKET_NAME}/{shard_key}")
+        return
+    
+    print(f"   ⚠️  이전 샤드 정리 실패 (경합 지속): s3://{BUCKET_NAME}/{shard_key}")
+
+
+def read_packed_case(display_id: str) -> Dict[str, Any]:
+    """
+    PackedShardWriter로 저장한 샤드에서 케이스 하나 읽기
+    
+    매니페스트에서 위치를 찾고, 매니페스트가 없으면(매니페스트 도입 전에 저장된 샤드)
+    샤드 인덱스에서 display_id를 찾은 뒤 해당 레코드만 Range GET으로 읽습니다.
+    
+    Args:
+        display_id: 케이스 표시 번호
+    
+    Returns:
+        요약된 케이스 정보 (없으면 None)
+    """
+    entry = lookup_case(display_id)
+    if entry and entry.get('range'):
+        return read_manifest_target(entry)
+    if not meta_bucket_enabled():
+        return None
+    
+    paginator = get_client('s3').get_paginator('list_objects_v2')
+    
+    for page in paginator.paginate(Bucket=META_BUCKET, Prefix=f"{META_PREFIX}shard-index/"):
+        for obj in page.get('Contents', []):
+            index = json.loads(get_client('s3').get_object(Bucket=META_BUCKET, Key=obj['Key'])['Body'].read())
+            if display_id not in index['records']:
+                continue
+            
+            offset, length = index['records'][display_id]
+            response = get_client('s3').get_object(
+                Bucket=BUCKET_NAME,
+                Key=index['shard_key'],
+                Range=f"bytes={offset}-{offset + length - 1}"
+            )
+            record = response['Body'].read()
+            if index.get('compression') == 'gzip':
+                record = gzip.decompress(record)
+            
+            return json.loads(record)
+    
+    return None
+
+
+def manifest_key(display_id: str) -> str:
+    """display_id의 매니페스트 항목 키"""
+    return f"{META_PREFIX}manifest/{display_id}"
+
+
+def write_manifest_entry(display_id: str, entry: Dict[str, Any]) -> None:
+    """
+    매니페스트 항목 저장 (display_id → 저장 위치)
+    
+    케이스마다 작은 객체 하나를 덮어쓰므로 갱신 비용이 케이스 수와 무관하고,
+    동시에 저장되는 다른 케이스와 충돌하지 않습니다. 실패해도 케이스 저장은 유지합니다.
+    
+    Args:
+        display_id: 케이스 표시 번호
+        entry: 저장 위치 정보 (key, etag, resolved_at, 샤드면 range/compression)
+    """
+    if MOCK_MODE or not meta_bucket_enabled():
+        return
+    
+    entry = dict(entry, display_id=display_id, updated_at=datetime.now().isoformat())
+    try:
+        get_client('s3').put_object(
+            Bucket=META_BUCKET,
+            Key=manifest_key(display_id),
+            Body=json.dumps(entry, ensure_ascii=False),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        print(f"   ⚠️  매니페스트 갱신 실패: {str(e)}")
+
+
+# 매니페스트 조회에서 "항목 없음"으로 보는 에러 코드
+# (s3:ListBucket 권한이 없으면 없는 객체도 NoSuchKey 대신 AccessDenied/403으로 응답)
+MANIFEST_MISS_ERROR_CODES = {'NoSuchKey', 'AccessDenied', '403', '404'}
+_manifest_access_warning_printed = False
+
+
+def lookup_case(display_id: str) -> Dict[str, Any]:
+    """
+    매니페스트에서 케이스 저장 위치 조회 (버킷 목록 조회 없이 GET 1회)
+    
+    Args:
+        display_id: 케이스 표시 번호
+    
+    Returns:
+        매니페스트 항목 (key, etag, resolved_at 등, 없으면 None)
+    """
+    if not meta_bucket_enabled():
+        return None
+    
+    global _manifest_access_warning_printed
+    
+    try:
+        response = get_client('s3').get_object(Bucket=META_BUCKET, Key=manifest_key(display_id))
+    except Exception as e:
+        error_code = get_error_code(e)
+        if error_code not in MANIFEST_MISS_ERROR_CODES:
+            raise
+        if error_code != 'NoSuchKey' and not _manifest_access_warning_printed:
+            _manifest_access_warning_printed = True
+            print(f"⚠️  매니페스트 조회 거부({error_code}) - 없는 것으로 처리합니다 "
+                  f"(META_BUCKET에 s3:ListBucket 권한이 없으면 없는 객체도 403으로 응답)")
+        return None
+    
+    return json.loads(response['Body'].read())
+
+
+def case_exists(display_id: str) -> bool:
+    """매니페스트 기준 케이스 저장 여부 (중복 확인용)"""
+    return lookup_case(display_id) is not None
+
+
+def read_manifest_target(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """매니페스트 항목이 가리키는 케이스 요약 읽기 (케이스별 객체 또는 샤드 레코드)"""
+    if not entry.get('range'):
+        return read_case_object(entry['key'])
+    
+    offset, length = entry['range']
+    response = get_client('s3').get_object(
+        Bucket=BUCKET_NAME,
+        Key=entry['key'],
+        Range=f"bytes={offset}-{offset + length - 1}"
+    )
+    record = response['Body'].read()
+    if entry.get('compression') == 'gzip':
+        record = gzip.decompress(record)
+    
+    return json.loads(record)
+
+
+def get_case_by_display_id(display_id: str) -> Dict[str, Any]:
+    """
+    display_id로 저장된 케이스 요약 조회 (매니페스트 GET + 본문 GET)
+    
+    Args:
+        display_id: 케이스 표시 번호
+    
+    Returns:
+        요약된 케이스 정보 (없으면 None)
+    """
+    entry = lookup_case(display_id)
+    return read_manifest_target(entry) if entry else None
+
+
+# KB 동기화 병합 (케이스가 몰려도 인덱싱 작업은 윈도우당 최대 1회, sync_kb_on_s3_upload.py와 같은 상태 객체 사용)
+# (META_BUCKET이 없으면 상태 객체 없이 바로 작업 시작)
+kb_sync_coalescer = KBSyncCoalescer(KB_ID, DS_ID, META_BUCKET if META_ENABLED else '', META_PREFIX, get_client)
+
+
+def trigger_kb_sync() -> None:
+    """
+    Bedrock Knowledge Base 인덱싱 작업 트리거 (kb_sync_coalescer로 병합)
+    """
+    try:
+        kb_sync_coalescer.request()
         
     except Exception as e:
         print(f"   ⚠️  KB 동기화 실패: {str(e)}")
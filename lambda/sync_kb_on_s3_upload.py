@@ -4,19 +4,216 @@
 S3 업로드 시 Bedrock Knowledge Base 자동 동기화
 
 S3에 새 파일이 업로드되면 자동으로 KB 인덱싱을 트리거합니다.
+인덱싱 요청은 process_resolved_case.py와 같은 상태 객체로 병합되므로
+업로드가 몰려도 윈도우당 인덱싱 작업은 최대 한 번만 시작됩니다.
+EventBridge 스케줄 이벤트로 호출되면 예약된 후속 작업만 처리합니다.
+
+SYNC_MODE=document면 데이터 소스 전체를 다시 크롤링하지 않고 업로드된 문서만
+문서 단위 수집 API(IngestKnowledgeBaseDocuments)로 인덱싱하며,
+전체 크롤링은 스케줄 호출에서 FULL_CRAWL_INTERVAL_SECONDS마다 한 번씩 누락 보정용으로만 실행합니다.
 """
 
 import os
 import boto3
+import hashlib
 import json
-from typing import Dict, Any
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+from urllib.parse import unquote_plus
+
+from kb_sync import KBSyncCoalescer
 
 # 환경 변수
 KB_ID = os.environ.get('KB_ID')
 DS_ID = os.environ.get('DS_ID')
 
+# KB 동기화 상태 저장 위치 (process_resolved_case.py와 같은 값 사용)
+# 없으면 동기화 요청을 병합하지 않고 매번 바로 시작하며, document 모드의 주기적 전체 크롤링도 하지 않음
+META_BUCKET = os.environ.get('META_BUCKET', '')
+META_PREFIX = os.environ.get('META_PREFIX', '_meta/')
+if not META_BUCKET:
+    print("⚠️  META_BUCKET 미설정 - KB 동기화 병합과 주기적 전체 크롤링을 사용하지 않습니다")
+
+# 동기화 방식: crawl (데이터 소스 전체 크롤링) 또는 document (업로드된 문서만 수집)
+SYNC_MODE = os.environ.get('SYNC_MODE', 'crawl')
+FULL_CRAWL_INTERVAL_SECONDS = int(os.environ.get('FULL_CRAWL_INTERVAL_SECONDS', str(24 * 3600)))  # document 모드의 전체 크롤링 주기
+DOCUMENT_BATCH_SIZE = 10  # IngestKnowledgeBaseDocuments 한 번에 보낼 수 있는 최대 문서 수
+FAILED_DOCUMENT_STATUSES = {'FAILED', 'NOT_FOUND', 'METADATA_UPDATE_FAILED'}
+INDEXED_DOCUMENT_STATUSES = {'INDEXED', 'PARTIALLY_INDEXED', 'METADATA_PARTIALLY_INDEXED', 'IGNORED'}
+# 수집 요청 직후 documentDetails는 대부분 STARTING/IN_PROGRESS이므로 이 시간 동안 상태를 다시 조회
+# (그 뒤에 실패하는 문서는 FULL_CRAWL_INTERVAL_SECONDS마다 실행되는 전체 크롤링이 보정)
+DOCUMENT_STATUS_WAIT_SECONDS = int(os.environ.get('DOCUMENT_STATUS_WAIT_SECONDS', '20'))
+DOCUMENT_STATUS_POLL_INTERVAL = 2  # 문서 상태 조회 주기 (초)
+
 # AWS 클라이언트 (리전은 Lambda 실행 환경의 AWS_REGION 자동 사용)
 bedrock_agent = boto3.client('bedrock-agent', region_name='ap-northeast-2')
+s3_client = boto3.client('s3', region_name='ap-northeast-2')
+
+# KB 동기화 병합 (업로드가 몰려도 인덱싱 작업은 윈도우당 최대 1회, process_resolved_case.py와 같은 상태 객체 사용)
+CLIENTS = {'s3': s3_client, 'bedrock-agent': bedrock_agent}
+kb_sync_coalescer = KBSyncCoalescer(KB_ID, DS_ID, META_BUCKET, META_PREFIX, lambda service_name: CLIENTS[service_name])
+
+
+def is_full_crawl_due() -> bool:
+    """마지막 전체 크롤링 후 FULL_CRAWL_INTERVAL_SECONDS가 지났는지 (상태 객체가 없으면 알 수 없으므로 False)"""
+    if not META_BUCKET:
+        return False
+    
+    state, _ = kb_sync_coalescer.load_state()
+    now = datetime.now(timezone.utc).timestamp()
+    return now - state.get('last_started_at', 0) >= FULL_CRAWL_INTERVAL_SECONDS
+
+
+def document_uri(detail: Dict[str, Any]) -> str:
+    """documentDetails 항목의 S3 URI (identifier는 {'dataSourceType': 'S3', 's3': {'uri': ...}} 형식)"""
+    return detail.get('identifier', {}).get('s3', {}).get('uri', '')
+
+
+def wait_for_documents(uris: List[str], wait_seconds: float) -> Dict[str, str]:
+    """
+    수집 요청한 문서의 상태를 wait_seconds 동안 다시 조회 (GetKnowledgeBaseDocuments, DOCUMENT_BATCH_SIZE개씩)
+    
+    Args:
+        uris: 수집 요청한 문서 S3 URI 목록
+        wait_seconds: 최대 대기 시간 (초)
+    
+    Returns:
+        {URI: 마지막으로 확인한 상태} - 시간 안에 끝나지 않은 문서는 진행 중 상태 그대로
+    """
+    statuses = {uri: 'STARTING' for uri in uris}
+    deadline = time.monotonic() + wait_seconds
+    
+    while True:
+        pending = [uri for uri, status in statuses.items()
+                   if status not in FAILED_DOCUMENT_STATUSES | INDEXED_DOCUMENT_STATUSES]
+        if not pending or time.monotonic() + DOCUMENT_STATUS_POLL_INTERVAL > deadline:
+            return statuses
+        
+        time.sleep(DOCUMENT_STATUS_POLL_INTERVAL)
+        for start in range(0, len(pending), DOCUMENT_BATCH_SIZE):
+            response = bedrock_agent.get_knowledge_base_documents(
+                knowledgeBaseId=KB_ID,
+                dataSourceId=DS_ID,
+                documentIdentifiers=[
+                    {'dataSourceType': 'S3', 's3': {'uri': uri}}
+                    for uri in pending[start:start + DOCUMENT_BATCH_SIZE]
+                ]
+            )
+            for detail in response.get('documentDetails', []):
+                statuses[document_uri(detail)] = detail.get('status', '')
+
+
+def ingest_documents(documents: List[Dict[str, str]], wait_seconds: float = DOCUMENT_STATUS_WAIT_SECONDS) -> Dict[str, Any]:
+    """
+    업로드된 문서만 KB에 수집 (문서 단위 수집 API, DOCUMENT_BATCH_SIZE개씩)
+    
+    비용이 전체 문서 수가 아니라 바뀐 문서 수에 비례합니다. 수집 요청 후 wait_seconds 동안
+    문서 상태를 다시 조회하고, 수집 요청이 실패하거나 실패 상태인 문서가 있으면
+    kb_sync_coalescer.request()로 전체 크롤링을 예약해 누락을 보정합니다.
+    대기 시간 안에 끝나지 않은 문서는 'pending'으로 남기며, 그 뒤의 실패는 주기적인 전체 크롤링이 보정합니다.
+    
+    Args:
+        documents: [{'uri': 's3://버킷/키', 'etag': ETag}] 목록
+        wait_seconds: 문서 상태 확인 최대 대기 시간 (초, 0이면 요청 응답의 상태만 확인)
+    
+    Returns:
+        {'submitted': 수집 요청한 문서 수, 'failed': 실패 문서 URI 목록,
+         'pending': 대기 시간 안에 끝나지 않은 문서 URI 목록, 'fallback': 전체 크롤링 요청 결과}
+    """
+    result = {'submitted': 0, 'failed': [], 'pending': [], 'fallback': None}
+    statuses = {}
+    
+    for start in range(0, len(documents), DOCUMENT_BATCH_SIZE):
+        batch = documents[start:start + DOCUMENT_BATCH_SIZE]
+        # S3 이벤트 재전송 시 같은 토큰이 되어 중복 수집되지 않음
+        client_token = hashlib.sha256(
+            '\n'.join(f"{doc['uri']}@{doc['etag']}" for doc in batch).encode()
+        ).hexdigest()
+        
+        try:
+            response = bedrock_agent.ingest_knowledge_base_documents(
+                knowledgeBaseId=KB_ID,
+                dataSourceId=DS_ID,
+                clientToken=client_token,
+                documents=[
+                    {'content': {'dataSourceType': 'S3', 's3': {'s3Location': {'uri': doc['uri']}}}}
+                    for doc in batch
+                ]
+            )
+        except Exception as e:
+            print(f"   ⚠️  문서 수집 요청 실패: {str(e)}")
+            result['failed'].extend(doc['uri'] for doc in batch)
+            continue
+        
+        result['submitted'] += len(batch)
+        for detail in response.get('documentDetails', []):
+            statuses[document_uri(detail)] = detail.get('status', '')
+    
+    if statuses and wait_seconds > 0:
+        statuses.update(wait_for_documents(list(statuses), wait_seconds))
+    
+    for uri, status in statuses.items():
+        if status in FAILED_DOCUMENT_STATUSES:
+            print(f"   ⚠️  문서 수집 실패: {uri} ({status})")
+            result['failed'].append(uri)
+        elif status not in INDEXED_DOCUMENT_STATUSES:
+            result['pending'].append(uri)
+    
+    print(f"   ✅ 문서 수집 요청: {result['submitted']}개, 실패 {len(result['failed'])}개, "
+          f"진행 중 {len(result['pending'])}개")
+    
+    if result['failed']:
+        result['fallback'] = kb_sync_coalescer.request()
+    
+    return result
+
+
+def collect_documents(records: List[Dict[str, Any]]) -> tuple:
+    """
+    S3 이벤트 레코드 전체에서 동기화 대상 문서 수집
+    
+    ObjectCreated 이벤트의 .json 키만 대상으로 하고, 내부 관리용 객체(META_PREFIX)와
+    같은 호출 안의 중복 키는 제외합니다.
+    
+    Args:
+        records: S3 이벤트 레코드 목록
+    
+    Returns:
+        (동기화 대상 문서 목록 [{'uri', 'etag'}], 레코드별 결과 목록)
+    """
+    documents = []
+    results = []
+    seen = set()
+    
+    for record in records:
+        bucket = record['s3']['bucket']['name']
+        key = unquote_plus(record['s3']['object']['key'])
+        event_name = record['eventName']
+        uri = f"s3://{bucket}/{key}"
+        
+        if 'ObjectCreated' not in event_name:
+            reason = 'not ObjectCreated'
+        elif not key.endswith('.json'):
+            reason = 'not .json'
+        elif key.startswith(META_PREFIX):
+            reason = 'internal object'
+        elif uri in seen:
+            reason = 'duplicate'
+        else:
+            reason = None
+        
+        if reason:
+            print(f"⏭️  스킵 ({reason}): {event_name} {uri}")
+            results.append({'uri': uri, 'event': event_name, 'status': 'skipped', 'reason': reason})
+            continue
+        
+        print(f"📁 S3 이벤트: {event_name} {uri}")
+        seen.add(uri)
+        documents.append({'uri': uri, 'etag': record['s3']['object'].get('eTag', '')})
+        results.append({'uri': uri, 'event': event_name, 'status': 'accepted'})
+    
+    return documents, results
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -31,53 +228,66 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         처리 결과
     """
     try:
-        # S3 이벤트 파싱
-        for record in event.get('Records', []):
-            # S3 정보 추출
-            bucket = record['s3']['bucket']['name']
-            key = record['s3']['object']['key']
-            event_name = record['eventName']
-            
-            print(f"📁 S3 이벤트: {event_name}")
-            print(f"   버킷: {bucket}")
-            print(f"   파일: {key}")
-            
-            # PUT 이벤트만 처리 (새 파일 업로드)
-            if 'ObjectCreated' in event_name:
-                print(f"🔄 Bedrock KB 동기화 시작...")
-                
-                # KB 동기화 트리거
-                response = bedrock_agent.start_ingestion_job(
-                    knowledgeBaseId=KB_ID,
-                    dataSourceId=DS_ID
-                )
-                
-                ingestion_job_id = response['ingestionJob']['ingestionJobId']
-                status = response['ingestionJob']['status']
-                
-                print(f"✅ 동기화 작업 시작됨")
-                print(f"   Job ID: {ingestion_job_id}")
-                print(f"   상태: {status}")
-                
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps({
-                        'message': 'KB sync triggered successfully',
-                        'ingestion_job_id': ingestion_job_id,
-                        'status': status,
-                        'file': key
-                    })
-                }
+        # 스케줄 호출: 예약된 후속 동기화 처리
+        if event.get('source') == 'aws.events':
+            if SYNC_MODE == 'document' and is_full_crawl_due():
+                # document 모드: 주기적인 전체 크롤링으로 누락 보정
+                action = kb_sync_coalescer.request()
             else:
-                print(f"⏭️  ObjectCreated 이벤트가 아님, 스킵")
-                return {
-                    'statusCode': 200,
-                    'body': json.dumps({'message': 'Event skipped'})
-                }
+                action = kb_sync_coalescer.request(flush=True)
+            print(f"⏰ 예약된 KB 동기화 처리: {action}")
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'message': 'KB sync flushed', 'action': action})
+            }
+        
+        # 레코드 전체를 모아 중복/대상 외 파일 제외
+        documents, results = collect_documents(event.get('Records', []))
+        if not documents:
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'message': 'No records to process', 'records': results}, ensure_ascii=False)
+            }
+        
+        # 레코드가 몇 개든 동기화 결정은 한 번만
+        if SYNC_MODE == 'document':
+            # document 모드: 이번 호출에 들어온 업로드 문서만 한꺼번에 수집
+            print(f"📄 문서 단위 KB 수집: {len(documents)}개")
+            wait_seconds = DOCUMENT_STATUS_WAIT_SECONDS
+            if context is not None:
+                # 함수 제한 시간 안에서만 대기 (응답 정리 여유 10초)
+                wait_seconds = min(wait_seconds, context.get_remaining_time_in_millis() / 1000 - 10)
+            outcome = ingest_documents(documents, wait_seconds)
+            failed = set(outcome['failed'])
+            pending = set(outcome['pending'])
+            for result in results:
+                if result['status'] == 'accepted':
+                    if result['uri'] in failed:
+                        result['status'] = 'failed'
+                    else:
+                        result['status'] = 'pending' if result['uri'] in pending else 'ingested'
+        else:
+            # KB 동기화 요청 (윈도우 안이거나 작업 진행 중이면 후속 작업으로 병합)
+            print(f"🔄 Bedrock KB 동기화 요청 ({len(documents)}개 파일)...")
+            outcome = {'action': kb_sync_coalescer.request()}
+            for result in results:
+                if result['status'] == 'accepted':
+                    result['status'] = outcome['action']
+        
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        print(f"✅ 레코드 {len(results)}개 처리: {counts}")
         
         return {
             'statusCode': 200,
-            'body': json.dumps({'message': 'No records to process'})
+            'body': json.dumps({
+                'message': 'KB sync requested',
+                'mode': SYNC_MODE,
+                **outcome,
+                'counts': counts,
+                'records': results
+            }, ensure_ascii=False)
         }
         
     except Exception as e:
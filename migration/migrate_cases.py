@@ -5,19 +5,51 @@ AWS Support 케이스 마이그레이션 스크립트
 과거 해결된 케이스를 일괄적으로 Knowledge Base에 추가합니다.
 """
 
+import argparse
 import boto3
 import json
+import multiprocessing
+import os
+import queue
 import time
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
 
 # Lambda 함수 코드 재사용을 위한 import
 sys.path.append('../lambda')
 from process_resolved_case import (
+    MODEL_ID,
+    get_client,
+    bedrock_concurrency,
+    support_concurrency,
+    get_bedrock_stream_metrics,
+    get_json_repair_count,
     get_case_details,
-    summarize_with_bedrock,
+    summarize_with_cache,
+    compute_content_hash,
+    get_cached_summary,
+    put_cached_summary,
+    estimate_tokens,
+    build_summary_prompt,
+    build_chunk_prompts,
+    build_reduce_prompt,
+    SUMMARY_TOKEN_BUDGET,
+    CHUNK_MAX_TOKENS,
+    CHUNK_DEFAULTS,
+    CHUNK_JSON_FORMAT,
+    build_model_body,
+    parse_model_output,
+    attach_case_metadata,
     save_to_s3,
+    case_exists,
+    write_manifest_entry,
+    PackedShardWriter,
+    META_BUCKET,
+    META_PREFIX,
+    meta_bucket_enabled,
     trigger_kb_sync
 )
 
@@ -27,7 +59,22 @@ KB_ID = ''  # Bedrock KB ID (있으면 입력)
 DS_ID = ''  # Data Source ID (있으면 입력)
 START_DATE = '2023-01-01T00:00:00Z'  # 마이그레이션 시작 날짜
 END_DATE = '2025-12-31T23:59:59Z'    # 마이그레이션 종료 날짜
-RATE_LIMIT_DELAY = 1  # 각 케이스 처리 후 대기 시간 (초)
+S3_INDEX_FILE = 's3_case_index.json'  # --scan-index 사용 시 버킷 목록 인덱스 로컬 캐시 ('' 이면 저장 안 함)
+RATE_LIMIT_DELAY = 1  # 케이스 사이 대기 시간 (초, Rate Limiter를 연결하지 않은 순차 모드에서만 사용)
+
+# 동시 처리 설정 (MAX_WORKERS > 1 이면 워커 풀 + 토큰 버킷 Rate Limiter 사용)
+MAX_WORKERS = 1           # 동시에 처리할 케이스 수
+SUPPORT_API_RPS = 2.0     # Support API 초당 요청 수 한도
+BEDROCK_RPS = 1.0         # Bedrock InvokeModel 초당 요청 수 한도
+CASE_QUEUE_SIZE = 200     # 목록 조회와 처리 사이의 대기열 크기 (조회가 처리보다 앞서 나갈 수 있는 케이스 수)
+
+# Bedrock 배치 추론 설정 (--batch 모드)
+BATCH_S3_URI = ''         # 배치 입출력 S3 경로 (예: 's3://my-batch-bucket/support-migration/', KB 버킷과 분리 권장)
+BATCH_ROLE_ARN = ''       # Bedrock이 BATCH_S3_URI에 접근할 때 사용할 서비스 역할 ARN
+BATCH_MIN_RECORDS = 100   # Bedrock 배치 작업 최소 레코드 수 (미만이면 레코드별 동기 호출로 처리)
+BATCH_POLL_INTERVAL = 60  # 배치 작업 상태 확인 주기 (초)
+BATCH_WORK_DIR = 'batch'  # 배치 입출력 JSONL 로컬 저장 디렉토리
+BATCH_CHUNK_SEP = '#chunk-'  # 긴 케이스 구간 요약 레코드 ID 구분자 ({caseId}#chunk-{n})
 
 # AWS 클라이언트
 support_client = boto3.client('support', region_name='us-east-1')
@@ -39,25 +86,250 @@ stats = {
     'success': 0,
     'skipped': 0,
     'failed': 0,
+    'cache_hits': 0,
     'errors': []
 }
+stats_lock = threading.Lock()
+
+
+class TokenBucketRateLimiter:
+    """
+    스레드 안전한 토큰 버킷 Rate Limiter
+
+    초당 rate개의 토큰이 채워지며, 최대 burst개까지 쌓입니다.
+    acquire()는 토큰이 확보될 때까지 호출한 스레드를 대기시킵니다.
+    shared=True로 만들면 버킷 상태를 공유 메모리에 두므로, 샤드 프로세스에 넘겨
+    여러 프로세스가 하나의 초당 요청 수 한도를 나눠 쓸 수 있습니다.
+    """
+
+    def __init__(self, rate: float, burst: float = None, shared: bool = False):
+        if rate <= 0:
+            raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+
+        # state = [남은 토큰 수, 마지막 갱신 시각(time.monotonic)]
+        if shared:
+            ctx = multiprocessing.get_context('spawn')
+            self.state = ctx.Array('d', [self.capacity, time.monotonic()], lock=False)
+            self.lock = ctx.Lock()
+        else:
+            self.state = [self.capacity, time.monotonic()]
+            self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        토큰 확보 (부족하면 채워질 때까지 대기)
+
+        Args:
+            tokens: 필요한 토큰 수 (API 호출 횟수)
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                available = min(self.capacity, self.state[0] + (now - self.state[1]) * self.rate)
+                self.state[1] = now
+
+                if available >= tokens:
+                    self.state[0] = available - tokens
+                    return
+
+                self.state[0] = available
+                wait_time = (tokens - available) / self.rate
+
+            time.sleep(wait_time)
+
+
+support_limiter = TokenBucketRateLimiter(SUPPORT_API_RPS)
+bedrock_limiter = TokenBucketRateLimiter(BEDROCK_RPS)
+
+
+def attach_rate_limiters() -> None:
+    """
+    Lambda 코드의 API 호출 지점에 Rate Limiter 연결
+
+    케이스 단위가 아니라 실제 호출마다(Bedrock 재시도, 긴 케이스의 구간/통합 요약,
+    describe_communications 페이지 조회 포함) 토큰을 하나씩 사용합니다.
+    """
+    support_concurrency.rate_limiter = support_limiter
+    bedrock_concurrency.rate_limiter = bedrock_limiter
+
+
+attach_rate_limiters()
+
+
+def rate_limiters_attached() -> bool:
+    """Lambda 코드의 API 호출 지점에 Rate Limiter가 연결되어 있는지"""
+    return support_concurrency.rate_limiter is not None or bedrock_concurrency.rate_limiter is not None
 
 
-def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[str, Any]]:
+def record_stat(key: str, error: Dict[str, Any] = None) -> None:
+    """통계 갱신 (워커 스레드에서 호출되므로 락으로 보호)"""
+    with stats_lock:
+        stats[key] += 1
+        if error:
+            stats['errors'].append(error)
+
+class S3CaseIndex:
+    """
+    S3에 저장된 케이스의 display_id 인덱스
+
+    실행 시작 시 list_objects_v2로 버킷을 한 번만 조회하여 display_id 집합을 만들고,
+    save_to_s3 후에는 add()로 갱신합니다. cache_file을 지정하면 로컬에 저장해두었다가
+    다음 실행에서 마지막 LastModified 이후의 월(YYYY-MM) prefix만 다시 조회합니다.
     """
-    해결된 케이스 목록 조회
+
+    def __init__(self, bucket: str, cache_file: str = ''):
+        self.bucket = bucket
+        self.cache_file = cache_file
+        self.display_ids = set()
+        self.last_modified = None
+        self.lock = threading.Lock()
+
+    def __contains__(self, display_id: str) -> bool:
+        with self.lock:
+            return display_id in self.display_ids
+
+    def __len__(self) -> int:
+        return len(self.display_ids)
+
+    def add(self, display_id: str) -> None:
+        """save_to_s3 성공 후 인덱스에 추가"""
+        with self.lock:
+            self.display_ids.add(display_id)
+
+    def load(self) -> bool:
+        """
+        로컬 캐시 파일에서 인덱스 로드
+
+        Returns:
+            로드 성공 여부
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  인덱스 캐시 로드 실패: {str(e)}")
+            return False
+
+        if data.get('bucket') != self.bucket:
+            return False
+
+        self.display_ids = set(data.get('display_ids', []))
+        last_modified = data.get('last_modified')
+        self.last_modified = datetime.fromisoformat(last_modified) if last_modified else None
+        return True
+
+    def save(self) -> None:
+        """인덱스를 로컬 캐시 파일에 저장"""
+        if not self.cache_file:
+            return
+
+        with self.lock:
+            data = {
+                'bucket': self.bucket,
+                'last_modified': self.last_modified.isoformat() if self.last_modified else None,
+                'display_ids': sorted(self.display_ids)
+            }
+
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def refresh(self) -> None:
+        """
+        S3 목록을 조회하여 인덱스 갱신
+
+        캐시가 없으면 버킷 전체를 한 번 조회하고, 캐시가 있으면
+        {category}/{service}/{YYYY-MM}/ 중 마지막 LastModified 이후 월의 prefix만 조회합니다.
+        """
+        since = self.last_modified
+        self._scan_packed(since)
+
+        if since is None:
+            self._scan('')
+            return
+
+        since_month = since.strftime('%Y-%m')
+        for category in self._list_prefixes(''):
+            for service in self._list_prefixes(category):
+                for month in self._list_prefixes(service):
+                    if month[len(service):].rstrip('/') >= since_month:
+                        self._scan(month)
+
+    def _list_prefixes(self, prefix: str) -> List[str]:
+        """prefix 바로 아래의 하위 prefix 목록"""
+        paginator = s3_client.get_paginator('list_objects_v2')
+        prefixes = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
+            prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+        return prefixes
+
+    def _scan(self, prefix: str) -> None:
+        """prefix 아래의 모든 객체를 인덱스에 추가"""
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if not key.endswith('.json'):
+                    continue
+
+                display_id = key.rsplit('/', 1)[-1][:-len('.json')]
+                with self.lock:
+                    self.display_ids.add(display_id)
+                    if self.last_modified is None or obj['LastModified'] > self.last_modified:
+                        self.last_modified = obj['LastModified']
+
+    def _scan_packed(self, since: datetime = None) -> None:
+        """--pack으로 저장한 NDJSON 샤드의 인덱스에서 display_id 추가 (since 이후 샤드만)"""
+        if not meta_bucket_enabled():
+            return
+
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=META_BUCKET, Prefix=f"{META_PREFIX}shard-index/"):
+            for obj in page.get('Contents', []):
+                if since is not None and obj['LastModified'] <= since:
+                    continue
+
+                index = json.loads(s3_client.get_object(Bucket=META_BUCKET, Key=obj['Key'])['Body'].read())
+                with self.lock:
+                    self.display_ids.update(index['records'])
+
+    def build(self) -> None:
+        """캐시 로드 후 S3와 동기화 (실행 시작 시 1회 호출)"""
+        cached = self.load()
+        if cached:
+            print(f"   로컬 인덱스 로드: {len(self)}개 (기준 시각 {self.last_modified})")
+
+        self.refresh()
+        self.save()
+        print(f"   ✅ S3 인덱스 준비 완료: {len(self)}개 케이스")
+
+
+s3_index = S3CaseIndex(BUCKET_NAME, S3_INDEX_FILE)
+
+
+def get_resolved_cases(after_time: str, before_time: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    해결된 케이스 목록 조회 (제너레이터)
+    
+    describe_cases를 페이지 단위로 조회하면서 해결된 케이스를 바로 yield하므로
+    전체 목록을 메모리에 올리지 않고 첫 페이지부터 처리를 시작할 수 있습니다.
     
     Args:
         after_time: 시작 날짜 (ISO 8601 형식)
         before_time: 종료 날짜 (ISO 8601 형식, 선택사항)
     
-    Returns:
-        케이스 목록
+    Yields:
+        해결된 케이스
     """
     print(f"\n📋 해결된 케이스 목록 조회 중...")
     print(f"   기간: {after_time} ~ {before_time or '현재'}")
     
-    cases = []
+    listed = 0
+    resolved = 0
     next_token = None
     
     while True:
@@ -75,14 +347,20 @@ def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[st
             if next_token:
                 params['nextToken'] = next_token
             
+            support_limiter.acquire()
             response = support_client.describe_cases(**params)
             
             batch_cases = response.get('cases', [])
-            cases.extend(batch_cases)
+            batch_resolved = [c for c in batch_cases if c.get('status') == 'resolved']
+            listed += len(batch_cases)
+            resolved += len(batch_resolved)
             
-            print(f"   조회됨: {len(batch_cases)}개 (총 {len(cases)}개)")
+            print(f"   조회됨: {len(batch_cases)}개 (총 {listed}개, 해결됨 {resolved}개)")
             
             next_token = response.get('nextToken')
+            
+            yield from batch_resolved
+            
             if not next_token:
                 break
                 
@@ -90,40 +368,135 @@ def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[st
             print(f"   ⚠️  케이스 목록 조회 실패: {str(e)}")
             break
     
-    # 해결된 케이스만 필터링
-    resolved_cases = [c for c in cases if c.get('status') == 'resolved']
-    print(f"\n✅ 총 {len(resolved_cases)}개의 해결된 케이스 발견")
+    print(f"\n✅ 목록 조회 완료: 총 {resolved}개의 해결된 케이스 발견")
+
+
+_END_OF_CASES = object()
+
+
+def start_case_producer(cases: Iterable[Dict[str, Any]], maxsize: int = CASE_QUEUE_SIZE) -> queue.Queue:
+    """
+    백그라운드 스레드에서 케이스 목록을 조회하여 크기 제한이 있는 대기열에 채움
+    
+    대기열이 가득 차면 조회 스레드가 멈추므로 메모리 사용량은 maxsize로 제한됩니다.
     
-    return resolved_cases
+    Args:
+        cases: 케이스 이터러블 (get_resolved_cases 제너레이터)
+        maxsize: 대기열 최대 크기
+    
+    Returns:
+        케이스가 채워지는 대기열 (조회가 끝나면 종료 표시가 들어감)
+    """
+    case_queue = queue.Queue(maxsize=maxsize)
+    
+    def produce():
+        try:
+            for case in cases:
+                case_queue.put(case)
+        finally:
+            case_queue.put(_END_OF_CASES)
+    
+    threading.Thread(target=produce, name='case-lister', daemon=True).start()
+    return case_queue
+
+
+def iter_case_queue(case_queue: queue.Queue) -> Iterator[Dict[str, Any]]:
+    """대기열에서 종료 표시가 나올 때까지 케이스를 꺼냄 (여러 워커가 동시에 사용 가능)"""
+    while True:
+        case = case_queue.get()
+        if case is _END_OF_CASES:
+            # 다른 워커도 종료할 수 있도록 종료 표시를 되돌려 놓음
+            case_queue.put(_END_OF_CASES)
+            return
+        
+        with stats_lock:
+            stats['total'] += 1
+        yield case
 
 
 def check_case_exists_in_s3(display_id: str) -> bool:
     """
     S3에 케이스가 이미 존재하는지 확인
     
+    이번 실행에서 저장한 케이스(--scan-index면 버킷 목록 인덱스 포함)는 s3_index에서 확인하고,
+    나머지는 매니페스트 GET 1회(case_exists)로 확인하므로 버킷 목록을 조회하지 않습니다.
+    
     Args:
         display_id: 케이스 표시 번호
     
     Returns:
         존재 여부
     """
-    try:
-        # S3에서 모든 경로 검색 (category/service를 모르므로)
-        response = s3_client.list_objects_v2(
-            Bucket=BUCKET_NAME,
-            Prefix='',
-            MaxKeys=1000
-        )
-        
-        for obj in response.get('Contents', []):
-            if f"/{display_id}.json" in obj['Key']:
-                return True
-        
-        return False
-        
-    except Exception as e:
-        print(f"      ⚠️  S3 확인 실패: {str(e)}")
+    return display_id in s3_index or case_exists(display_id)
+
+
+def backfill_manifest() -> int:
+    """
+    매니페스트 도입 전에 저장된 케이스별 객체의 매니페스트 항목 생성 (버킷 목록 1회 조회)
+    
+    이후 실행의 중복 확인은 매니페스트만으로 충분하므로 --scan-index가 필요 없습니다.
+    
+    Returns:
+        새로 만든 매니페스트 항목 수
+    """
+    created = 0
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=BUCKET_NAME):
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            if key.startswith(META_PREFIX) or not key.endswith('.json'):
+                continue
+            
+            display_id = key.rsplit('/', 1)[-1][:-len('.json')]
+            if case_exists(display_id):
+                continue
+            
+            write_manifest_entry(display_id, {
+                'key': key,
+                'etag': obj.get('ETag', '').strip('"'),
+                'backfilled': True
+            })
+            created += 1
+    
+    return created
+
+
+def check_meta_bucket() -> bool:
+    """
+    META_BUCKET이 KB 버킷과 다른지 확인 (같으면 KB가 매니페스트 등 내부 관리용 객체까지 인덱싱)
+    
+    META_BUCKET이 비어 있는 것은 허용합니다 (요약 캐시와 매니페스트 없이 실행).
+    """
+    if META_BUCKET and META_BUCKET == BUCKET_NAME:
+        print(f"❌ META_BUCKET은 BUCKET_NAME({BUCKET_NAME})과 다른 버킷이어야 합니다")
         return False
+    return True
+
+
+# --pack 모드에서 사용하는 샤드 묶음 저장기 (None이면 케이스마다 save_to_s3)
+packed_writer = None
+
+
+def store_summary(summary: Dict[str, Any], display_id: str) -> str:
+    """
+    요약 저장 (--pack 모드면 샤드 버퍼에 추가, 아니면 케이스별 객체로 저장)
+    
+    Args:
+        summary: 요약된 케이스 정보
+        display_id: 케이스 표시 번호
+    
+    Returns:
+        저장 위치 (S3 키 또는 샤드 prefix)
+    """
+    if packed_writer is not None:
+        return f"{packed_writer.add(summary, display_id)}/ (샤드)"
+    return save_to_s3(summary, display_id)
+
+
+def close_packed_writer() -> None:
+    """--pack 모드의 남은 샤드 버퍼 저장"""
+    if packed_writer is not None:
+        packed_writer.close()
 
 
 def process_case(case: Dict[str, Any]) -> bool:
@@ -150,30 +523,32 @@ def process_case(case: Dict[str, Any]) -> bool:
         print(f"   1️⃣ S3 중복 확인 중...")
         if check_case_exists_in_s3(display_id):
             print(f"   ⏭️  이미 존재함, 스킵")
-            stats['skipped'] += 1
+            record_stat('skipped')
             return True
         
-        # 2. 케이스 상세 정보 수집
+        # 2. 케이스 상세 정보 수집 (describe_cases + describe_communications)
         print(f"   2️⃣ 케이스 정보 수집 중...")
         case_data = get_case_details(case_id)
         
-        # 3. Bedrock 요약
+        # 3. Bedrock 요약 (대화 내용이 같은 요약이 캐시에 있으면 재사용)
         print(f"   3️⃣ Bedrock 요약 생성 중...")
-        summary = summarize_with_bedrock(case_data)
+        summary, cache_hit = summarize_with_cache(case_data)
+        if cache_hit:
+            record_stat('cache_hits')
         
         # 4. S3 저장
         print(f"   4️⃣ S3에 저장 중...")
-        s3_key = save_to_s3(summary, display_id)
+        s3_key = store_summary(summary, display_id)
+        s3_index.add(display_id)
         
         print(f"   ✅ 성공: {s3_key}")
-        stats['success'] += 1
+        record_stat('success')
         return True
         
     except Exception as e:
         error_msg = f"케이스 {display_id} 처리 실패: {str(e)}"
         print(f"   ❌ {error_msg}")
-        stats['failed'] += 1
-        stats['errors'].append({
+        record_stat('failed', {
             'case_id': case_id,
             'display_id': display_id,
             'error': str(e)
@@ -181,6 +556,611 @@ def process_case(case: Dict[str, Any]) -> bool:
         return False
 
 
+def process_cases_sequential(case_queue: queue.Queue) -> None:
+    """
+    케이스를 하나씩 순차 처리
+
+    Rate Limiter가 연결되어 있으면(기본) 호출마다 토큰 버킷이 속도를 제한하므로 고정 대기를 하지 않습니다.
+    연결되어 있지 않으면 API를 호출한 케이스 다음 케이스를 시작하기 전에만 RATE_LIMIT_DELAY초 대기합니다
+    (스킵한 케이스 뒤와 마지막 케이스 뒤에는 대기하지 않음).
+
+    Args:
+        case_queue: start_case_producer가 채우는 케이스 대기열
+    """
+    delay_pending = False
+    for i, case in enumerate(iter_case_queue(case_queue), 1):
+        if delay_pending:
+            # Rate Limit 방지
+            print(f"   ⏳ {RATE_LIMIT_DELAY}초 대기 중...")
+            time.sleep(RATE_LIMIT_DELAY)
+        
+        print(f"\n진행률: {i}번째 케이스")
+        
+        with stats_lock:
+            skipped_before = stats['skipped']
+        process_case(case)
+        with stats_lock:
+            skipped = stats['skipped'] > skipped_before
+        
+        delay_pending = not skipped and not rate_limiters_attached()
+
+
+def process_cases_concurrent(case_queue: queue.Queue, max_workers: int) -> None:
+    """
+    워커 풀로 케이스를 동시 처리
+
+    고정 대기 대신 Support API / Bedrock 호출이 각각의 토큰 버킷을 거치므로
+    설정한 초당 요청 수 한도까지 채워서 처리합니다.
+
+    Args:
+        case_queue: start_case_producer가 채우는 케이스 대기열
+        max_workers: 동시에 처리할 케이스 수
+    """
+    print(f"   워커 수: {max_workers}, Support API: {SUPPORT_API_RPS} req/s, Bedrock: {BEDROCK_RPS} req/s")
+    
+    def worker():
+        for case in iter_case_queue(case_queue):
+            process_case(case)
+            with stats_lock:
+                done = stats['success'] + stats['skipped'] + stats['failed']
+            print(f"\n진행률: {done}개 처리 완료")
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='migration') as executor:
+        futures = [executor.submit(worker) for _ in range(max_workers)]
+        for future in as_completed(futures):
+            future.result()
+
+
+def parse_iso_time(value: str) -> datetime:
+    """Support API 형식의 ISO 8601 시각 파싱 ('Z' 접미사 및 밀리초 포함)"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def format_iso_time(value: datetime) -> str:
+    """Support API afterTime/beforeTime 형식으로 변환"""
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def split_time_windows(after_time: str, before_time: str, shards: int) -> List[Dict[str, str]]:
+    """
+    조회 기간을 겹치지 않는 N개의 afterTime/beforeTime 구간으로 분할
+
+    Args:
+        after_time: 시작 날짜 (ISO 8601 형식)
+        before_time: 종료 날짜 (ISO 8601 형식)
+        shards: 구간 수
+
+    Returns:
+        구간 목록 ({'after': ..., 'before': ...})
+    """
+    start = parse_iso_time(after_time)
+    end = parse_iso_time(before_time)
+    if end <= start:
+        raise ValueError(f"종료 날짜가 시작 날짜보다 빨라야 합니다: {after_time} ~ {before_time}")
+
+    step = (end - start) / shards
+    bounds = [start + step * i for i in range(shards)] + [end]
+    # 초 단위로 맞춰 인접 구간이 같은 경계를 공유하도록 함
+    bounds = [b.replace(microsecond=0) for b in bounds]
+
+    return [
+        {'after': format_iso_time(bounds[i]), 'before': format_iso_time(bounds[i + 1])}
+        for i in range(shards)
+        if bounds[i] < bounds[i + 1]
+    ]
+
+
+def in_time_window(case: Dict[str, Any], window: Dict[str, Any]) -> bool:
+    """
+    케이스 생성 시각이 샤드 구간 [after, before)에 속하는지 확인
+
+    describe_cases의 afterTime/beforeTime 경계에 걸친 케이스가 두 샤드에서 중복
+    처리되지 않도록 각 케이스를 정확히 한 샤드에만 배정합니다. 첫/마지막 샤드는
+    바깥쪽 경계를 열어두어 단일 실행과 같은 케이스 집합을 처리합니다.
+    """
+    created = case.get('timeCreated')
+    if not created:
+        return window['first']
+
+    created_at = parse_iso_time(created)
+    if not window['first'] and created_at < parse_iso_time(window['after']):
+        return False
+    if not window['last'] and created_at >= parse_iso_time(window['before']):
+        return False
+    return True
+
+
+def init_shard_process(shared_support_limiter: TokenBucketRateLimiter,
+                       shared_bedrock_limiter: TokenBucketRateLimiter,
+                       known_display_ids: List[str],
+                       pack: bool = False) -> None:
+    """샤드 프로세스 초기화: 공유 Rate Limiter와 부모가 만든 S3 인덱스를 받음"""
+    global support_limiter, bedrock_limiter, packed_writer
+    support_limiter = shared_support_limiter
+    bedrock_limiter = shared_bedrock_limiter
+    attach_rate_limiters()
+    s3_index.display_ids = set(known_display_ids)
+    if pack:
+        packed_writer = PackedShardWriter(run_id=f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}")
+
+
+def run_shard(shard_no: int, window: Dict[str, Any], max_workers: int) -> Dict[str, Any]:
+    """
+    하나의 시간 구간을 현재 프로세스에서 마이그레이션
+
+    Args:
+        shard_no: 샤드 번호 (로그용)
+        window: split_time_windows 구간 + first/last 여부
+        max_workers: 샤드 내 동시 처리 케이스 수
+
+    Returns:
+        샤드 통계 및 새로 저장된 display_id 목록
+    """
+    print(f"\n🧩 샤드 {shard_no} 시작: {window['after']} ~ {window['before']}")
+
+    # 같은 프로세스가 이전 샤드를 처리했더라도 이 샤드의 통계만 반환하도록 초기화
+    with stats_lock:
+        for key in ('total', 'success', 'skipped', 'failed', 'cache_hits'):
+            stats[key] = 0
+        stats['errors'] = []
+
+    known = set(s3_index.display_ids)
+    cases = (c for c in get_resolved_cases(window['after'], window['before']) if in_time_window(c, window))
+    case_queue = start_case_producer(cases)
+
+    if max_workers > 1:
+        process_cases_concurrent(case_queue, max_workers)
+    else:
+        process_cases_sequential(case_queue)
+
+    close_packed_writer()
+
+    print(f"\n🧩 샤드 {shard_no} 완료: 성공 {stats['success']}, 스킵 {stats['skipped']}, 실패 {stats['failed']}")
+
+    return {
+        'shard': shard_no,
+        'window': {'after': window['after'], 'before': window['before']},
+        'stats': dict(stats, errors=list(stats['errors'])),
+        'new_display_ids': sorted(s3_index.display_ids - known)
+    }
+
+
+def process_cases_sharded(after_time: str, before_time: str, shards: int, max_workers: int) -> None:
+    """
+    조회 기간을 샤드로 나누어 각 샤드를 별도 프로세스에서 처리하고 결과를 합침
+
+    Support API / Bedrock 초당 요청 수 한도는 모든 샤드가 공유하는 토큰 버킷으로 지킵니다.
+
+    Args:
+        after_time: 시작 날짜 (ISO 8601 형식)
+        before_time: 종료 날짜 (ISO 8601 형식)
+        shards: 샤드(프로세스) 수
+        max_workers: 샤드당 동시 처리 케이스 수
+    """
+    windows = split_time_windows(after_time, before_time, shards)
+    for i, window in enumerate(windows):
+        window['first'] = i == 0
+        window['last'] = i == len(windows) - 1
+        print(f"   샤드 {i + 1}: {window['after']} ~ {window['before']}")
+
+    shared_support_limiter = TokenBucketRateLimiter(SUPPORT_API_RPS, shared=True)
+    shared_bedrock_limiter = TokenBucketRateLimiter(BEDROCK_RPS, shared=True)
+
+    # 샤드마다 새 프로세스 (maxtasksperchild=1): 프로세스 전역 통계/샤드 버퍼가 샤드 사이에 섞이지 않도록
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(
+        processes=len(windows),
+        initializer=init_shard_process,
+        initargs=(shared_support_limiter, shared_bedrock_limiter, sorted(s3_index.display_ids),
+                  packed_writer is not None),
+        maxtasksperchild=1
+    ) as pool:
+        results = pool.starmap(
+            run_shard,
+            [(i + 1, window, max_workers) for i, window in enumerate(windows)],
+            chunksize=1
+        )
+
+    # 샤드별 통계 및 에러 로그 병합
+    for result in results:
+        shard_stats = result['stats']
+        for key in ('total', 'success', 'skipped', 'failed', 'cache_hits'):
+            stats[key] += shard_stats[key]
+        stats['errors'].extend(
+            dict(error, shard=result['shard']) for error in shard_stats['errors']
+        )
+        for display_id in result['new_display_ids']:
+            s3_index.add(display_id)
+
+        print(f"   샤드 {result['shard']} ({result['window']['after']} ~ {result['window']['before']}): "
+              f"총 {shard_stats['total']}, 성공 {shard_stats['success']}, "
+              f"스킵 {shard_stats['skipped']}, 실패 {shard_stats['failed']}")
+
+
+class BedrockBatchJobClient:
+    """
+    Bedrock 배치 추론(CreateModelInvocationJob) 클라이언트
+
+    로컬 입력 JSONL을 BATCH_S3_URI에 업로드하여 배치 작업을 제출하고,
+    완료되면 출력 JSONL(.out)을 로컬로 내려받습니다.
+    """
+
+    TERMINAL_STATUSES = {'Completed', 'PartiallyCompleted', 'Failed', 'Stopped', 'Expired'}
+
+    def __init__(self, s3_uri: str, role_arn: str, model_id: str = MODEL_ID):
+        if not s3_uri.startswith('s3://') or not role_arn:
+            raise ValueError("배치 모드에는 BATCH_S3_URI(s3://...)와 BATCH_ROLE_ARN 설정이 필요합니다")
+
+        bucket, _, prefix = s3_uri[len('s3://'):].partition('/')
+        self.bucket = bucket
+        self.prefix = prefix if not prefix or prefix.endswith('/') else prefix + '/'
+        self.role_arn = role_arn
+        self.model_id = model_id
+        self.bedrock = boto3.client('bedrock', region_name='us-east-1')
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.jobs = {}
+
+    def submit(self, input_path: str, job_name: str) -> str:
+        """
+        입력 JSONL 업로드 후 배치 작업 제출
+
+        Returns:
+            작업 ID (jobArn)
+        """
+        input_name = os.path.basename(input_path)
+        input_key = f"{self.prefix}{job_name}/input/{input_name}"
+        output_prefix = f"{self.prefix}{job_name}/output/"
+
+        self.s3.upload_file(input_path, self.bucket, input_key)
+
+        response = self.bedrock.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=self.model_id,
+            inputDataConfig={
+                's3InputDataConfig': {
+                    's3Uri': f"s3://{self.bucket}/{input_key}",
+                    's3InputFormat': 'JSONL'
+                }
+            },
+            outputDataConfig={
+                's3OutputDataConfig': {
+                    's3Uri': f"s3://{self.bucket}/{output_prefix}"
+                }
+            }
+        )
+
+        job_id = response['jobArn']
+        self.jobs[job_id] = {'input_name': input_name, 'output_prefix': output_prefix}
+        return job_id
+
+    def wait(self, job_id: str, output_path: str) -> str:
+        """
+        작업 완료까지 대기 후 출력 JSONL 다운로드
+
+        Returns:
+            로컬 출력 파일 경로
+        """
+        while True:
+            job = self.bedrock.get_model_invocation_job(jobIdentifier=job_id)
+            status = job['status']
+            print(f"   배치 작업 상태: {status}")
+
+            if status in self.TERMINAL_STATUSES:
+                break
+
+            time.sleep(BATCH_POLL_INTERVAL)
+
+        if status not in ('Completed', 'PartiallyCompleted'):
+            raise RuntimeError(f"배치 작업 실패 ({status}): {job.get('message', '')}")
+
+        # 출력 위치: {output_prefix}{job-id}/{input_name}.out
+        job = self.jobs[job_id]
+        output_key = f"{job['output_prefix']}{job_id.rsplit('/', 1)[-1]}/{job['input_name']}.out"
+        self.s3.download_file(self.bucket, output_key, output_path)
+        return output_path
+
+
+def stub_model_response(model_input: Dict[str, Any]) -> Dict[str, Any]:
+    """LocalBatchJobClient 기본 응답: Bedrock 호출 없이 고정된 요약 JSON(구간 요약 요청이면 구간 요약 JSON)을 반환"""
+    if CHUNK_JSON_FORMAT in model_input['messages'][0]['content']:
+        note = dict(CHUNK_DEFAULTS, user_points=['[LOCAL] 배치 추론 대체 응답'])
+        return {'content': [{'type': 'text', 'text': json.dumps(note, ensure_ascii=False)}]}
+    
+    summary = {
+        'category': 'technical',
+        'service': 'general',
+        'question': '[LOCAL] 배치 추론 대체 응답',
+        'answer': '[LOCAL] 배치 추론 대체 응답',
+        'solution': '[LOCAL] 배치 추론 대체 응답',
+        'steps': [],
+        'tags': ['local-batch'],
+        'user_messages': [],
+        'support_messages': []
+    }
+    return {'content': [{'type': 'text', 'text': json.dumps(summary, ensure_ascii=False)}]}
+
+
+def invoke_model_input(model_input: Dict[str, Any]) -> Dict[str, Any]:
+    """배치 입력 레코드 하나를 invoke_model로 동기 호출 (소량 배치 처리용)"""
+    response = bedrock_concurrency.call(
+        get_client('bedrock-runtime').invoke_model,
+        modelId=MODEL_ID,
+        body=json.dumps(model_input)
+    )
+    return json.loads(response['body'].read())
+
+
+class LocalBatchJobClient:
+    """
+    배치 작업 API의 로컬 파일 기반 대체 구현
+
+    입력 JSONL의 레코드마다 responder(modelInput)를 호출하여 Bedrock 배치 출력과
+    같은 형식({recordId, modelInput, modelOutput | error})의 JSONL을 만듭니다.
+    기본 responder는 고정 응답을 반환하므로 전체 흐름을 오프라인으로 테스트할 수 있고,
+    invoke_model_input을 넘기면 소량 배치를 동기 호출로 처리합니다.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or stub_model_response
+        self.jobs = {}
+
+    def submit(self, input_path: str, job_name: str) -> str:
+        job_id = f"local-{job_name}"
+        self.jobs[job_id] = input_path
+        return job_id
+
+    def wait(self, job_id: str, output_path: str) -> str:
+        with open(self.jobs[job_id], 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8') as dst:
+            for line in src:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                try:
+                    record['modelOutput'] = self.responder(record['modelInput'])
+                except Exception as e:
+                    record['error'] = {'errorCode': 500, 'errorMessage': str(e)}
+
+                dst.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        return output_path
+
+
+def fetch_case_details(after_time: str, before_time: str) -> Iterator[Dict[str, Any]]:
+    """
+    Support API로 기간 내 해결된 케이스의 상세 정보 수집 (이미 저장된 케이스는 스킵)
+    
+    Args:
+        after_time: 시작 날짜 (ISO 8601 형식)
+        before_time: 종료 날짜 (ISO 8601 형식)
+    
+    Yields:
+        get_case_details 결과 ({'case': ..., 'communications': [...]})
+    """
+    seen = set()
+    for case in get_resolved_cases(after_time, before_time):
+        case_id = case['caseId']
+        display_id = case.get('displayId', case_id)
+        stats['total'] += 1
+        
+        if check_case_exists_in_s3(display_id) or case_id in seen:
+            record_stat('skipped')
+            continue
+        seen.add(case_id)
+        
+        try:
+            yield get_case_details(case_id)
+        except Exception as e:
+            print(f"   ❌ 케이스 {display_id} 정보 수집 실패: {str(e)}")
+            record_stat('failed', {'case_id': case_id, 'display_id': display_id, 'error': str(e)})
+
+
+def load_case_fixture(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    로컬 JSONL에서 케이스 상세 정보 읽기 (--batch-local, AWS 자격 증명 없이 실행)
+    
+    한 줄에 get_case_details 결과와 같은 형식({'case': {...}, 'communications': [...]})의
+    케이스 하나를 담습니다. S3 중복 확인은 하지 않고 파일 안의 중복 caseId만 스킵합니다.
+    
+    Args:
+        path: 케이스 JSONL 파일 경로
+    
+    Yields:
+        케이스 상세 정보
+    """
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            
+            case_data = json.loads(line)
+            case_id = case_data['case']['caseId']
+            stats['total'] += 1
+            
+            if case_id in seen:
+                record_stat('skipped')
+                continue
+            seen.add(case_id)
+            yield case_data
+
+
+def run_batch_job(batch_client, input_path: str, job_name: str, record_count: int) -> str:
+    """
+    배치 입력 JSONL로 배치 작업 하나를 제출하고 완료 대기 (최소 레코드 수 미만이면 동기 호출로 대체)
+    
+    Returns:
+        출력 JSONL 경로
+    """
+    if isinstance(batch_client, BedrockBatchJobClient) and record_count < BATCH_MIN_RECORDS:
+        print(f"   ⚠️  레코드 수가 배치 최소 {BATCH_MIN_RECORDS}개 미만이므로 동기 호출로 처리합니다")
+        batch_client = LocalBatchJobClient(responder=invoke_model_input)
+    
+    output_path = f"{input_path}.out"
+    print(f"\n🚚 배치 작업 제출 중: {job_name} ({record_count}개 레코드)")
+    job_id = batch_client.submit(input_path, job_name)
+    print(f"   작업 ID: {job_id}")
+    batch_client.wait(job_id, output_path)
+    print(f"   ✅ 배치 출력 수신: {output_path}")
+    return output_path
+
+
+def read_batch_output(output_path: str) -> Iterator[Dict[str, Any]]:
+    """배치 출력 JSONL의 레코드 ({recordId, modelInput, modelOutput | error})"""
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def process_cases_batch(case_source: Iterable[Dict[str, Any]], batch_client, store_local: bool = False) -> None:
+    """
+    Bedrock 배치 추론으로 케이스를 일괄 요약
+    
+    1. 요약 캐시(compute_content_hash)에 있는 케이스는 바로 저장하고, 나머지는 요약 프롬프트를
+       JSONL 입력 파일로 작성 (SUMMARY_TOKEN_BUDGET을 넘는 긴 케이스는 구간 요약 프롬프트 여러 개)
+    2. 하나의 배치 작업으로 제출 후 완료 대기
+    3. 긴 케이스는 구간 요약을 모은 통합 프롬프트로 두 번째 배치 작업 실행 (map-reduce)
+    4. 출력 JSONL을 요약 딕셔너리로 변환하여 요약 캐시와 S3(store_local이면 로컬 파일)에 저장
+    
+    Args:
+        case_source: 케이스 상세 정보 목록 (fetch_case_details 또는 load_case_fixture)
+        batch_client: BedrockBatchJobClient 또는 LocalBatchJobClient
+        store_local: True면 S3 대신 BATCH_WORK_DIR의 {작업 이름}.jsonl.summaries에 요약 저장
+    """
+    os.makedirs(BATCH_WORK_DIR, exist_ok=True)
+    job_name = f"support-migration-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    input_path = os.path.join(BATCH_WORK_DIR, f"{job_name}.jsonl")
+    summaries_path = f"{input_path}.summaries"
+    pending = {}       # 배치 출력을 기다리는 케이스 (caseId -> 케이스 상세 정보)
+    hashes = {}        # caseId -> 요약 캐시 키
+    chunk_notes = {}   # 긴 케이스의 구간 요약 (caseId -> 구간 순서대로의 결과, 실패한 구간은 None)
+    local_file = open(summaries_path, 'w', encoding='utf-8') if store_local else None
+    
+    def store(summary: Dict[str, Any], case: Dict[str, Any]) -> None:
+        display_id = case.get('displayId', case['caseId'])
+        if local_file is not None:
+            local_file.write(json.dumps(summary, ensure_ascii=False) + '\n')
+            location = summaries_path
+        else:
+            location = store_summary(summary, display_id)
+            s3_index.add(display_id)
+        
+        print(f"   ✅ {display_id}: {location}")
+        record_stat('success')
+    
+    def fail(case: Dict[str, Any], error: str) -> None:
+        display_id = case.get('displayId', case['caseId'])
+        print(f"   ❌ 케이스 {display_id} 저장 실패: {error}")
+        record_stat('failed', {'case_id': case['caseId'], 'display_id': display_id, 'error': error})
+    
+    def finish(record: Dict[str, Any]) -> None:
+        case = pending.pop(record['recordId'])['case']
+        try:
+            if 'error' in record:
+                raise RuntimeError(f"배치 추론 실패: {record['error'].get('errorMessage', record['error'])}")
+            
+            summary = attach_case_metadata(parse_model_output(record['modelOutput']), case)
+            put_cached_summary(hashes[case['caseId']], summary)
+            store(summary, case)
+        
+        except Exception as e:
+            fail(case, str(e))
+    
+    try:
+        # 1. 요약 캐시 확인 및 배치 입력 파일 작성
+        print(f"\n📝 배치 입력 작성 중: {input_path}")
+        record_count = 0
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for case_data in case_source:
+                case = case_data['case']
+                case_id = case['caseId']
+                content_hash = compute_content_hash(case_data)
+                
+                cached = get_cached_summary(content_hash)
+                if cached is not None:
+                    try:
+                        store(attach_case_metadata(cached, case), case)
+                        record_stat('cache_hits')
+                    except Exception as e:
+                        fail(case, str(e))
+                    continue
+                
+                prompt = build_summary_prompt(case_data)
+                if estimate_tokens(prompt) > SUMMARY_TOKEN_BUDGET:
+                    prompts = build_chunk_prompts(case_data)
+                    records = [
+                        (f"{case_id}{BATCH_CHUNK_SEP}{index}", build_model_body(chunk_prompt, CHUNK_MAX_TOKENS))
+                        for index, chunk_prompt in enumerate(prompts)
+                    ]
+                    chunk_notes[case_id] = [None] * len(prompts)
+                else:
+                    records = [(case_id, build_model_body(prompt))]
+                
+                for record_id, model_input in records:
+                    f.write(json.dumps({'recordId': record_id, 'modelInput': model_input}, ensure_ascii=False) + '\n')
+                record_count += len(records)
+                pending[case_id] = case_data
+                hashes[case_id] = content_hash
+        
+        if not pending:
+            print("\n⚠️  배치로 요약할 케이스가 없습니다.")
+            return
+        
+        print(f"   ✅ {len(pending)}개 케이스 ({len(chunk_notes)}개는 구간 분할), {record_count}개 레코드 작성 완료")
+        
+        # 2. 배치 작업 제출 및 대기
+        output_path = run_batch_job(batch_client, input_path, job_name, record_count)
+        
+        # 3. 출력 파싱 및 저장 (구간 요약은 통합 단계용으로 모음)
+        print(f"\n💾 요약 결과 저장 중...")
+        for record in read_batch_output(output_path):
+            case_id, sep, index = record['recordId'].partition(BATCH_CHUNK_SEP)
+            if case_id not in pending:
+                continue
+            
+            if not sep:
+                finish(record)
+                continue
+            
+            if 'error' not in record:
+                try:
+                    chunk_notes[case_id][int(index)] = parse_model_output(record['modelOutput'], CHUNK_DEFAULTS)
+                except Exception as e:
+                    print(f"   ⚠️  {case_id} 구간 {int(index) + 1} 요약 파싱 실패: {str(e)}")
+        
+        # 4. 긴 케이스: 구간 요약을 통합하는 두 번째 배치 작업
+        if chunk_notes:
+            reduce_path = os.path.join(BATCH_WORK_DIR, f"{job_name}-reduce.jsonl")
+            reduce_count = 0
+            with open(reduce_path, 'w', encoding='utf-8') as f:
+                for case_id, notes in chunk_notes.items():
+                    if None in notes:
+                        fail(pending.pop(case_id)['case'], '구간 요약 배치 출력에 실패한 구간이 있습니다')
+                        continue
+                    
+                    model_input = build_model_body(build_reduce_prompt(pending[case_id], notes))
+                    f.write(json.dumps({'recordId': case_id, 'modelInput': model_input}, ensure_ascii=False) + '\n')
+                    reduce_count += 1
+            
+            if reduce_count:
+                output_path = run_batch_job(batch_client, reduce_path, f"{job_name}-reduce", reduce_count)
+                for record in read_batch_output(output_path):
+                    if record['recordId'] in pending:
+                        finish(record)
+    
+    finally:
+        if local_file is not None:
+            local_file.close()
+            print(f"   📄 요약 저장 (로컬): {summaries_path}")
+    
+    # 출력에 없는 레코드는 실패로 기록
+    for case_data in pending.values():
+        fail(case_data['case'], '배치 출력에 결과가 없습니다')
+
+
 def save_error_log():
     """에러 로그를 파일에 저장"""
     if stats['errors']:
@@ -202,6 +1182,12 @@ def print_summary():
     print(f"✅ 성공:         {stats['success']}")
     print(f"⏭️  스킵:         {stats['skipped']}")
     print(f"❌ 실패:         {stats['failed']}")
+    print(f"♻️  요약 캐시:     {stats['cache_hits']}")
+    print(f"🩹 JSON 복구:     {get_json_repair_count()} (Bedrock 재호출 생략)")
+    stream_metrics = get_bedrock_stream_metrics()
+    if stream_metrics['avg_first_token_ms'] is not None:
+        print(f"⏱️  첫 토큰 평균:  {stream_metrics['avg_first_token_ms']:.0f}ms "
+              f"(스트리밍 {stream_metrics['streams']}회, 조기 중단 {stream_metrics['aborted']}회)")
     print(f"{'='*80}")
     
     if stats['failed'] > 0:
@@ -209,48 +1195,119 @@ def print_summary():
         print(f"   에러 로그를 확인하세요.")
 
 
+def parse_args() -> argparse.Namespace:
+    """명령행 인자 파싱 (지정하지 않으면 파일 상단 설정값 사용)"""
+    parser = argparse.ArgumentParser(description='AWS Support 케이스 마이그레이션')
+    parser.add_argument('--start', default=START_DATE, help=f'시작 날짜 (기본값: {START_DATE})')
+    parser.add_argument('--end', default=END_DATE, help=f'종료 날짜 (기본값: {END_DATE})')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='조회 기간을 N개 구간으로 나누어 각각 별도 프로세스에서 처리 (기본값: 1)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f'프로세스당 동시 처리 케이스 수 (기본값: {MAX_WORKERS})')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--batch', action='store_true',
+                      help='Bedrock 배치 추론 작업 하나로 일괄 요약 (BATCH_S3_URI, BATCH_ROLE_ARN 필요)')
+    mode.add_argument('--batch-local', metavar='CASES_JSONL',
+                      help='배치 모드를 오프라인으로 실행: 케이스를 로컬 JSONL에서 읽고 Bedrock 대신 고정 응답, '
+                           '요약은 S3 대신 BATCH_WORK_DIR에 저장 (AWS 자격 증명 불필요, META_BUCKET을 지정하면 요약 캐시만 S3 사용)')
+    parser.add_argument('--pack', action='store_true',
+                        help='케이스별 객체 대신 {category}/{service}/{YYYY-MM}별 NDJSON 샤드로 묶어서 저장')
+    parser.add_argument('--scan-index', action='store_true',
+                        help='시작 시 버킷 목록으로 중복 확인 인덱스 생성 (매니페스트가 없는 예전 케이스가 있을 때)')
+    parser.add_argument('--backfill-manifest', action='store_true',
+                        help='매니페스트가 없는 예전 케이스별 객체의 매니페스트 항목만 만들고 종료')
+    parser.add_argument('-y', '--yes', action='store_true', help='실행 확인 생략')
+    return parser.parse_args()
+
+
 def main():
     """메인 함수"""
+    global packed_writer
+    args = parse_args()
+    
+    if not args.batch_local and not check_meta_bucket():
+        return
+    
+    if args.backfill_manifest and not meta_bucket_enabled():
+        print("❌ --backfill-manifest에는 매니페스트를 저장할 META_BUCKET이 필요합니다")
+        return
+    
+    # 묶음 저장 조건(META_BUCKET, 압축하지 않음)은 확인 전에 검사
+    if args.pack:
+        try:
+            packed_writer = PackedShardWriter()
+        except ValueError as e:
+            print(f"❌ --pack 사용 불가: {e}")
+            return
+    
+    if args.backfill_manifest:
+        print(f"🗂️  매니페스트 백필 중: {BUCKET_NAME}")
+        created = backfill_manifest()
+        print(f"   ✅ 매니페스트 항목 {created}개 생성")
+        return
+    
     print("="*80)
     print("🚀 AWS Support 케이스 마이그레이션 시작")
     print("="*80)
     print(f"버킷: {BUCKET_NAME}")
-    print(f"기간: {START_DATE} ~ {END_DATE}")
-    print(f"Rate Limit 대기: {RATE_LIMIT_DELAY}초")
+    print(f"기간: {args.start} ~ {args.end}")
+    if args.pack:
+        print(f"저장 형식: NDJSON 샤드 묶음 저장")
+    if args.batch or args.batch_local:
+        print(f"배치 추론: {f'로컬 대체 구현 ({args.batch_local})' if args.batch_local else BATCH_S3_URI}")
+    if args.shards > 1:
+        print(f"샤드: {args.shards}개 프로세스 (공유 Rate Limit: Support {SUPPORT_API_RPS} req/s, Bedrock {BEDROCK_RPS} req/s)")
+    if args.workers > 1:
+        print(f"동시 처리: 워커 {args.workers}개")
+    elif rate_limiters_attached():
+        print(f"Rate Limit: Support {SUPPORT_API_RPS} req/s, Bedrock {BEDROCK_RPS} req/s")
+    else:
+        print(f"Rate Limit 대기: {RATE_LIMIT_DELAY}초")
     print("="*80)
     
     # 사용자 확인
-    response = input("\n계속하시겠습니까? (y/n): ")
-    if response.lower() != 'y':
-        print("취소되었습니다.")
-        return
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            return
+    
+    # 1. 중복 확인 준비 (기본: 케이스마다 매니페스트 GET, --scan-index: 버킷 목록 인덱스도 사용)
+    if args.scan_index:
+        print(f"\n🗂️  S3 케이스 인덱스 생성 중...")
+        s3_index.build()
+    else:
+        s3_index.cache_file = ''  # 이번 실행에서 저장한 케이스만 담으므로 로컬 캐시에 저장하지 않음
     
-    # 1. 해결된 케이스 목록 조회
-    cases = get_resolved_cases(START_DATE, END_DATE)
-    stats['total'] = len(cases)
+    # 2~3. 해결된 케이스 목록 조회와 처리를 파이프라인으로 진행
+    #      (조회 스레드가 페이지 단위로 대기열을 채우는 동안 첫 페이지부터 처리 시작)
+    print(f"\n🔄 케이스 처리 시작...\n")
+    
+    if args.batch:
+        process_cases_batch(fetch_case_details(args.start, args.end), BedrockBatchJobClient(BATCH_S3_URI, BATCH_ROLE_ARN))
+    elif args.batch_local:
+        process_cases_batch(load_case_fixture(args.batch_local), LocalBatchJobClient(), store_local=True)
+    elif args.shards > 1:
+        process_cases_sharded(args.start, args.end, args.shards, args.workers)
+    else:
+        case_queue = start_case_producer(get_resolved_cases(args.start, args.end))
+        
+        if args.workers > 1:
+            process_cases_concurrent(case_queue, args.workers)
+        else:
+            process_cases_sequential(case_queue)
     
     if stats['total'] == 0:
         print("\n⚠️  처리할 케이스가 없습니다.")
         return
     
-    # 2. 각 케이스 처리
-    print(f"\n🔄 {stats['total']}개 케이스 처리 시작...\n")
-    
-    for i, case in enumerate(cases, 1):
-        print(f"\n진행률: {i}/{stats['total']} ({i*100//stats['total']}%)")
-        
-        process_case(case)
-        
-        # Rate Limit 방지
-        if i < stats['total']:
-            print(f"   ⏳ {RATE_LIMIT_DELAY}초 대기 중...")
-            time.sleep(RATE_LIMIT_DELAY)
-    
-    # 3. 에러 로그 저장
+    # 4. 남은 샤드, 에러 로그 및 인덱스 저장
+    close_packed_writer()
     save_error_log()
+    s3_index.save()
     
-    # 4. Bedrock KB 동기화 (선택사항)
-    if KB_ID and DS_ID:
+    # 5. Bedrock KB 동기화 (선택사항, S3에 저장하지 않는 --batch-local은 제외)
+    if KB_ID and DS_ID and not args.batch_local:
         print(f"\n🔄 Bedrock Knowledge Base 동기화 중...")
         try:
             trigger_kb_sync()
@@ -258,7 +1315,7 @@ def main():
         except Exception as e:
             print(f"   ⚠️  동기화 실패: {str(e)}")
     
-    # 5. 결과 요약
+    # 6. 결과 요약
     print_summary()
 
 
@@ -267,8 +1324,10 @@ if __name__ == '__main__':
         main()
     except KeyboardInterrupt:
         print("\n\n⚠️  사용자에 의해 중단되었습니다.")
+        close_packed_writer()
         print_summary()
         save_error_log()
+        s3_index.save()
     except Exception as e:
         print(f"\n\n❌ 예상치 못한 에러: {str(e)}")
         import traceback
@@ -8,9 +8,14 @@ Lambda 함수 코드를 포함하여 단일 파일로 실행 가능합니다.
 
 import boto3
 import json
+import os
+import queue
+import sqlite3
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
 
 # ============================================================================
 # 설정 (여기를 수정하세요)
@@ -21,7 +26,10 @@ KB_ID = ''  # Bedrock KB ID (있으면 입력, 없으면 빈 문자열)
 DS_ID = ''  # Data Source ID (있으면 입력, 없으면 빈 문자열)
 START_DATE = '2023-01-01T00:00:00Z'  # 마이그레이션 시작 날짜
 END_DATE = '2025-12-31T23:59:59Z'    # 마이그레이션 종료 날짜
+S3_INDEX_FILE = 's3_case_index.json'  # S3 중복 확인 인덱스 로컬 캐시 ('' 이면 저장 안 함)
+JOURNAL_FILE = 'migration_journal.db'  # 재시작용 체크포인트 저널 ('' 이면 메모리에만 기록)
 RATE_LIMIT_DELAY = 1  # 각 케이스 처리 후 대기 시간 (초)
+CASE_QUEUE_SIZE = 200  # 목록 조회와 처리 사이의 대기열 크기
 
 # ============================================================================
 # AWS 클라이언트 초기화
@@ -49,8 +57,19 @@ stats = {
 # ============================================================================
 
 def get_case_details(case_id: str) -> Dict[str, Any]:
-    """Support API로 케이스 상세 정보 수집"""
-    # 케이스 기본 정보 조회
+    """Support API로 케이스 상세 정보 수집 (기본 정보와 전체 대화 내역을 동시에 조회)"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        case_future = executor.submit(describe_case, case_id)
+        comms_future = executor.submit(describe_all_communications, case_id)
+        
+        return {
+            'case': case_future.result(),
+            'communications': comms_future.result()
+        }
+
+
+def describe_case(case_id: str) -> Dict[str, Any]:
+    """케이스 기본 정보 조회"""
     case_response = support_client.describe_cases(
         caseIdList=[case_id],
         includeResolvedCases=True,
@@ -60,20 +79,25 @@ def get_case_details(case_id: str) -> Dict[str, Any]:
     if not case_response['cases']:
         raise ValueError(f"케이스를 찾을 수 없습니다: {case_id}")
     
-    case = case_response['cases'][0]
-    
-    # 대화 내역 조회
-    comms_response = support_client.describe_communications(
-        caseId=case_id,
-        maxResults=100
-    )
-    
-    communications = comms_response.get('communications', [])
+    return case_response['cases'][0]
+
+
+def describe_all_communications(case_id: str) -> List[Dict[str, Any]]:
+    """대화 내역을 nextToken이 없을 때까지 모두 조회"""
+    communications = []
+    next_token = None
     
-    return {
-        'case': case,
-        'communications': communications
-    }
+    while True:
+        params = {'caseId': case_id, 'maxResults': 100}
+        if next_token:
+            params['nextToken'] = next_token
+        
+        comms_response = support_client.describe_communications(**params)
+        communications.extend(comms_response.get('communications', []))
+        
+        next_token = comms_response.get('nextToken')
+        if not next_token:
+            return communications
 
 
 def summarize_with_bedrock(case_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -214,13 +238,302 @@ def trigger_kb_sync() -> None:
 # 마이그레이션 로직
 # ============================================================================
 
-def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[str, Any]]:
-    """해결된 케이스 목록 조회"""
+class S3CaseIndex:
+    """
+    S3에 저장된 케이스의 display_id 인덱스
+
+    실행 시작 시 list_objects_v2로 버킷을 한 번만 조회하여 display_id 집합을 만들고,
+    save_to_s3 후에는 add()로 갱신합니다. cache_file을 지정하면 로컬에 저장해두었다가
+    다음 실행에서 마지막 LastModified 이후의 월(YYYY-MM) prefix만 다시 조회합니다.
+    """
+
+    def __init__(self, bucket: str, cache_file: str = ''):
+        self.bucket = bucket
+        self.cache_file = cache_file
+        self.display_ids = set()
+        self.last_modified = None
+        self.lock = threading.Lock()
+
+    def __contains__(self, display_id: str) -> bool:
+        with self.lock:
+            return display_id in self.display_ids
+
+    def __len__(self) -> int:
+        return len(self.display_ids)
+
+    def add(self, display_id: str) -> None:
+        """save_to_s3 성공 후 인덱스에 추가"""
+        with self.lock:
+            self.display_ids.add(display_id)
+
+    def load(self) -> bool:
+        """
+        로컬 캐시 파일에서 인덱스 로드
+
+        Returns:
+            로드 성공 여부
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  인덱스 캐시 로드 실패: {str(e)}")
+            return False
+
+        if data.get('bucket') != self.bucket:
+            return False
+
+        self.display_ids = set(data.get('display_ids', []))
+        last_modified = data.get('last_modified')
+        self.last_modified = datetime.fromisoformat(last_modified) if last_modified else None
+        return True
+
+    def save(self) -> None:
+        """인덱스를 로컬 캐시 파일에 저장"""
+        if not self.cache_file:
+            return
+
+        with self.lock:
+            data = {
+                'bucket': self.bucket,
+                'last_modified': self.last_modified.isoformat() if self.last_modified else None,
+                'display_ids': sorted(self.display_ids)
+            }
+
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def refresh(self) -> None:
+        """
+        S3 목록을 조회하여 인덱스 갱신
+
+        캐시가 없으면 버킷 전체를 한 번 조회하고, 캐시가 있으면
+        {category}/{service}/{YYYY-MM}/ 중 마지막 LastModified 이후 월의 prefix만 조회합니다.
+        """
+        if self.last_modified is None:
+            self._scan('')
+            return
+
+        since_month = self.last_modified.strftime('%Y-%m')
+        for category in self._list_prefixes(''):
+            for service in self._list_prefixes(category):
+                for month in self._list_prefixes(service):
+                    if month[len(service):].rstrip('/') >= since_month:
+                        self._scan(month)
+
+    def _list_prefixes(self, prefix: str) -> List[str]:
+        """prefix 바로 아래의 하위 prefix 목록"""
+        paginator = s3_client.get_paginator('list_objects_v2')
+        prefixes = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
+            prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+        return prefixes
+
+    def _scan(self, prefix: str) -> None:
+        """prefix 아래의 모든 객체를 인덱스에 추가"""
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if not key.endswith('.json'):
+                    continue
+
+                display_id = key.rsplit('/', 1)[-1][:-len('.json')]
+                with self.lock:
+                    self.display_ids.add(display_id)
+                    if self.last_modified is None or obj['LastModified'] > self.last_modified:
+                        self.last_modified = obj['LastModified']
+
+    def build(self) -> None:
+        """캐시 로드 후 S3와 동기화 (실행 시작 시 1회 호출)"""
+        cached = self.load()
+        if cached:
+            print(f"   로컬 인덱스 로드: {len(self)}개 (기준 시각 {self.last_modified})")
+
+        self.refresh()
+        self.save()
+        print(f"   ✅ S3 인덱스 준비 완료: {len(self)}개 케이스")
+
+
+s3_index = S3CaseIndex(BUCKET_NAME, S3_INDEX_FILE)
+
+
+class MigrationJournal:
+    """
+    재시작 가능한 마이그레이션을 위한 SQLite 체크포인트 저널
+
+    케이스별 진행 단계(listed → fetched → summarized → stored)와 단계별 결과,
+    그리고 조회 기간별 describe_cases nextToken을 기록합니다.
+    중단 후 다시 실행하면 완료된 단계는 건너뛰고 이어서 처리하므로
+    이미 요약된 케이스는 Bedrock을 다시 호출하지 않습니다.
+    """
+
+    STAGES = ['listed', 'fetched', 'summarized', 'stored']
+
+    def __init__(self, path: str = ''):
+        self.conn = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self.lock = threading.Lock()
+
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cases (
+                    case_id TEXT PRIMARY KEY,
+                    display_id TEXT,
+                    stage TEXT NOT NULL,
+                    case_json TEXT,
+                    case_data_json TEXT,
+                    summary_json TEXT,
+                    s3_key TEXT,
+                    error TEXT,
+                    updated_at TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS listing (
+                    period TEXT PRIMARY KEY,
+                    next_token TEXT,
+                    completed INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def _update(self, case_id: str, **fields) -> None:
+        fields['updated_at'] = datetime.now().isoformat()
+        columns = ', '.join(f"{name} = ?" for name in fields)
+
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"UPDATE cases SET {columns} WHERE case_id = ?",
+                list(fields.values()) + [case_id]
+            )
+
+    def get_listing_state(self, period: str) -> Dict[str, Any]:
+        """조회 기간의 nextToken 및 완료 여부"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT next_token, completed FROM listing WHERE period = ?", (period,)
+            ).fetchone()
+
+        if not row:
+            return {'next_token': None, 'completed': False}
+        return {'next_token': row[0], 'completed': bool(row[1])}
+
+    def record_listed(self, period: str, cases: List[Dict[str, Any]], next_token: str = None) -> None:
+        """조회된 케이스 페이지와 다음 페이지 토큰을 한 트랜잭션으로 기록"""
+        now = datetime.now().isoformat()
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO cases (case_id, display_id, stage, case_json, updated_at) "
+                "VALUES (?, ?, 'listed', ?, ?)",
+                [
+                    (c['caseId'], c.get('displayId', c['caseId']), json.dumps(c, ensure_ascii=False), now)
+                    for c in cases
+                ]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO listing (period, next_token, completed) VALUES (?, ?, ?)",
+                (period, next_token, 0 if next_token else 1)
+            )
+
+    def get(self, case_id: str) -> Dict[str, Any]:
+        """케이스의 저널 항목 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT stage, case_data_json, summary_json, s3_key, error FROM cases WHERE case_id = ?",
+                (case_id,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            'stage': row[0],
+            'case_data': json.loads(row[1]) if row[1] else None,
+            'summary': json.loads(row[2]) if row[2] else None,
+            's3_key': row[3],
+            'error': row[4]
+        }
+
+    def pending_cases(self) -> List[Dict[str, Any]]:
+        """아직 stored 단계에 도달하지 않은 케이스 목록 (조회 순서대로)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT case_json FROM cases WHERE stage != 'stored' ORDER BY rowid"
+            ).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def filter_pending(self, case_ids: List[str]) -> set:
+        """주어진 케이스 중 아직 stored 단계가 아닌 케이스 ID 집합"""
+        if not case_ids:
+            return set()
+
+        placeholders = ', '.join('?' * len(case_ids))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT case_id FROM cases WHERE stage != 'stored' AND case_id IN ({placeholders})",
+                case_ids
+            ).fetchall()
+
+        return {row[0] for row in rows}
+
+    def count_stored(self) -> int:
+        """stored 단계까지 완료된 케이스 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cases WHERE stage = 'stored'").fetchone()[0]
+
+    def mark_fetched(self, case_id: str, case_data: Dict[str, Any]) -> None:
+        self._update(case_id, stage='fetched', case_data_json=json.dumps(case_data, ensure_ascii=False, default=str), error=None)
+
+    def mark_summarized(self, case_id: str, summary: Dict[str, Any]) -> None:
+        self._update(case_id, stage='summarized', summary_json=json.dumps(summary, ensure_ascii=False), error=None)
+
+    def mark_stored(self, case_id: str, s3_key: str = None) -> None:
+        # 저장이 끝난 케이스는 대화 내역을 더 들고 있을 필요가 없음
+        self._update(case_id, stage='stored', s3_key=s3_key, case_data_json=None, error=None)
+
+    def mark_failed(self, case_id: str, error: str) -> None:
+        """실패 기록 (단계는 유지하므로 재시작 시 실패한 단계부터 재시도)"""
+        self._update(case_id, error=error)
+
+
+journal = MigrationJournal(JOURNAL_FILE)
+
+
+def get_resolved_cases(after_time: str, before_time: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    해결된 케이스 목록 조회 (제너레이터)
+
+    저널에 남아 있는 미완료 케이스를 먼저 yield한 뒤, describe_cases를 페이지 단위로
+    조회하면서 새로 기록된 해결 케이스를 바로 yield합니다. 페이지마다 nextToken을
+    저널에 기록하므로 중단된 경우 다음 실행은 마지막 nextToken부터 조회를 이어갑니다.
+    """
     print(f"\n📋 해결된 케이스 목록 조회 중...")
     print(f"   기간: {after_time} ~ {before_time or '현재'}")
     
-    cases = []
-    next_token = None
+    period = f"{after_time}~{before_time or ''}"
+    listing = journal.get_listing_state(period)
+    next_token = listing['next_token']
+    
+    # 이전 실행에서 조회했지만 저장까지 끝나지 않은 케이스
+    yielded = set()
+    pending = journal.pending_cases()
+    if pending:
+        print(f"   저널의 미완료 케이스 {len(pending)}개부터 처리 (완료 {journal.count_stored()}개)")
+    for case in pending:
+        yielded.add(case['caseId'])
+        yield case
+    
+    if listing['completed']:
+        print(f"   저널에 조회 완료 기록 있음, 목록 조회 스킵")
+        return
+    elif next_token:
+        print(f"   저널의 nextToken부터 조회 재개")
+    
+    total = 0
     
     while True:
         try:
@@ -240,11 +553,21 @@ def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[st
             response = support_client.describe_cases(**params)
             
             batch_cases = response.get('cases', [])
-            cases.extend(batch_cases)
+            total += len(batch_cases)
             
-            print(f"   조회됨: {len(batch_cases)}개 (총 {len(cases)}개)")
+            print(f"   조회됨: {len(batch_cases)}개 (총 {total}개)")
             
+            # 해결된 케이스만 저널에 기록
             next_token = response.get('nextToken')
+            resolved = [c for c in batch_cases if c.get('status') == 'resolved']
+            journal.record_listed(period, resolved, next_token)
+            
+            pending_ids = journal.filter_pending([c['caseId'] for c in resolved])
+            for case in resolved:
+                if case['caseId'] in pending_ids and case['caseId'] not in yielded:
+                    yielded.add(case['caseId'])
+                    yield case
+            
             if not next_token:
                 break
                 
@@ -252,28 +575,41 @@ def get_resolved_cases(after_time: str, before_time: str = None) -> List[Dict[st
             print(f"   ⚠️  케이스 목록 조회 실패: {str(e)}")
             break
     
-    # 해결된 케이스만 필터링
-    resolved_cases = [c for c in cases if c.get('status') == 'resolved']
-    print(f"\n✅ 총 {len(resolved_cases)}개의 해결된 케이스 발견")
+    print(f"\n✅ 목록 조회 완료 (저널 기준 완료 {journal.count_stored()}개)")
+
+
+_END_OF_CASES = object()
+
+
+def start_case_producer(cases: Iterable[Dict[str, Any]], maxsize: int = CASE_QUEUE_SIZE) -> queue.Queue:
+    """백그라운드 스레드에서 케이스 목록을 조회하여 크기 제한이 있는 대기열에 채움"""
+    case_queue = queue.Queue(maxsize=maxsize)
     
-    return resolved_cases
+    def produce():
+        try:
+            for case in cases:
+                case_queue.put(case)
+        finally:
+            case_queue.put(_END_OF_CASES)
+    
+    threading.Thread(target=produce, name='case-lister', daemon=True).start()
+    return case_queue
 
 
-def check_case_exists_in_s3(display_id: str) -> bool:
-    """S3에 케이스가 이미 존재하는지 확인"""
-    try:
-        paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix='')
-        
-        for page in pages:
-            for obj in page.get('Contents', []):
-                if f"/{display_id}.json" in obj['Key']:
-                    return True
-        
-        return False
+def iter_case_queue(case_queue: queue.Queue) -> Iterator[Dict[str, Any]]:
+    """대기열에서 종료 표시가 나올 때까지 케이스를 꺼냄"""
+    while True:
+        case = case_queue.get()
+        if case is _END_OF_CASES:
+            return
         
-    except Exception as e:
-        return False
+        stats['total'] += 1
+        yield case
+
+
+def check_case_exists_in_s3(display_id: str) -> bool:
+    """S3에 케이스가 이미 존재하는지 확인 (실행 시작 시 만든 인덱스 사용)"""
+    return display_id in s3_index
 
 
 def process_case(case: Dict[str, Any]) -> bool:
@@ -288,24 +624,48 @@ def process_case(case: Dict[str, Any]) -> bool:
     print(f"   케이스 ID: {case_id}")
     
     try:
+        entry = journal.get(case_id) or {'stage': 'listed'}
+        stage = entry['stage']
+        
+        if stage == 'stored':
+            print(f"   ⏭️  저널에 완료 기록 있음, 스킵")
+            stats['skipped'] += 1
+            return True
+        
+        if entry.get('error'):
+            print(f"   🔁 이전 실패 재시도 (마지막 단계: {stage})")
+        
         # 1. S3 중복 확인
         print(f"   1️⃣ S3 중복 확인 중...")
         if check_case_exists_in_s3(display_id):
             print(f"   ⏭️  이미 존재함, 스킵")
+            journal.mark_stored(case_id)
             stats['skipped'] += 1
             return True
         
-        # 2. 케이스 정보 수집
-        print(f"   2️⃣ 케이스 정보 수집 중...")
-        case_data = get_case_details(case_id)
+        # 2. 케이스 정보 수집 (저널에 수집 결과가 있으면 재사용)
+        if stage == 'listed':
+            print(f"   2️⃣ 케이스 정보 수집 중...")
+            case_data = get_case_details(case_id)
+            journal.mark_fetched(case_id, case_data)
+            stage = 'fetched'
+        else:
+            case_data = entry['case_data']
         
-        # 3. Bedrock 요약
-        print(f"   3️⃣ Bedrock 요약 생성 중...")
-        summary = summarize_with_bedrock(case_data)
+        # 3. Bedrock 요약 (저널에 요약이 있으면 재사용)
+        if stage == 'fetched':
+            print(f"   3️⃣ Bedrock 요약 생성 중...")
+            summary = summarize_with_bedrock(case_data)
+            journal.mark_summarized(case_id, summary)
+        else:
+            print(f"   3️⃣ 저널의 Bedrock 요약 재사용")
+            summary = entry['summary']
         
         # 4. S3 저장
         print(f"   4️⃣ S3에 저장 중...")
         s3_key = save_to_s3(summary, display_id)
+        s3_index.add(display_id)
+        journal.mark_stored(case_id, s3_key)
         
         print(f"   ✅ 성공: {s3_key}")
         stats['success'] += 1
@@ -314,6 +674,7 @@ def process_case(case: Dict[str, Any]) -> bool:
     except Exception as e:
         error_msg = f"케이스 {display_id} 처리 실패: {str(e)}"
         print(f"   ❌ {error_msg}")
+        journal.mark_failed(case_id, str(e))
         stats['failed'] += 1
         stats['errors'].append({
             'case_id': case_id,
@@ -360,35 +721,38 @@ def main():
     print(f"Rate Limit 대기: {RATE_LIMIT_DELAY}초")
     print("="*80)
     
-    # 1. 해결된 케이스 목록 조회
-    cases = get_resolved_cases(START_DATE, END_DATE)
-    stats['total'] = len(cases)
+    # 1. S3 중복 확인 인덱스 생성 (실행당 1회)
+    print(f"\n🗂️  S3 케이스 인덱스 생성 중...")
+    s3_index.build()
     
-    if stats['total'] == 0:
-        print("\n⚠️  처리할 케이스가 없습니다.")
-        return
+    # 2~3. 해결된 케이스 목록 조회와 처리를 파이프라인으로 진행
+    #      (조회 스레드가 페이지 단위로 대기열을 채우는 동안 첫 페이지부터 처리 시작)
+    case_queue = start_case_producer(get_resolved_cases(START_DATE, END_DATE))
     
-    # 2. 각 케이스 처리
-    print(f"\n🔄 {stats['total']}개 케이스 처리 시작...\n")
+    print(f"\n🔄 케이스 처리 시작...\n")
     
-    for i, case in enumerate(cases, 1):
-        print(f"\n진행률: {i}/{stats['total']} ({i*100//stats['total']}%)")
+    for i, case in enumerate(iter_case_queue(case_queue), 1):
+        print(f"\n진행률: {i}번째 케이스")
         
         process_case(case)
         
         # Rate Limit 방지
-        if i < stats['total']:
-            time.sleep(RATE_LIMIT_DELAY)
+        time.sleep(RATE_LIMIT_DELAY)
+    
+    if stats['total'] == 0:
+        print("\n⚠️  처리할 케이스가 없습니다.")
+        return
     
-    # 3. 에러 로그 저장
+    # 4. 에러 로그 및 인덱스 저장
     save_error_log()
+    s3_index.save()
     
-    # 4. Bedrock KB 동기화
+    # 5. Bedrock KB 동기화
     if KB_ID and DS_ID:
         print(f"\n🔄 Bedrock Knowledge Base 동기화 중...")
         trigger_kb_sync()
     
-    # 5. 결과 요약
+    # 6. 결과 요약
     print_summary()
 
 
@@ -399,6 +763,7 @@ if __name__ == '__main__':
         print("\n\n⚠️  사용자에 의해 중단되었습니다.")
         print_summary()
         save_error_log()
+        s3_index.save()
     except Exception as e:
         print(f"\n\n❌ 예상치 못한 에러: {str(e)}")
         import traceback
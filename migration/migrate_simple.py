@@ -3,7 +3,9 @@
 
 import boto3
 import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # 설정
@@ -13,6 +15,7 @@ DS_ID = ''
 START_DATE = '2023-01-01T00:00:00Z'
 END_DATE = '2025-12-31T23:59:59Z'
 RATE_LIMIT_DELAY = 1
+S3_INDEX_FILE = 's3_case_index.json'  # '' to disable local index cache
 
 # AWS 클라이언트
 s3_client = boto3.client('s3', region_name='ap-northeast-2')
@@ -22,7 +25,7 @@ support_client = boto3.client('support', region_name='us-east-1')
 
 stats = {'total': 0, 'success': 0, 'skipped': 0, 'failed': 0, 'errors': []}
 
-def get_case_details(case_id):
+def describe_case(case_id):
     case_response = support_client.describe_cases(
         caseIdList=[case_id],
         includeResolvedCases=True,
@@ -30,9 +33,23 @@ def get_case_details(case_id):
     )
     if not case_response['cases']:
         raise ValueError(f"Case not found: {case_id}")
-    case = case_response['cases'][0]
-    comms_response = support_client.describe_communications(caseId=case_id, maxResults=100)
-    return {'case': case, 'communications': comms_response.get('communications', [])}
+    return case_response['cases'][0]
+
+def describe_all_communications(case_id):
+    communications = []
+    params = {'caseId': case_id, 'maxResults': 100}
+    while True:
+        comms_response = support_client.describe_communications(**params)
+        communications.extend(comms_response.get('communications', []))
+        if not comms_response.get('nextToken'):
+            return communications
+        params['nextToken'] = comms_response['nextToken']
+
+def get_case_details(case_id):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        case_future = executor.submit(describe_case, case_id)
+        comms_future = executor.submit(describe_all_communications, case_id)
+        return {'case': case_future.result(), 'communications': comms_future.result()}
 
 def summarize_with_bedrock(case_data):
     case = case_data['case']
@@ -100,16 +117,78 @@ def save_to_s3(summary, display_id):
     )
     return s3_key
 
-def check_case_exists_in_s3(display_id):
-    try:
+class S3CaseIndex:
+    """display_id set built from one list_objects_v2 pass, refreshed incrementally from a local cache"""
+
+    def __init__(self, bucket, cache_file=''):
+        self.bucket = bucket
+        self.cache_file = cache_file
+        self.display_ids = set()
+        self.last_modified = None
+
+    def __contains__(self, display_id):
+        return display_id in self.display_ids
+
+    def add(self, display_id):
+        self.display_ids.add(display_id)
+
+    def load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('bucket') == self.bucket:
+            self.display_ids = set(data.get('display_ids', []))
+            if data.get('last_modified'):
+                self.last_modified = datetime.fromisoformat(data['last_modified'])
+
+    def save(self):
+        if not self.cache_file:
+            return
+        with open(self.cache_file, 'w') as f:
+            json.dump({
+                'bucket': self.bucket,
+                'last_modified': self.last_modified.isoformat() if self.last_modified else None,
+                'display_ids': sorted(self.display_ids)
+            }, f)
+
+    def _prefixes(self, prefix):
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
+            for p in page.get('CommonPrefixes', []):
+                yield p['Prefix']
+
+    def _scan(self, prefix):
         paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=''):
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
             for obj in page.get('Contents', []):
-                if f"/{display_id}.json" in obj['Key']:
-                    return True
-        return False
-    except:
-        return False
+                if obj['Key'].endswith('.json'):
+                    self.display_ids.add(obj['Key'].rsplit('/', 1)[-1][:-len('.json')])
+                    if self.last_modified is None or obj['LastModified'] > self.last_modified:
+                        self.last_modified = obj['LastModified']
+
+    def build(self):
+        self.load()
+        if self.last_modified is None:
+            self._scan('')
+        else:
+            # Keys are {category}/{service}/{YYYY-MM}/, so only months since the last run can hold new objects
+            since_month = self.last_modified.strftime('%Y-%m')
+            for category in self._prefixes(''):
+                for service in self._prefixes(category):
+                    for month in self._prefixes(service):
+                        if month[len(service):].rstrip('/') >= since_month:
+                            self._scan(month)
+        self.save()
+        print(f"   S3 index: {len(self.display_ids)} cases")
+
+s3_index = S3CaseIndex(BUCKET_NAME, S3_INDEX_FILE)
+
+def check_case_exists_in_s3(display_id):
+    return display_id in s3_index
 
 def get_resolved_cases(after_time, before_time=None):
     print(f"\nFetching resolved cases...")
@@ -162,6 +241,7 @@ def process_case(case):
         summary = summarize_with_bedrock(case_data)
         print(f"   4. Saving to S3...")
         s3_key = save_to_s3(summary, display_id)
+        s3_index.add(display_id)
         print(f"   Success: {s3_key}")
         stats['success'] += 1
         return True
@@ -179,6 +259,9 @@ def main():
     print(f"Period: {START_DATE} ~ {END_DATE}")
     print("="*80)
     
+    print(f"\nBuilding S3 case index...")
+    s3_index.build()
+    
     cases = get_resolved_cases(START_DATE, END_DATE)
     stats['total'] = len(cases)
     
@@ -194,6 +277,8 @@ def main():
         if i < stats['total']:
             time.sleep(RATE_LIMIT_DELAY)
     
+    s3_index.save()
+    
     if stats['errors']:
         with open(f"migration_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 'w') as f:
             json.dump(stats['errors'], f, indent=2)
@@ -212,5 +297,6 @@ if __name__ == '__main__':
         main()
     except KeyboardInterrupt:
         print("\n\nInterrupted by user.")
+        s3_index.save()
     except Exception as e:
         print(f"\n\nUnexpected error: {e}")
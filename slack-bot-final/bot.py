@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""AWS Support KB Bot - Q CLI + MCP 버전"""
+"""AWS Support KB Bot - Bedrock KB / Q CLI + MCP 버전"""
 
 import os
 import subprocess
 import re
+import queue
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ReadTimeoutError
 from dotenv import load_dotenv
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
@@ -17,6 +25,31 @@ load_dotenv()
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN")
 KB_ID = os.environ.get("KB_ID", "BECRJQ5RLE")
+AWS_REGION = os.environ.get("AWS_REGION", "ap-northeast-2")
+
+# 답변 백엔드: qcli (Q CLI + MCP) 또는 bedrock (Bedrock KB retrieve_and_generate를 프로세스 안에서 호출)
+BOT_BACKEND = os.environ.get("BOT_BACKEND", "qcli")
+
+# bedrock 백엔드 답변 생성 모델 및 검색 결과 수
+# 기본값은 계정 ID가 필요 없는 온디맨드 foundation model ARN (inference profile을 쓰려면 프로필 ARN 지정)
+KB_MODEL_ARN = os.environ.get(
+    "KB_MODEL_ARN",
+    f"arn:aws:bedrock:{AWS_REGION}::foundation-model/anthropic.claude-3-haiku-20240307-v1:0"
+)
+KB_NUM_RESULTS = int(os.environ.get("KB_NUM_RESULTS", "5"))
+
+# 질문 하나의 최대 처리 시간 (초)
+QUERY_TIMEOUT = 60
+
+# qcli 백엔드 세션 풀 (0이면 질문마다 q chat 프로세스 실행)
+QCLI_POOL_SIZE = int(os.environ.get("QCLI_POOL_SIZE", "3"))
+QCLI_SESSION_MAX_REQUESTS = int(os.environ.get("QCLI_SESSION_MAX_REQUESTS", "20"))  # 이만큼 답변한 세션은 새로 시작 (대화 누적 방지)
+QCLI_SESSION_MAX_IDLE = int(os.environ.get("QCLI_SESSION_MAX_IDLE", "1800"))        # 이보다 오래 쉰 세션은 새로 시작 (초)
+QCLI_STARTUP_TIMEOUT = 120     # 세션 시작(MCP 초기화 + 준비 응답) 최대 시간 (초)
+QCLI_HEALTH_INTERVAL = 60      # 유휴 세션 점검 주기 (초)
+QCLI_PING_AFTER = 30           # 마지막 응답 후 이만큼 지난 세션은 빌려주기 전에 ping으로 확인 (초)
+QCLI_PING_TIMEOUT = 15         # ping 응답 최대 대기 시간 (초)
+QCLI_RESPAWN_DELAY = 10        # 세션 시작 실패 시 재시도 대기 시간 (초)
 
 # Slack App 초기화
 app = App(token=SLACK_BOT_TOKEN)
@@ -131,15 +164,8 @@ def format_response_blocks(query: str, response: str):
             }
         ]
 
-def query_with_qcli(user_message: str) -> str:
-    """Q CLI를 사용하여 질문에 답변"""
-    try:
-        # 명확한 출력 형식 지정
-        enhanced_prompt = f"""다음 질문에 대해 QueryKnowledgeBases 도구를 사용하여 Knowledge Base '{KB_ID}'에서 검색하고 답변하세요:
-
-질문: {user_message}
-
-답변 형식 (반드시 이 형식으로만 답변하고, 여러 케이스가 있으면 각각 이 형식으로 나열):
+# 답변 형식 (두 백엔드 공통 - Slack에 같은 케이스 블록으로 표시)
+ANSWER_FORMAT = """답변 형식 (반드시 이 형식으로만 답변하고, 여러 케이스가 있으면 각각 이 형식으로 나열):
 
 ---
 
@@ -170,6 +196,25 @@ _📅 케이스 생성일: [YYYY-MM-DD]_
 - 위 형식의 내용만 출력하세요
 - 각 케이스는 --- 구분선으로 구분하세요"""
 
+# bedrock 백엔드 생성 프롬프트 ($search_results$에 검색된 케이스가 들어감, 질문은 사용자 메시지로 전달)
+KB_PROMPT_TEMPLATE = f"""다음은 Knowledge Base에서 검색한 AWS Support 케이스입니다:
+
+$search_results$
+
+사용자 질문과 관련된 케이스만 골라 답변하세요. 관련된 케이스가 없으면 "관련 케이스를 찾지 못했습니다."라고만 답변하세요.
+
+{ANSWER_FORMAT}"""
+
+def query_with_qcli(user_message: str) -> str:
+    """Q CLI를 사용하여 질문에 답변"""
+    try:
+        # 명확한 출력 형식 지정
+        enhanced_prompt = f"""다음 질문에 대해 QueryKnowledgeBases 도구를 사용하여 Knowledge Base '{KB_ID}'에서 검색하고 답변하세요:
+
+질문: {user_message}
+
+{ANSWER_FORMAT}"""
+
         # Q CLI 명령어 구성
         cmd = ['q', 'chat', '--no-interactive', '--trust-all-tools', enhanced_prompt]
         
@@ -180,7 +225,7 @@ _📅 케이스 생성일: [YYYY-MM-DD]_
             cmd,
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=QUERY_TIMEOUT,
             env=os.environ.copy()
         )
         
@@ -203,7 +248,7 @@ _📅 케이스 생성일: [YYYY-MM-DD]_
         return cleaned if cleaned else response
         
     except subprocess.TimeoutExpired:
-        print("[타임아웃] 60초")
+        print(f"[타임아웃] {QUERY_TIMEOUT}초")
         return "응답 시간이 초과되었습니다."
     except Exception as e:
         print(f"[실행 실패] {str(e)}")
@@ -211,6 +256,327 @@ _📅 케이스 생성일: [YYYY-MM-DD]_
         traceback.print_exc()
         return "예상치 못한 오류가 발생했습니다."
 
+class QCliSession:
+    """
+    파이프로 연결된 대화형 q chat 프로세스 하나
+    
+    시작할 때 답변 형식을 한 번 알려주고(이때 MCP 도구도 초기화됨), 이후 질문은 한 줄로 보냅니다.
+    답변 끝은 질문마다 새로 만든 마커가 단독으로 출력된 줄로 판단하고,
+    ping()으로 마커만 돌려받아 세션이 실제로 응답하는지 확인합니다.
+    """
+    
+    def __init__(self):
+        self.session_id = uuid.uuid4().hex[:8]
+        self.requests = 0
+        self.lines = queue.Queue()
+        
+        ready_marker = self.new_marker()
+        setup_prompt = f"""이 대화에서는 AWS Support 케이스 질문을 받습니다. 질문마다 QueryKnowledgeBases 도구를 사용하여 Knowledge Base '{KB_ID}'에서 검색하고, 이전 질문과 관계없이 아래 형식으로 답변하세요.
+
+{ANSWER_FORMAT}
+- 답변이 끝나면 질문에서 지정한 마커를 꾸밈 없이 그대로, 마지막 줄에 단독으로 출력하세요
+
+지금은 검색하지 말고 {ready_marker} 만 출력하세요."""
+        
+        env = os.environ.copy()
+        env["NO_COLOR"] = "1"
+        self.process = subprocess.Popen(
+            ['q', 'chat', '--trust-all-tools', setup_prompt],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=env
+        )
+        threading.Thread(target=self._read_output, daemon=True).start()
+        
+        try:
+            self.read_until(ready_marker, QCLI_STARTUP_TIMEOUT)
+        except Exception:
+            self.close()
+            raise
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+    
+    @staticmethod
+    def new_marker() -> str:
+        return f"END-{uuid.uuid4().hex[:12]}"
+    
+    def _read_output(self):
+        """stdout을 줄 단위로 큐에 넣음 (프로세스 종료 시 None)"""
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+    
+    def read_until(self, marker: str, timeout: float) -> str:
+        """마커 줄이 나올 때까지 출력 수집 (마커 줄은 제외)"""
+        deadline = time.monotonic() + timeout
+        collected = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"세션 {self.session_id} 응답 시간 초과")
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"세션 {self.session_id} 응답 시간 초과")
+            if line is None:
+                raise RuntimeError(f"세션 {self.session_id} 프로세스 종료")
+            # ANSI 코드와 앞뒤 공백만 제거하고 줄 전체가 마커와 같을 때만 답변 끝
+            # (마커가 포함된 입력 에코나 답변 문장에서 멈추지 않도록)
+            if re.sub(r'\x1B\[[0-?]*[ -/]*[@-~]', '', line).strip() == marker:
+                return ''.join(collected)
+            collected.append(line)
+    
+    def ask(self, question: str, timeout: float) -> str:
+        """질문 하나를 보내고 답변 출력 반환"""
+        marker = self.new_marker()
+        # 대화형 입력은 한 줄이 메시지 하나이므로 줄바꿈을 공백으로 바꿔 보냄
+        line = " ".join(question.split())
+        self.process.stdin.write(f"{line} (답변 후 마지막 줄에 {marker} 출력)\n")
+        self.process.stdin.flush()
+        
+        self.requests += 1
+        output = self.read_until(marker, timeout)
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+        return output
+    
+    def ping(self, timeout: float = QCLI_PING_TIMEOUT):
+        """마커만 출력하게 해서 세션이 응답하는지 확인 (실패하면 예외)"""
+        marker = self.new_marker()
+        self.process.stdin.write(f"검색하지 말고 {marker} 만 그대로 출력하세요\n")
+        self.process.stdin.flush()
+        self.read_until(marker, timeout)
+        self.last_checked = time.monotonic()
+    
+    def is_healthy(self) -> bool:
+        """프로세스가 살아 있고 ping에 응답하는지"""
+        if not self.is_alive():
+            return False
+        try:
+            self.ping()
+            return True
+        except Exception as e:
+            print(f"[세션 ping 실패] {self.session_id}: {str(e)}")
+            return False
+    
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+    
+    def is_stale(self) -> bool:
+        """최대 요청 수를 채웠거나 너무 오래 쉰 세션"""
+        return (self.requests >= QCLI_SESSION_MAX_REQUESTS
+                or time.monotonic() - self.last_used > QCLI_SESSION_MAX_IDLE)
+    
+    def close(self):
+        try:
+            self.process.stdin.write("/quit\n")
+            self.process.stdin.flush()
+        except Exception:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+class QCliSessionPool:
+    """
+    미리 시작해 둔 q chat 세션 풀
+    
+    요청마다 유휴 세션 하나를 빌려주고, 에러가 났거나 오래된 세션은 닫고 백그라운드에서 새로 시작합니다.
+    유휴 세션은 QCLI_HEALTH_INTERVAL마다 ping으로 점검하고, 빌려주기 전에도 마지막 응답 후
+    QCLI_PING_AFTER초가 지났으면 ping으로 확인합니다.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.idle = queue.Queue()
+        for _ in range(size):
+            self._spawn_async()
+        threading.Thread(target=self._health_check_loop, daemon=True).start()
+    
+    def _spawn_async(self):
+        threading.Thread(target=self._spawn, daemon=True).start()
+    
+    def _spawn(self):
+        """세션 하나를 시작해 풀에 추가 (실패하면 QCLI_RESPAWN_DELAY 후 재시도)"""
+        while True:
+            started = time.monotonic()
+            try:
+                session = QCliSession()
+            except Exception as e:
+                print(f"[세션 시작 실패] {str(e)}")
+                time.sleep(QCLI_RESPAWN_DELAY)
+                continue
+            print(f"[세션 준비] {session.session_id} ({time.monotonic() - started:.1f}초)")
+            self.idle.put(session)
+            return
+    
+    def _recycle(self, session: QCliSession, reason: str):
+        """세션을 닫고 새 세션 시작 (종료 대기로 요청이 늦어지지 않도록 백그라운드에서)"""
+        print(f"[세션 교체] {session.session_id}: {reason}")
+        
+        def replace():
+            session.close()
+            self._spawn()
+        
+        threading.Thread(target=replace, daemon=True).start()
+    
+    def _health_check_loop(self):
+        while True:
+            time.sleep(QCLI_HEALTH_INTERVAL)
+            # 지금 쉬고 있는 세션만 점검 (사용 중인 세션은 반환될 때 점검)
+            for _ in range(self.idle.qsize()):
+                try:
+                    session = self.idle.get_nowait()
+                except queue.Empty:
+                    break
+                if not session.is_alive():
+                    self._recycle(session, "프로세스 종료")
+                elif session.is_stale():
+                    self._recycle(session, "오래된 세션")
+                elif time.monotonic() - session.last_checked >= QCLI_HEALTH_INTERVAL and not session.is_healthy():
+                    self._recycle(session, "응답 없음")
+                else:
+                    self.idle.put(session)
+    
+    def acquire(self) -> QCliSession:
+        """유휴 세션 대여 (기다리지 않음, 확인을 통과한 유휴 세션이 없으면 None)"""
+        while True:
+            try:
+                session = self.idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - session.last_checked < QCLI_PING_AFTER and session.is_alive():
+                return session
+            if session.is_healthy():
+                return session
+            self._recycle(session, "응답 없음")
+    
+    def release(self, session: QCliSession, failed: bool):
+        """세션 반환 - 에러가 났거나 오래된 세션은 새로 교체"""
+        if failed or not session.is_alive():
+            self._recycle(session, "요청 실패")
+        elif session.is_stale():
+            self._recycle(session, f"최대 요청 수 도달 ({session.requests})")
+        else:
+            self.idle.put(session)
+    
+    def query(self, user_message: str) -> str:
+        """풀의 세션으로 질문에 답변 (유휴 세션이 없으면 기다리지 않고 q chat 1회 실행으로 대체)"""
+        session = self.acquire()
+        if session is None:
+            print("[세션 풀] 유휴 세션 없음 - 단발 실행")
+            return query_with_qcli(user_message)
+        
+        print(f"[Q CLI 세션 {session.session_id}] 질문: {user_message}")
+        failed = False
+        try:
+            response = session.ask(user_message, QUERY_TIMEOUT)
+        except TimeoutError:
+            failed = True
+            print(f"[타임아웃] {QUERY_TIMEOUT}초")
+            return "응답 시간이 초과되었습니다."
+        except Exception as e:
+            failed = True
+            print(f"[실행 실패] {str(e)}")
+            return "예상치 못한 오류가 발생했습니다."
+        finally:
+            self.release(session, failed)
+        
+        print(f"[응답 길이] {len(response)}")
+        
+        cleaned = clean_qcli_output(response)
+        if not cleaned:
+            return "응답을 받지 못했습니다."
+        return cleaned
+
+class AnswerBackend(ABC):
+    """질문을 받아 케이스 블록 형식의 답변 텍스트를 돌려주는 백엔드"""
+    
+    name = ""
+    
+    @abstractmethod
+    def answer(self, question: str) -> str:
+        """질문에 대한 답변 텍스트 (실패 시에도 사용자에게 보여줄 안내 문구 반환)"""
+
+class QCliBackend(AnswerBackend):
+    """Q CLI(q chat) + MCP 도구로 KB 검색 (QCLI_POOL_SIZE > 0이면 미리 시작한 세션 풀 사용)"""
+    
+    name = "qcli"
+    
+    def __init__(self):
+        self.pool = QCliSessionPool(QCLI_POOL_SIZE) if QCLI_POOL_SIZE > 0 else None
+    
+    def answer(self, question: str) -> str:
+        if self.pool:
+            return self.pool.query(question)
+        return query_with_qcli(question)
+
+class BedrockKBBackend(AnswerBackend):
+    """Bedrock KB retrieve_and_generate를 프로세스 안에서 호출 (CLI 시작/MCP 초기화/도구 선택 과정 없음)"""
+    
+    name = "bedrock"
+    
+    def __init__(self):
+        self.client = boto3.client(
+            "bedrock-agent-runtime",
+            region_name=AWS_REGION,
+            config=Config(read_timeout=QUERY_TIMEOUT, retries={"max_attempts": 3, "mode": "adaptive"})
+        )
+    
+    def answer(self, question: str) -> str:
+        try:
+            print(f"[Bedrock KB 검색] 질문: {question}")
+            
+            response = self.client.retrieve_and_generate(
+                input={"text": question},
+                retrieveAndGenerateConfiguration={
+                    "type": "KNOWLEDGE_BASE",
+                    "knowledgeBaseConfiguration": {
+                        "knowledgeBaseId": KB_ID,
+                        "modelArn": KB_MODEL_ARN,
+                        "retrievalConfiguration": {
+                            "vectorSearchConfiguration": {"numberOfResults": KB_NUM_RESULTS}
+                        },
+                        "generationConfiguration": {
+                            "promptTemplate": {"textPromptTemplate": KB_PROMPT_TEMPLATE},
+                            "inferenceConfig": {"textInferenceConfig": {"maxTokens": 2000, "temperature": 0}}
+                        }
+                    }
+                }
+            )
+            
+            text = response["output"]["text"].strip()
+            references = sum(len(c.get("retrievedReferences", [])) for c in response.get("citations", []))
+            print(f"[응답 길이] {len(text)}, 참조 케이스 {references}건")
+            
+            return text if text else "응답을 받지 못했습니다."
+            
+        except ReadTimeoutError:
+            print(f"[타임아웃] {QUERY_TIMEOUT}초")
+            return "응답 시간이 초과되었습니다."
+        except Exception as e:
+            print(f"[실행 실패] {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return "예상치 못한 오류가 발생했습니다."
+
+BACKENDS = {
+    QCliBackend.name: QCliBackend,
+    BedrockKBBackend.name: BedrockKBBackend,
+}
+
+def create_backend(name: str) -> AnswerBackend:
+    """BOT_BACKEND 이름으로 백엔드 생성"""
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 BOT_BACKEND: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+backend = create_backend(BOT_BACKEND)
+
 @app.event("app_mention")
 def handle_mention(event, say):
     """봇 멘션 이벤트 처리 (비동기)"""
@@ -231,8 +597,8 @@ def handle_mention(event, say):
         try:
             print(f"[처리 시작] {user}: {query}")
             
-            # Q CLI로 질문 처리
-            response = query_with_qcli(query)
+            # 선택된 백엔드로 질문 처리
+            response = backend.answer(query)
             
             # Slack Block Kit으로 포맷팅된 응답
             blocks = format_response_blocks(query, response)
@@ -258,15 +624,19 @@ def handle_message_events(body, logger):
 
 if __name__ == "__main__":
     print("="*80)
-    print("🤖 AWS Support KB Bot (Q CLI + MCP) 시작")
+    print(f"🤖 AWS Support KB Bot ({backend.name}) 시작")
     print(f"📚 Knowledge Base ID: {KB_ID}")
     print("="*80)
     
-    try:
-        result = subprocess.run(['q', '--version'], capture_output=True, text=True)
-        print(f"Q CLI: {result.stdout.strip()}")
-    except FileNotFoundError:
-        print("⚠️  Q CLI 미설치")
+    if backend.name == "qcli":
+        try:
+            result = subprocess.run(['q', '--version'], capture_output=True, text=True)
+            print(f"Q CLI: {result.stdout.strip()}")
+        except FileNotFoundError:
+            print("⚠️  Q CLI 미설치")
+        print(f"세션 풀: {QCLI_POOL_SIZE}개" if QCLI_POOL_SIZE > 0 else "세션 풀: 사용 안 함 (질문마다 실행)")
+    else:
+        print(f"모델: {KB_MODEL_ARN}")
     
     print("="*80)
     
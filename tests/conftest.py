@@ -0,0 +1,26 @@
+"""
+단위 테스트 공용 설정
+
+lambda/와 migration/의 모듈은 패키지가 아니라 배포 단위별 단일 파일이므로
+두 디렉토리를 import 경로에 추가합니다. boto3를 import 시점에 쓰는 모듈
+(migrate_cases, bridge_support_event, sync_kb_on_s3_upload)의 테스트는
+boto3가 설치되어 있을 때만 실행합니다.
+
+    pip install pytest boto3
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for directory in ('lambda', 'migration'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# 모듈 초기화 시 클라이언트 생성에 필요한 기본값 (AWS는 호출하지 않음)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('KB_ID', 'test-kb')
+os.environ.setdefault('DS_ID', 'test-ds')
@@ -0,0 +1,53 @@
+"""bridge_support_event.slim_event / should_forward 테스트"""
+
+import pytest
+
+pytest.importorskip('boto3')
+
+import bridge_support_event
+from bridge_support_event import slim_event, should_forward
+
+
+def support_event(event_name='ResolveCase', **extra_detail):
+    return {
+        'version': '0',
+        'id': 'evt-1',
+        'time': '2025-01-01T00:00:00Z',
+        'source': 'aws.support',
+        'detail-type': 'Support Case Update',
+        'account': '123456789012',
+        'region': 'us-east-1',
+        'resources': [],
+        'detail': dict({
+            'case-id': 'case-123',
+            'display-id': '12345',
+            'event-name': event_name,
+            'communication-id': 'comm-1',
+            'origin': 'CUSTOMER'
+        }, **extra_detail)
+    }
+
+
+def test_slim_event_keeps_only_used_fields():
+    assert slim_event(support_event()) == {
+        'id': 'evt-1',
+        'time': '2025-01-01T00:00:00Z',
+        'source': 'aws.support',
+        'detail-type': 'Support Case Update',
+        'detail': {'case-id': 'case-123', 'display-id': '12345', 'event-name': 'ResolveCase'}
+    }
+
+
+def test_slim_event_tolerates_missing_detail():
+    slim = slim_event({'id': 'evt-2'})
+    assert slim['id'] == 'evt-2'
+    assert slim['detail'] == {'case-id': None, 'display-id': None, 'event-name': None}
+
+
+def test_should_forward_by_event_name(monkeypatch):
+    assert should_forward(support_event('ResolveCase'))
+    assert not should_forward(support_event('AddCommunicationToCase'))
+    assert not should_forward({})
+
+    monkeypatch.setattr(bridge_support_event, 'FORWARD_EVENT_NAMES', {'ResolveCase', 'ReopenCase'})
+    assert should_forward(support_event('ReopenCase'))
@@ -0,0 +1,44 @@
+"""process_resolved_case.estimate_tokens / chunk_communications 테스트"""
+
+from process_resolved_case import chunk_communications, estimate_tokens, format_communication
+
+
+def comm(body, submitted_by='user@example.com'):
+    return {'submittedBy': submitted_by, 'body': body}
+
+
+def test_estimate_tokens_ascii_and_non_ascii():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcd') == 1
+    assert estimate_tokens('abcde') == 2  # 올림
+    assert estimate_tokens('안녕하세요') == 5
+    assert estimate_tokens('ab안녕') == 3
+
+
+def test_short_conversation_is_one_chunk():
+    communications = [comm('hello'), comm('world', 'support')]
+    chunks = chunk_communications(communications, token_budget=1000)
+    assert chunks == [''.join(format_communication(c) for c in communications)]
+
+
+def test_chunks_respect_budget_and_keep_order():
+    communications = [comm(f'message {i} ' + 'x' * 200) for i in range(10)]
+    chunks = chunk_communications(communications, token_budget=150)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 150 for chunk in chunks)
+    assert ''.join(chunks) == ''.join(format_communication(c) for c in communications)
+
+
+def test_oversized_message_is_split():
+    big = comm('y' * 4000)
+    chunks = chunk_communications([comm('before'), big, comm('after')], token_budget=300)
+
+    text = format_communication(big)
+    assert len(chunks) > 3
+    assert ''.join(chunks[1:-1]) == text
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+
+
+def test_empty_conversation_has_no_chunks():
+    assert chunk_communications([], token_budget=100) == []
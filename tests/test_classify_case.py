@@ -0,0 +1,39 @@
+"""process_resolved_case.classify_case 테스트"""
+
+import pytest
+
+from process_resolved_case import classify_case
+
+
+@pytest.mark.parametrize('service_code, expected', [
+    ('amazon-elastic-compute-cloud-linux', 'ec2'),
+    ('amazon-ec2-windows', 'ec2'),
+    ('amazon-ec2-auto-scaling', 'autoscaling'),  # 가장 긴 접두사 우선
+    ('Amazon-S3', 's3'),                          # 대소문자 무시
+    ('aws-lambda', 'lambda'),
+])
+def test_known_service_codes_are_technical(service_code, expected):
+    assert classify_case({'serviceCode': service_code}) == {'category': 'technical', 'service': expected}
+
+
+def test_billing_and_account_codes():
+    assert classify_case({'serviceCode': 'aws-billing'}) == {'category': 'billing', 'service': 'billing'}
+    assert classify_case({'serviceCode': 'customer-account'}) == {'category': 'account', 'service': 'account'}
+
+
+def test_general_info_uses_category_code():
+    assert classify_case({'serviceCode': 'general-info', 'categoryCode': 'refund'})['category'] == 'billing'
+    assert classify_case({'serviceCode': '', 'categoryCode': 'account-access'})['category'] == 'account'
+    assert classify_case({'serviceCode': 'general-info', 'categoryCode': 'other'}) is None
+
+
+def test_category_code_does_not_override_known_service():
+    # 서비스 케이스의 billing 카테고리는 서비스 분류 유지
+    result = classify_case({'serviceCode': 'amazon-ec2-linux', 'categoryCode': 'billing'})
+    assert result == {'category': 'technical', 'service': 'ec2'}
+
+
+def test_unknown_or_missing_codes_fall_back_to_model():
+    assert classify_case({'serviceCode': 'some-new-service'}) is None
+    assert classify_case({}) is None
+    assert classify_case({'serviceCode': None, 'categoryCode': None}) is None
@@ -0,0 +1,51 @@
+"""sync_kb_on_s3_upload.collect_documents 테스트"""
+
+import pytest
+
+pytest.importorskip('boto3')
+
+from sync_kb_on_s3_upload import META_PREFIX, collect_documents
+
+
+def s3_record(key, event_name='ObjectCreated:Put', bucket='kb-bucket', etag='abc'):
+    return {
+        'eventName': event_name,
+        's3': {'bucket': {'name': bucket}, 'object': {'key': key, 'eTag': etag}}
+    }
+
+
+def test_accepts_created_json_objects():
+    documents, results = collect_documents([
+        s3_record('technical/ec2/2025-01/1.json', etag='e1'),
+        s3_record('billing/general/2025-01/2.json', etag='e2'),
+    ])
+    assert documents == [
+        {'uri': 's3://kb-bucket/technical/ec2/2025-01/1.json', 'etag': 'e1'},
+        {'uri': 's3://kb-bucket/billing/general/2025-01/2.json', 'etag': 'e2'},
+    ]
+    assert [r['status'] for r in results] == ['accepted', 'accepted']
+
+
+def test_skips_with_reason():
+    records = [
+        s3_record('technical/ec2/2025-01/1.json', event_name='ObjectRemoved:Delete'),
+        s3_record('technical/ec2/2025-01/part-1.ndjson'),
+        s3_record(f'{META_PREFIX}manifest/1.json'),
+        s3_record('technical/ec2/2025-01/3.json'),
+        s3_record('technical/ec2/2025-01/3.json'),
+    ]
+    documents, results = collect_documents(records)
+
+    assert [d['uri'] for d in documents] == ['s3://kb-bucket/technical/ec2/2025-01/3.json']
+    assert [r.get('reason') for r in results] == [
+        'not ObjectCreated', 'not .json', 'internal object', None, 'duplicate'
+    ]
+
+
+def test_decodes_url_encoded_keys():
+    documents, _ = collect_documents([s3_record('technical/ec2/2025-01/case+1%2B2.json')])
+    assert documents[0]['uri'] == 's3://kb-bucket/technical/ec2/2025-01/case 1+2.json'
+
+
+def test_empty_records():
+    assert collect_documents([]) == ([], [])
@@ -0,0 +1,164 @@
+"""kb_sync.KBSyncCoalescer 상태 전이 테스트 (S3 / bedrock-agent 클라이언트는 스텁)"""
+
+import json
+
+import pytest
+
+from kb_sync import KBSyncCoalescer
+
+
+class ClientError(Exception):
+    """botocore ClientError와 같은 response 형식의 에러"""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class StubS3:
+    """get_object / 조건부 put_object만 흉내 내는 S3 스텁"""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}  # key -> (body, etag)
+        self.puts = 0
+        self.before_put = None  # 경합 재현용: put 직전에 한 번 실행
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        body, etag = self.objects[Key]
+
+        class Body:
+            def read(self):
+                return body
+
+        return {'Body': Body(), 'ETag': etag}
+
+    def put_object(self, Bucket, Key, Body, ContentType, IfMatch=None, IfNoneMatch=None):
+        if self.before_put:
+            hook, self.before_put = self.before_put, None
+            hook()
+        current = self.objects.get(Key)
+        if IfNoneMatch == '*' and current is not None:
+            raise ClientError('PreconditionFailed')
+        if IfMatch is not None and (current is None or current[1] != IfMatch):
+            raise ClientError('PreconditionFailed')
+        self.puts += 1
+        self.objects[Key] = (Body.encode('utf-8'), f'"etag-{self.puts}"')
+
+
+class StubAgent:
+    """start_ingestion_job / get_ingestion_job 스텁"""
+
+    def __init__(self):
+        self.started = []
+        self.status = 'COMPLETE'
+        self.conflict = False
+
+    def start_ingestion_job(self, knowledgeBaseId, dataSourceId):
+        if self.conflict:
+            raise ClientError('ConflictException')
+        job_id = f'job-{len(self.started) + 1}'
+        self.started.append(job_id)
+        return {'ingestionJob': {'ingestionJobId': job_id}}
+
+    def get_ingestion_job(self, knowledgeBaseId, dataSourceId, ingestionJobId):
+        return {'ingestionJob': {'status': self.status}}
+
+
+@pytest.fixture
+def clients():
+    return {'s3': StubS3(), 'bedrock-agent': StubAgent()}
+
+
+def make_coalescer(clients, bucket='meta-bucket', window_seconds=300):
+    return KBSyncCoalescer('kb', 'ds', bucket, '_meta/', lambda name: clients[name], window_seconds)
+
+
+def stored_state(clients, coalescer):
+    return json.loads(clients['s3'].objects[coalescer.state_key()][0])
+
+
+def test_first_request_starts_job(clients):
+    coalescer = make_coalescer(clients)
+    assert coalescer.request() == 'started'
+
+    state = stored_state(clients, coalescer)
+    assert state['job_id'] == 'job-1'
+    assert state['pending'] is False
+    assert clients['bedrock-agent'].started == ['job-1']
+
+
+def test_requests_in_window_queue_one_follow_up(clients):
+    coalescer = make_coalescer(clients)
+    coalescer.request()
+    puts = clients['s3'].puts
+
+    assert coalescer.request() == 'queued'
+    assert stored_state(clients, coalescer)['pending'] is True
+    assert clients['s3'].puts == puts + 1
+
+    # 이미 예약되어 있으면 상태를 다시 쓰지 않음
+    assert coalescer.request() == 'queued'
+    assert clients['s3'].puts == puts + 1
+    assert clients['bedrock-agent'].started == ['job-1']
+
+
+def test_flush_without_pending_is_idle(clients):
+    coalescer = make_coalescer(clients)
+    assert coalescer.request(flush=True) == 'idle'
+    coalescer.request()
+    assert coalescer.request(flush=True) == 'idle'
+    assert clients['bedrock-agent'].started == ['job-1']
+
+
+def test_flush_starts_pending_job_after_window(clients):
+    coalescer = make_coalescer(clients, window_seconds=0)
+    coalescer.request()
+
+    clients['bedrock-agent'].status = 'IN_PROGRESS'
+    assert coalescer.request() == 'queued'
+    assert coalescer.request(flush=True) == 'queued'  # 작업 진행 중이면 계속 대기
+
+    clients['bedrock-agent'].status = 'COMPLETE'
+    assert coalescer.request(flush=True) == 'started'
+    state = stored_state(clients, coalescer)
+    assert state['pending'] is False
+    assert state['job_id'] == 'job-2'
+
+
+def test_conflict_from_outside_job_queues_follow_up(clients):
+    coalescer = make_coalescer(clients)
+    clients['bedrock-agent'].conflict = True
+
+    assert coalescer.request() == 'queued'
+    assert stored_state(clients, coalescer)['pending'] is True
+
+
+def test_concurrent_writer_wins_and_request_reevaluates(clients):
+    coalescer = make_coalescer(clients)
+    other = make_coalescer(clients)
+    # 첫 상태 저장 직전에 다른 호출이 먼저 작업을 시작
+    clients['s3'].before_put = other.request
+
+    assert coalescer.request() == 'queued'
+    assert clients['bedrock-agent'].started == ['job-1']
+    assert stored_state(clients, coalescer)['pending'] is True
+
+
+def test_without_bucket_starts_directly(clients):
+    coalescer = make_coalescer(clients, bucket='')
+
+    assert coalescer.load_state() == ({}, None)
+    assert coalescer.request(flush=True) == 'idle'
+    assert coalescer.request() == 'started'
+    assert coalescer.request() == 'started'
+    assert clients['bedrock-agent'].started == ['job-1', 'job-2']
+    assert clients['s3'].objects == {}
+
+    clients['bedrock-agent'].conflict = True
+    assert coalescer.request() == 'busy'
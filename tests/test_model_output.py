@@ -0,0 +1,80 @@
+"""process_resolved_case.repair_json_text / parse_model_output 테스트"""
+
+import json
+
+import pytest
+
+from process_resolved_case import (
+    CHUNK_DEFAULTS,
+    get_json_repair_count,
+    parse_model_output,
+    repair_json_text,
+)
+
+
+def model_result(text):
+    return {'content': [{'type': 'text', 'text': text}]}
+
+
+def repaired(text):
+    return json.loads(repair_json_text(text))
+
+
+def test_repair_strips_surrounding_prose():
+    assert repaired('요약입니다: {"a": "b"} 감사합니다 {"c": 1}') == {'a': 'b'}
+
+
+def test_repair_removes_trailing_commas():
+    assert repaired('{"a": [1, 2, ], "b": "c", }') == {'a': [1, 2], 'b': 'c'}
+
+
+def test_repair_replaces_smart_quote_delimiters():
+    assert repaired('{“question”: “EC2 중지 문제”}') == {'question': 'EC2 중지 문제'}
+    # 일반 따옴표 문자열 안의 스마트 따옴표는 내용으로 유지
+    assert repaired('{"question": "EC2 “중지” 문제"}') == {'question': 'EC2 “중지” 문제'}
+
+
+def test_repair_escapes_unescaped_quotes_and_newlines():
+    assert repaired('{"a": "say "hi" now", "b": "line1\nline2"}') == {'a': 'say "hi" now', 'b': 'line1\nline2'}
+
+
+def test_repair_closes_truncated_response():
+    assert repaired('{"a": "b", "steps": ["one", "tw') == {'a': 'b', 'steps': ['one', 'tw']}
+
+
+def test_repair_without_object_raises():
+    with pytest.raises(ValueError):
+        repair_json_text('JSON이 없습니다')
+
+
+def test_parse_valid_json_fills_defaults():
+    summary = parse_model_output(model_result('{"question": "q", "steps": "한 단계", "tags": null}'))
+    assert summary['question'] == 'q'
+    assert summary['steps'] == ['한 단계']  # 문자열 하나는 목록으로
+    assert summary['tags'] == []
+    assert summary['category'] == 'general'
+
+
+def test_parse_strips_code_fence():
+    summary = parse_model_output(model_result('```json\n{"question": "q"}\n```'))
+    assert summary['question'] == 'q'
+
+
+def test_parse_repairs_and_counts():
+    before = get_json_repair_count()
+    summary = parse_model_output(model_result('결과: {"question": "q", "answer": 3,}'))
+    assert summary['answer'] == '3'
+    assert get_json_repair_count() == before + 1
+
+
+def test_parse_rejects_unrelated_schema():
+    with pytest.raises(ValueError):
+        parse_model_output(model_result('{"unexpected": 1}'))
+    with pytest.raises(ValueError):
+        parse_model_output(model_result('[1, 2]'))
+
+
+def test_parse_with_chunk_defaults_and_without_validation():
+    note = parse_model_output(model_result('{"user_points": "p"}'), CHUNK_DEFAULTS)
+    assert note == {'user_points': ['p'], 'support_points': [], 'actions': [], 'services': []}
+    assert parse_model_output(model_result('{"x": 1}'), defaults=None) == {'x': 1}
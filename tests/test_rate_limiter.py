@@ -0,0 +1,65 @@
+"""migrate_cases.TokenBucketRateLimiter 테스트"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('boto3')
+
+from migrate_cases import TokenBucketRateLimiter
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(0)
+
+
+def test_burst_is_available_immediately():
+    limiter = TokenBucketRateLimiter(rate=1.0, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_waits_for_refill_when_empty():
+    limiter = TokenBucketRateLimiter(rate=20.0, burst=1)
+    limiter.acquire()
+    start = time.monotonic()
+    limiter.acquire()
+    # 토큰 1개가 채워지는 데 1/20초
+    assert time.monotonic() - start >= 0.04
+
+
+def test_tokens_never_exceed_capacity():
+    limiter = TokenBucketRateLimiter(rate=100.0, burst=2)
+    time.sleep(0.1)  # 10개분 시간이 지나도 최대 2개
+    limiter.acquire(2)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.005
+
+
+def test_limits_rate_across_threads():
+    limiter = TokenBucketRateLimiter(rate=50.0, burst=1)
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire()
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20회 중 처음 1회는 버스트, 나머지 19회는 초당 50개 → 최소 약 0.38초
+    assert time.monotonic() - start >= 0.35
+
+
+def test_shared_limiter_uses_process_shared_state():
+    limiter = TokenBucketRateLimiter(rate=10.0, burst=2, shared=True)
+    limiter.acquire(2)
+    assert limiter.state[0] < 1
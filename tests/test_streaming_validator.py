@@ -0,0 +1,58 @@
+"""process_resolved_case.StreamingJSONValidator 테스트"""
+
+from process_resolved_case import StreamingJSONValidator
+
+
+def feed_all(chunks):
+    validator = StreamingJSONValidator()
+    ok = all(validator.feed(chunk) for chunk in chunks)
+    return validator, ok
+
+
+def test_valid_json_in_pieces_completes():
+    validator, ok = feed_all(['{"question": "a', 'b", "steps": ["x", ', '{"y": 1}]', '}'])
+    assert ok
+    assert validator.complete
+    assert validator.text == '{"question": "ab", "steps": ["x", {"y": 1}]}'
+
+
+def test_text_after_top_level_object_is_ignored():
+    validator, ok = feed_all(['{"a": 1}', ' 이후 설명 문장'])
+    assert ok
+    assert validator.text == '{"a": 1}'
+
+
+def test_short_prefix_before_json_is_allowed():
+    validator, ok = feed_all(['다음은 요약입니다:\n```json\n', '{"a": "b"}'])
+    assert ok
+    assert validator.complete
+
+
+def test_prose_without_json_fails_after_prefix_limit():
+    validator = StreamingJSONValidator()
+    assert not validator.feed('x' * (StreamingJSONValidator.PREFIX_LIMIT + 1))
+    assert validator.error
+
+
+def test_mismatched_brackets_fail():
+    validator, ok = feed_all(['{"a": [1, 2}'])
+    assert not ok
+    assert '괄호' in validator.error
+
+
+def test_braces_inside_strings_are_not_structure():
+    validator, ok = feed_all(['{"a": "} ] { [", "b": "\\"quoted\\""}'])
+    assert ok
+    assert validator.complete
+
+
+def test_repairable_errors_switch_to_lenient_mode():
+    # 스마트 따옴표나 문자열 안의 줄바꿈은 parse_model_output이 복구하므로 중단하지 않음
+    validator, ok = feed_all(['{“question”: "a"', ']]]'])
+    assert ok
+    assert validator.lenient
+    assert not validator.complete
+
+    validator, ok = feed_all(['{"a": "line1\nline2"}'])
+    assert ok
+    assert validator.lenient
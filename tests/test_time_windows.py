@@ -0,0 +1,57 @@
+"""migrate_cases.split_time_windows / in_time_window 테스트"""
+
+import pytest
+
+pytest.importorskip('boto3')
+
+from migrate_cases import in_time_window, split_time_windows
+
+
+def windows_with_edges(after, before, shards):
+    windows = split_time_windows(after, before, shards)
+    for i, window in enumerate(windows):
+        window['first'] = i == 0
+        window['last'] = i == len(windows) - 1
+    return windows
+
+
+def test_split_covers_range_without_gaps():
+    windows = split_time_windows('2024-01-01T00:00:00Z', '2024-01-05T00:00:00Z', 4)
+    assert [w['after'] for w in windows] == [
+        '2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z', '2024-01-03T00:00:00Z', '2024-01-04T00:00:00Z'
+    ]
+    assert windows[-1]['before'] == '2024-01-05T00:00:00Z'
+    for prev, nxt in zip(windows, windows[1:]):
+        assert prev['before'] == nxt['after']
+
+
+def test_split_drops_empty_windows_for_short_ranges():
+    # 2초를 5개로 나누면 초 단위 경계가 겹쳐 빈 구간이 생김
+    windows = split_time_windows('2024-01-01T00:00:00Z', '2024-01-01T00:00:02Z', 5)
+    assert 1 <= len(windows) <= 2
+    assert windows[0]['after'] == '2024-01-01T00:00:00Z'
+    assert windows[-1]['before'] == '2024-01-01T00:00:02Z'
+
+
+def test_split_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        split_time_windows('2024-02-01T00:00:00Z', '2024-01-01T00:00:00Z', 2)
+
+
+def test_case_on_boundary_belongs_to_one_window():
+    windows = windows_with_edges('2024-01-01T00:00:00Z', '2024-01-03T00:00:00Z', 2)
+    case = {'timeCreated': '2024-01-02T00:00:00.000Z'}
+    assert [in_time_window(case, w) for w in windows] == [False, True]
+
+
+def test_outer_windows_are_open_ended():
+    windows = windows_with_edges('2024-01-01T00:00:00Z', '2024-01-03T00:00:00Z', 2)
+    early = {'timeCreated': '2023-12-31T23:59:59Z'}
+    late = {'timeCreated': '2024-01-03T00:00:01Z'}
+    assert [in_time_window(early, w) for w in windows] == [True, False]
+    assert [in_time_window(late, w) for w in windows] == [False, True]
+
+
+def test_case_without_created_time_goes_to_first_window():
+    windows = windows_with_edges('2024-01-01T00:00:00Z', '2024-01-03T00:00:00Z', 2)
+    assert [in_time_window({}, w) for w in windows] == [True, False]